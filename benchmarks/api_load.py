@@ -0,0 +1,252 @@
+"""Throughput and latency of the prediction API under concurrent clients.
+
+Drives the app in-process (ASGI transport, no network), through a local uvicorn
+server with 1..N workers, and/or through `python -m src.api.serve` (pinned workers on
+a shared socket), for the single and batch endpoints:
+
+    python -m benchmarks.api_load --mode inprocess uvicorn serve --clients 1 8 32 --workers 1 2 \\
+        --output bench/api_load.json
+
+Server modes report RSS and PSS per process; PSS splits shared pages (the mmapped
+bundle, shared libraries) between the processes that map them.
+
+Payloads are NDJSON /predict bodies (--payloads) or rows sampled from x.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import numpy as np
+import httpx
+
+BASE_FIELDS = [
+    "no_of_adults", "no_of_children", "no_of_weekend_nights", "no_of_week_nights", "type_of_meal_plan",
+    "required_car_parking_space", "room_type_reserved", "lead_time", "arrival_year", "arrival_month",
+    "arrival_date", "market_segment_type", "repeated_guest", "no_of_previous_cancellations",
+    "no_of_previous_bookings_not_canceled", "avg_price_per_room", "no_of_special_requests"
+]
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def load_payloads(path: str, n: int, seed: int = 0) -> list:
+    if path:
+        with open(path, "r") as file:
+            return [json.loads(line) for line in file if line.strip()][:n]
+
+    from src.storage import read_frame, data_path
+
+    x = read_frame(data_path("x"), columns=BASE_FIELDS, fallback=True)
+    sample = x.sample(min(n, len(x)), random_state=seed)
+    return json.loads(sample.to_json(orient="records"))
+
+
+def process_tree(pid: int) -> list:
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat", "r") as file:
+                    ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+            except (OSError, ValueError, IndexError):
+                continue
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def pss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as file:
+            for line in file:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def tree_usage(pid: int) -> dict:
+    # cpu seconds, rss and pss of a server and all its worker processes, straight from /proc
+    cpu, rss, pss, workers, workers_pss = 0.0, 0, 0, [], []
+    for proc in process_tree(pid):
+        try:
+            with open(f"/proc/{proc}/stat", "r") as file:
+                fields = file.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{proc}/statm", "r") as file:
+                proc_rss = int(file.read().split()[1]) * PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            continue
+        proc_pss = pss_bytes(proc)
+        cpu += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        rss += proc_rss
+        pss += proc_pss
+        workers.append(round(proc_rss / 2 ** 20, 1))
+        workers_pss.append(round(proc_pss / 2 ** 20, 1))
+    return {"cpu_seconds": cpu, "rss_mb": round(rss / 2 ** 20, 1), "pss_mb": round(pss / 2 ** 20, 1),
+            "process_rss_mb": workers, "process_pss_mb": workers_pss}
+
+
+async def drive(client: httpx.AsyncClient, endpoint: str, payloads: list, clients: int,
+                requests: int, batch_size: int) -> dict:
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+    ring = payloads + payloads[:batch_size]
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            if endpoint == "single":
+                url, body = "/predict", payloads[i % len(payloads)]
+            else:
+                offset = (i * batch_size) % len(payloads)
+                url, body = "/predict/batch", ring[offset:offset + batch_size]
+            start = time.perf_counter()
+            response = await client.post(url, json=body)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    seconds = time.perf_counter() - start
+
+    latency_ms = np.asarray(latencies) * 1000
+    rows = requests * (1 if endpoint == "single" else batch_size)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(requests / seconds, 1),
+        "rows_per_second": round(rows / seconds, 1),
+        **{f"p{q}_ms": round(float(np.percentile(latency_ms, q)), 3) for q in (50, 90, 99)},
+        "max_ms": round(float(latency_ms.max()), 3)
+    }
+
+
+async def cache_stats(client: httpx.AsyncClient) -> dict:
+    response = await client.get("/cache/stats")
+    return response.json() if response.status_code == 200 else {}
+
+
+async def run_inprocess(args, payloads: list) -> list:
+    from src.api.app import app
+    from src.utils import current_rss
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in args.endpoints:
+            for clients in args.clients:
+                await drive(client, endpoint, payloads, clients, min(args.warmup, args.requests), args.batch_size)
+                cpu_start = time.process_time()
+                stats = await drive(client, endpoint, payloads, clients, args.requests, args.batch_size)
+                results.append({"mode": "inprocess", "endpoint": endpoint, "clients": clients, "workers": 1,
+                                **stats,
+                                "cpu_seconds": round(time.process_time() - cpu_start, 3),
+                                "rss_mb": round(current_rss() / 2 ** 20, 1),
+                                "cache": await cache_stats(client)})
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, mode: str = "uvicorn") -> subprocess.Popen:
+    if mode == "serve":
+        command = ["-m", "src.api.serve", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    else:
+        command = ["-m", "uvicorn", "src.api.app:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--workers", str(workers), "--log-level", "warning"]
+    server = subprocess.Popen([sys.executable] + command)
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{mode} server did not come up within 120s")
+
+
+async def run_server(args, payloads: list, mode: str) -> list:
+    results = []
+    for workers in args.workers:
+        port = free_port()
+        server = start_server(workers, port, mode)
+        try:
+            limits = httpx.Limits(max_connections=max(args.clients))
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+                for endpoint in args.endpoints:
+                    for clients in args.clients:
+                        await drive(client, endpoint, payloads, clients, min(args.warmup, args.requests),
+                                    args.batch_size)
+                        before = tree_usage(server.pid)
+                        stats = await drive(client, endpoint, payloads, clients, args.requests, args.batch_size)
+                        after = tree_usage(server.pid)
+                        results.append({"mode": mode, "endpoint": endpoint, "clients": clients,
+                                        "workers": workers, **stats,
+                                        "cpu_seconds": round(after["cpu_seconds"] - before["cpu_seconds"], 3),
+                                        **{key: after[key] for key in ("rss_mb", "pss_mb", "process_rss_mb",
+                                                                       "process_pss_mb")}})
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", nargs="+", choices=["inprocess", "uvicorn", "serve"], default=["inprocess"])
+    parser.add_argument("--endpoints", nargs="+", choices=["single", "batch"], default=["single", "batch"])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="server worker counts")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--payloads", default=None, help="NDJSON file of /predict bodies")
+    parser.add_argument("--n-payloads", type=int, default=5000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads, args.n_payloads)
+    results = []
+    if "inprocess" in args.mode:
+        results += asyncio.run(run_inprocess(args, payloads))
+    for mode in ("uvicorn", "serve"):
+        if mode in args.mode:
+            results += asyncio.run(run_server(args, payloads, mode))
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cpu_count": os.cpu_count(),
+        "payloads": len(payloads),
+        "batch_size": args.batch_size,
+        "results": results
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,110 @@
+"""Cost of the API's drift monitor on the request path and in its background thread.
+
+Times DriftMonitor.observe (all a request pays), the monitor thread's drain per
+record, and /predict end to end with the monitor on and off:
+
+    python -m benchmarks.drift_overhead --budget-us 2
+
+Exits non-zero when observe costs more than --budget-us per request.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import joblib
+import numpy as np
+import httpx
+from src.api.inference import CompiledPipeline
+from src.api.monitor import DriftMonitor
+from src.drift import build_reference
+from src.storage import read_frame, data_path
+from benchmarks.api_load import load_payloads
+
+
+def training_reference(model_path: str, bins: int) -> dict:
+    # the reference the train stage would ship with this model
+    compiled = CompiledPipeline.from_pipeline(joblib.load(model_path))
+    return build_reference(read_frame(data_path("x"), fallback=True), compiled.num_cols, [col for col, _, _ in compiled.ohe], bins)
+
+
+def monitor_costs(payloads: list, reference: dict) -> dict:
+    monitor = DriftMonitor(queue_size=len(payloads))
+    monitor.set_reference(reference)
+
+    monitor.observe_many(payloads)
+    monitor.drain()
+
+    start = time.perf_counter()
+    for payload in payloads:
+        monitor.observe(payload)
+    observe_us = (time.perf_counter() - start) / len(payloads) * 1e6
+
+    start = time.perf_counter()
+    monitor.drain()
+    drain_us = (time.perf_counter() - start) / len(payloads) * 1e6
+
+    return {"features": len(reference["numeric"]) + len(reference["categorical"]), "bins": reference["bins"],
+            "observe_us": round(observe_us, 3), "drain_us_per_record": round(drain_us, 2),
+            "drain_records_per_second": round(1e6 / drain_us)}
+
+
+async def predict_latency(payloads: list, reference: dict, requests: int, rounds: int) -> dict:
+    from src.api import app as api_app
+
+    monitor = api_app.drift_monitor
+    if monitor is not None and not monitor.enabled:
+        # bundles from before the monitor carry no reference
+        monitor.set_reference(reference, api_app.registry.active.version)
+    latencies = {True: [], False: []}
+    transport = httpx.ASGITransport(app=api_app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for payload in payloads[:50]:
+            await client.post("/predict", json=payload)
+        # alternate rounds so drift (caches, clock) hits both settings alike
+        for _ in range(rounds):
+            for enabled in (True, False):
+                api_app.drift_monitor = monitor if enabled else None
+                for i in range(requests):
+                    start = time.perf_counter()
+                    await client.post("/predict", json=payloads[i % len(payloads)])
+                    latencies[enabled].append(time.perf_counter() - start)
+                if monitor is not None:
+                    # what the monitor thread does between requests
+                    monitor.drain()
+        api_app.drift_monitor = monitor
+
+    report = {}
+    for enabled, name in ((True, "monitor_on"), (False, "monitor_off")):
+        latency_us = np.asarray(latencies[enabled]) * 1e6
+        report[name] = {"p50_us": round(float(np.percentile(latency_us, 50)), 1),
+                        "p99_us": round(float(np.percentile(latency_us, 99)), 1)}
+    report["p50_overhead_us"] = round(report["monitor_on"]["p50_us"] - report["monitor_off"]["p50_us"], 1)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="models/xgb_model.pkl")
+    parser.add_argument("--payloads", default=None, help="NDJSON /predict bodies, default: rows of x")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--bins", type=int, default=20)
+    parser.add_argument("--predict-requests", type=int, default=300, help="/predict calls per round and setting")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-us", type=float, default=2.0)
+    parser.add_argument("--skip-api", action="store_true", help="only time the monitor")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads, args.records)
+    reference = training_reference(args.model, args.bins)
+    report = {"budget_us": args.budget_us, "monitor": monitor_costs(payloads, reference)}
+    if not args.skip_api:
+        report["predict"] = asyncio.run(predict_latency(payloads, reference, args.predict_requests, args.rounds))
+    report["within_budget"] = report["monitor"]["observe_us"] <= args.budget_us
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    sys.exit(0 if report["within_budget"] else 1)
@@ -0,0 +1,54 @@
+"""Cost of deriving the model features on the serving and training paths.
+
+    python -m benchmarks.features --rows 1 64 10000
+"""
+import argparse
+import json
+import time
+import pandas as pd
+from src.features import BASE_COLUMNS, add_features, add_features_record, add_features_columns
+from src.storage import read_frame, data_path
+
+
+def pandas_features(df: pd.DataFrame) -> pd.DataFrame:
+    # the Series/.loc formulation feature_engineering.py used before src/features.py
+    df["total_guests"] = df["no_of_adults"] + df["no_of_children"]
+    df["total_nights"] = df["no_of_weekend_nights"] + df["no_of_week_nights"]
+    df.loc[df["total_nights"] == 0, "total_nights"] = 1
+    df["price_per_night"] = df["avg_price_per_room"] / df["total_nights"]
+    df["is_weekend_only"] = (df["total_nights"] == df["no_of_weekend_nights"]).astype(int)
+    return df
+
+
+def time_per_call(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 64, 10000])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    base = read_frame(data_path("x"), columns=BASE_COLUMNS, fallback=True)
+    report = {}
+    for rows in args.rows:
+        df = pd.concat([base] * (rows // len(base) + 1), ignore_index=True).iloc[:rows]
+        records = df.to_dict("records")
+        repeats = max(1, args.repeats * 64 // max(rows, 64))
+
+        report[rows] = {
+            "pandas_frame_us": round(time_per_call(lambda: pandas_features(df.copy()), repeats) * 1e6, 1),
+            "frame_us": round(time_per_call(lambda: add_features(df.copy()), repeats) * 1e6, 1),
+            "records_us": round(time_per_call(lambda: [add_features_record(dict(r)) for r in records], repeats) * 1e6, 1),
+            "columns_us": round(time_per_call(lambda: add_features_columns(records), repeats) * 1e6, 1)
+        }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,110 @@
+"""Overhead of the API's request metrics against a fixed per-request budget.
+
+Times the instrumentation alone (middleware around a no-op app plus the phase
+observations a /predict records) and /predict end to end with metrics on and off:
+
+    python -m benchmarks.metrics_overhead --budget-us 25
+
+Exits non-zero when the instrumentation costs more than --budget-us per request.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import numpy as np
+import httpx
+from src.api.metrics import ApiMetrics, MetricsMiddleware
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"x-model-version", b"bench")]})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def instrumentation_us(requests: int) -> dict:
+    metrics = ApiMetrics()
+    middleware = MetricsMiddleware(noop_app, metrics)
+
+    async def bare():
+        for _ in range(requests):
+            await noop_app({"type": "http", "path": "/predict"}, receive, send)
+
+    async def instrumented():
+        for _ in range(requests):
+            await middleware({"type": "http", "path": "/predict"}, receive, send)
+            # what a /predict handler records on top of the middleware
+            start = time.perf_counter()
+            metrics.observe_phase("parse", 1e-4)
+            metrics.observe_phase("validate", 1e-5)
+            metrics.rows_by_endpoint["/predict"].inc()
+            metrics.observe_model(start, start + 1e-5, start + 2e-5, start + 1e-4)
+
+    timings = {}
+    for name, fn in (("bare", bare), ("instrumented", instrumented)):
+        await fn()
+        start = time.perf_counter()
+        await fn()
+        timings[name] = (time.perf_counter() - start) / requests * 1e6
+    return {"bare_us": round(timings["bare"], 2), "instrumented_us": round(timings["instrumented"], 2),
+            "overhead_us": round(timings["instrumented"] - timings["bare"], 2)}
+
+
+async def predict_latency(requests: int, rounds: int) -> dict:
+    from src.api import app as api_app
+    from benchmarks.api_load import load_payloads
+
+    sample_booking = load_payloads(None, 1)[0]
+
+    latencies = {True: [], False: []}
+    transport = httpx.ASGITransport(app=api_app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.post("/predict", json=sample_booking)
+        # alternate rounds so drift (caches, clock) hits both settings alike
+        for _ in range(rounds):
+            for enabled in (True, False):
+                api_app.metrics.registry.enabled = enabled
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    await client.post("/predict", json=sample_booking)
+                    latencies[enabled].append(time.perf_counter() - start)
+        api_app.metrics.registry.enabled = True
+
+    report = {}
+    for enabled, name in ((True, "metrics_on"), (False, "metrics_off")):
+        latency_us = np.asarray(latencies[enabled]) * 1e6
+        report[name] = {"p50_us": round(float(np.percentile(latency_us, 50)), 1),
+                        "p99_us": round(float(np.percentile(latency_us, 99)), 1)}
+    report["p50_overhead_us"] = round(report["metrics_on"]["p50_us"] - report["metrics_off"]["p50_us"], 1)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000, help="iterations of the instrumentation-only loop")
+    parser.add_argument("--predict-requests", type=int, default=300, help="/predict calls per round and setting")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-us", type=float, default=25.0)
+    parser.add_argument("--skip-api", action="store_true", help="only time the instrumentation")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    report = {"budget_us": args.budget_us, "instrumentation": asyncio.run(instrumentation_us(args.requests))}
+    if not args.skip_api:
+        report["predict"] = asyncio.run(predict_latency(args.predict_requests, args.rounds))
+    report["within_budget"] = report["instrumentation"]["overhead_us"] <= args.budget_us
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    sys.exit(0 if report["within_budget"] else 1)
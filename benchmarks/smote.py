@@ -0,0 +1,62 @@
+"""FastSMOTE vs imblearn's SMOTE on the preprocessed hotel training matrix.
+
+    python -m benchmarks.smote --scale 4
+"""
+import argparse
+import json
+import time
+import joblib
+import numpy as np
+from imblearn.over_sampling import SMOTE
+from src.fast_smote import FastSMOTE
+from src.storage import read_frame, data_path
+
+
+def time_call(fn, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pre-pipeline", default="models/prepipeline.pkl")
+    parser.add_argument("--scale", type=int, default=1, help="repeat the rows to simulate larger data")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    x = read_frame(data_path("x"), fallback=True)
+    y = read_frame(data_path("y"), fallback=True).values.ravel()
+    matrix = joblib.load(args.pre_pipeline).fit_transform(x, y)
+    if args.scale > 1:
+        # jitter the copies so every point keeps distinct neighbours
+        rng = np.random.default_rng(0)
+        matrix = np.vstack([matrix] + [matrix + rng.normal(0, 1e-2, matrix.shape) for _ in range(args.scale - 1)])
+        y = np.tile(y, args.scale)
+
+    baseline_seconds, (expected_x, expected_y) = time_call(
+        lambda: SMOTE(random_state=42).fit_resample(matrix, y), args.repeats)
+    report = {
+        "rows": int(matrix.shape[0]),
+        "features": int(matrix.shape[1]),
+        "imblearn_seconds": round(baseline_seconds, 4)
+    }
+
+    for algorithm in ("kd_tree", "brute"):
+        seconds, (x_res, y_res) = time_call(
+            lambda: FastSMOTE(random_state=42, algorithm=algorithm).fit_resample(matrix, y), args.repeats)
+        report[algorithm] = {
+            "seconds": round(seconds, 4),
+            "speedup": round(baseline_seconds / seconds, 2),
+            "same_labels": bool(np.array_equal(y_res, expected_y)),
+            "max_abs_diff": float(np.abs(x_res - expected_x).max())
+        }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
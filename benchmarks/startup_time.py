@@ -0,0 +1,71 @@
+"""Cold-start comparison: unpickling the full imblearn pipeline vs loading the serving bundle.
+
+    python -m benchmarks.startup_time --repeats 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+PICKLE_LOADER = """
+import joblib
+from src.api.inference import CompiledPipeline
+CompiledPipeline.from_pipeline(joblib.load({path!r}))
+"""
+
+BUNDLE_LOADER = """
+from src.api.inference import CompiledPipeline
+CompiledPipeline.load({path!r})
+"""
+
+REPORT = """
+import json, sys
+from src.utils import current_rss
+print(json.dumps({"rss_bytes": current_rss(),
+                  "sklearn_imported": "sklearn" in sys.modules,
+                  "imblearn_imported": "imblearn" in sys.modules}))
+"""
+
+
+def run_once(loader: str, path: str) -> dict:
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", loader.format(path=path) + REPORT],
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def benchmark(loader: str, path: str, repeats: int) -> dict:
+    runs = [run_once(loader, path) for _ in range(repeats)]
+    seconds = [r["seconds"] for r in runs]
+    return {
+        "path": path,
+        "median_seconds": round(statistics.median(seconds), 4),
+        "min_seconds": round(min(seconds), 4),
+        "rss_mb": round(runs[-1]["rss_bytes"] / 2 ** 20, 1),
+        "sklearn_imported": runs[-1]["sklearn_imported"],
+        "imblearn_imported": runs[-1]["imblearn_imported"]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pickle", default="models/xgb_model.pkl")
+    parser.add_argument("--bundle", default="models/serving_bundle")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    report = {
+        "pickle": benchmark(PICKLE_LOADER, args.pickle, args.repeats),
+        "bundle": benchmark(BUNDLE_LOADER, args.bundle, args.repeats)
+    }
+    report["speedup"] = round(report["pickle"]["median_seconds"] / report["bundle"]["median_seconds"], 2)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,55 @@
+"""Stage I/O cost of the processed-data formats: write/read time and size on disk.
+
+    python -m benchmarks.storage_io --input data/processed/feature_engineered_data.parquet
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+from src.storage import read_frame, write_frame, EXTENSIONS
+
+
+def time_call(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(df: pd.DataFrame, repeats: int) -> dict:
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt, ext in EXTENSIONS.items():
+            path = os.path.join(tmp_dir, "frame" + ext)
+            write_seconds = time_call(lambda: write_frame(df.copy(), path), repeats)
+            read_seconds = time_call(lambda: read_frame(path), repeats)
+            report[fmt] = {
+                "write_seconds": round(write_seconds, 4),
+                "read_seconds": round(read_seconds, 4),
+                "size_bytes": os.path.getsize(path)
+            }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default="data/processed/feature_engineered_data.parquet")
+    parser.add_argument("--scale", type=int, default=1, help="repeat the frame to simulate larger data")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    df = read_frame(args.input)
+    if args.scale > 1:
+        df = pd.concat([df] * args.scale, ignore_index=True)
+
+    report = {"rows": len(df), "columns": df.shape[1], **benchmark(df, args.repeats)}
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
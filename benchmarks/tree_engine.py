@@ -0,0 +1,76 @@
+"""Flattened-tree engine (src/api/trees.py) against XGBoost's predictor on the trained model.
+
+Times scoring of ready-made feature matrices, so only the tree evaluation differs,
+and checks parity on every row of x:
+
+    python -m benchmarks.tree_engine --rows 1 64 10000
+"""
+import argparse
+import json
+import time
+import joblib
+import numpy as np
+from src.api.inference import CompiledPipeline, preprocess_frame
+from src.storage import read_frame, data_path
+
+
+def time_per_call(fn, repeats: int) -> list:
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summary_us(timings: list) -> dict:
+    timings_us = np.asarray(timings) * 1e6
+    return {"p50_us": round(float(np.percentile(timings_us, 50)), 1),
+            "p99_us": round(float(np.percentile(timings_us, 99)), 1)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="models/xgb_model.pkl")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 64, 10000])
+    parser.add_argument("--repeats", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=None, help="xgboost threads, default: all")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    compiled = CompiledPipeline.from_pipeline(pipeline).use_engine("trees")
+    booster = compiled.booster
+    if args.threads is not None:
+        booster.set_param({"nthread": args.threads})
+
+    x = read_frame(data_path("x"), fallback=True)
+    matrix = np.ascontiguousarray(preprocess_frame(pipeline, x), dtype=np.float32)
+
+    margin = booster.inplace_predict(matrix, iteration_range=compiled.iteration_range, predict_type="margin")
+    proba = pipeline.predict_proba(x)[:, 1]
+    trees_proba = compiled.trees.predict(matrix)
+    report = {
+        "model": {"trees": compiled.trees.n_trees, "depth": compiled.trees.depth,
+                  "nodes": int(len(compiled.trees.feature)), "features": int(matrix.shape[1])},
+        "parity": {"rows": len(matrix),
+                   "margin_mismatches": int((compiled.trees.predict_margin(matrix) != margin).sum()),
+                   "proba_mismatches": int((trees_proba != proba).sum()),
+                   "proba_max_abs_diff": float(np.abs(trees_proba - proba).max())},
+        "batches": {}
+    }
+
+    for rows in args.rows:
+        batch = np.ascontiguousarray(np.resize(matrix, (rows, matrix.shape[1])))
+        repeats = max(5, args.repeats * 64 // max(rows, 64))
+        xgb = summary_us(time_per_call(
+            lambda: booster.inplace_predict(batch, iteration_range=compiled.iteration_range), repeats))
+        trees = summary_us(time_per_call(lambda: compiled.trees.predict(batch), repeats))
+        report["batches"][rows] = {"xgboost": xgb, "trees": trees,
+                                   "speedup_p50": round(xgb["p50_us"] / trees["p50_us"], 2)}
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
@@ -1,49 +1,421 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response, Header, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from typing import Optional
 import pandas as pd
-import joblib
+import numpy as np
+import hmac
+import json
+import os
+import time
 import uvicorn
 from src.schemas.input_schema import HotelReservationInput
+from src.api.batcher import MicroBatcher
+from src.api.cache import InMemoryTTLCache, PredictionCache
+from src.api.registry import ModelRegistry
+from src.api.inference import preprocess_frame
+from src.api.metrics import ApiMetrics, MetricsMiddleware, CONTENT_TYPE, DEFAULT_BUCKETS
+from src.api.monitor import DriftMonitor
+from src.logger import get_logger
+from src.utils import load_config
+from src.validation_engine import CompiledSchema
+from src.schemas.hotel_schema import HOTEL_COLUMNS
+from src.features import add_features, add_features_record, add_features_columns
+
+logger = get_logger(__name__)
+
+config = load_config()
+api_config = config.get("api", {})
+registry_config = api_config.get("registry", {})
+# the environment wins, e.g. a bundle mounted into the container
+model_path = os.environ.get("SERVING_MODEL_PATH") or registry_config.get("model_path", "models/serving_bundle")
+if not os.path.exists(model_path):
+    # models trained before the serving bundle existed only ship the pickle
+    model_path = registry_config.get("fallback_model_path", "models/xgb_model.pkl")
+
+# set by python -m src.api.serve, every worker keeps its own registry, metrics and drift summaries
+serving_worker = os.environ.get("SERVING_WORKER")
+serving_workers = int(os.environ.get("SERVING_WORKERS", 1))
+
+# /admin/* swaps the served model, it stays off unless enabled and given a token
+admin_config = api_config.get("admin", {})
+admin_token = os.environ.get(admin_config.get("token_env", "ADMIN_TOKEN"))
+admin_enabled = admin_config.get("enabled", False) and bool(admin_token)
+if admin_config.get("enabled", False) and not admin_token:
+    logger.warning(f"api.admin is enabled but {admin_config.get('token_env', 'ADMIN_TOKEN')} is not set, admin routes stay off")
+if admin_enabled and serving_workers > 1:
+    # a request reaches one worker, a reload or activate would leave the others on the old model
+    admin_enabled = False
+    logger.warning(f"admin routes are off with {serving_workers} serve workers, send SIGHUP to the supervisor to reload")
+
+# range/membership checks of the training schema, for the fields a request carries
+request_checks = None
+if api_config.get("validate_ranges", True):
+    request_checks = CompiledSchema.from_spec(HOTEL_COLUMNS).select(HotelReservationInput.model_fields)
+
+cache_config = api_config.get("cache", {})
+cache = None
+if cache_config.get("enabled", False):
+    cache = PredictionCache(InMemoryTTLCache(max_size=cache_config.get("max_size", 10000),
+                                             ttl_seconds=cache_config.get("ttl_seconds", 300)))
+
+
+metrics_config = api_config.get("metrics", {})
+metrics = ApiMetrics(buckets=metrics_config.get("buckets", DEFAULT_BUCKETS),
+                     enabled=metrics_config.get("enabled", True),
+                     const_labels={"worker": serving_worker} if serving_worker is not None else None)
 
-app = FastAPI(
-    title="Hotel Reservation Prediction API",
-    version="1.0"
-)
-model = None
+
+def set_drift_gauges(report: dict):
+    for feature, score in report["window"]["features"].items():
+        metrics.feature_psi.labels(feature).set(score["psi"])
+
+
+drift_config = config.get("drift", {})
+drift_monitor = None
+if drift_config.get("enabled", True):
+    drift_monitor = DriftMonitor(queue_size=drift_config.get("queue_size", 100000),
+                                 update_interval_seconds=drift_config.get("update_interval_seconds", 1),
+                                 report_interval_seconds=drift_config.get("report_interval_seconds", 3600),
+                                 report_dir=drift_config.get("report_dir", "reports/drift"),
+                                 psi_alert=drift_config.get("psi_alert", 0.2),
+                                 min_rows=drift_config.get("min_rows", 500),
+                                 on_report=set_drift_gauges)
+
+
+def on_model_activated(loaded):
+    metrics.set_model(loaded.version)
+    if cache is not None:
+        cache.invalidate(loaded.version)
+    if drift_monitor is not None:
+        # pickles and bundles from before the monitor carry no reference, monitoring pauses
+        reference = loaded.fast_model.reference if loaded.fast_model is not None else None
+        drift_monitor.set_reference(reference, loaded.version)
+
+
+# set per worker by python -m src.api.serve, plain uvicorn keeps xgboost's default
+serving_threads = os.environ.get("SERVING_THREADS") or api_config.get("serving", {}).get("threads")
+
+registry = ModelRegistry(max_versions=registry_config.get("max_versions", 3),
+                         fast_path=api_config.get("fast_path", True),
+                         on_activate=on_model_activated,
+                         threads=int(serving_threads) if serving_threads else None,
+                         # bundles carry their own threshold (src/threshold.py), this covers the rest
+                         default_threshold=config.get("threshold", {}).get("default", 0.55),
+                         engine=api_config.get("engine", "xgboost"),
+                         trees_max_rows=api_config.get("trees_max_rows", 16))
 
 try:
-    model = joblib.load("models/xgb_model.pkl")
+    registry.load(model_path)
 except Exception as e:
     raise RuntimeError(f"Model loading failed: {e}")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if registry_config.get("watch", False):
+        registry.watch(model_path, registry_config.get("watch_interval_seconds", 5))
+    if os.environ.get("SERVING_READY_FILE"):
+        # the model is loaded at import, tell the serve supervisor this worker can take traffic
+        open(os.environ["SERVING_READY_FILE"], "w").close()
+    if drift_monitor is not None:
+        drift_monitor.start()
+    yield
+    registry.stop_watch()
+    if drift_monitor is not None:
+        drift_monitor.stop()
+
+
+app = FastAPI(
+    title="Hotel Reservation Prediction API",
+    version="1.0",
+    lifespan=lifespan
+)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+
+def format_prediction(y_prob: float, threshold: float) -> dict:
+    custom_pred = 1 if y_prob >= threshold else 0
+
+    prediction_label = "Not Canceled" if custom_pred == 1 else "Canceled"
+
+    return {
+        "prediction_code": int(custom_pred),
+        "prediction_label": prediction_label,
+        "probability": round(float(y_prob), 3)
+    }
+
+
+def resolve_model(version: Optional[str]):
+    try:
+        return registry.get(version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# below this many rows building column arrays costs more than filling the matrix row by row
+columnwise_min_rows = api_config.get("columnwise_min_rows", 16)
+
+
+def predict_records(records: list, loaded) -> np.ndarray:
+    start = time.perf_counter()
+    if loaded.fast_model is not None:
+        if len(records) >= columnwise_min_rows:
+            columns = add_features_columns(records)
+            features_done = time.perf_counter()
+            matrix = loaded.fast_model.transform_columns(columns)
+        else:
+            rows = [add_features_record(dict(r)) for r in records]
+            features_done = time.perf_counter()
+            matrix = loaded.fast_model.transform(rows)
+        preprocessed = time.perf_counter()
+        y_prob = loaded.fast_model.predict_matrix(matrix)
+    else:
+        df = add_features(pd.DataFrame(records))
+        features_done = time.perf_counter()
+        matrix = preprocess_frame(loaded.pipeline, df)
+        preprocessed = time.perf_counter()
+        y_prob = loaded.pipeline.steps[-1][1].predict_proba(matrix)[:, 1]
+    metrics.observe_model(start, features_done, preprocessed, time.perf_counter())
+    return y_prob
+
+
+def predict_one(payload: dict, loaded) -> float:
+    if loaded.fast_model is None:
+        return float(predict_records([payload], loaded)[0])
+    start = time.perf_counter()
+    record = add_features_record(dict(payload))
+    features_done = time.perf_counter()
+    row = loaded.fast_model.transform_one(record)
+    preprocessed = time.perf_counter()
+    y_prob = float(loaded.fast_model.predict_matrix(row)[0])
+    metrics.observe_model(start, features_done, preprocessed, time.perf_counter())
+    return y_prob
+
+
+def predict_items(items: list) -> np.ndarray:
+    # a micro-batch can mix model versions, score each version's rows together
+    y_prob = np.empty(len(items))
+    groups = {}
+    for i, (loaded, _) in enumerate(items):
+        groups.setdefault(loaded.version, (loaded, []))[1].append(i)
+    for loaded, idx in groups.values():
+        y_prob[idx] = predict_records([items[i][1] for i in idx], loaded)
+    return y_prob
+
+
+batching_config = api_config.get("micro_batching", {})
+batcher = None
+if batching_config.get("enabled", False):
+    batcher = MicroBatcher(predict_items,
+                           max_batch_size=batching_config.get("max_batch_size", 64),
+                           max_wait_ms=batching_config.get("max_wait_ms", 2),
+                           workers=batching_config.get("workers", 1))
+
+
+def parse_batch_body(body: bytes, content_type: str) -> list:
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        return [json.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()]
+
+    records = json.loads(body)
+    if isinstance(records, dict) and "records" in records:
+        records = records["records"]
+    if not isinstance(records, list):
+        raise ValueError("batch body must be a JSON list of bookings or NDJSON")
+    return records
+
+
+def score_records(records: list, loaded) -> list:
+    results = [None] * len(records)
+    valid_rows = []
+    valid_idx = []
+
+    start = time.perf_counter()
+
+    for i, record in enumerate(records):
+        try:
+            valid_rows.append(HotelReservationInput.model_validate(record).model_dump())
+            valid_idx.append(i)
+        except ValidationError as e:
+            results[i] = {"index": i, "error": e.errors(include_url=False)}
+    parsed = time.perf_counter()
+    metrics.observe_phase("parse", parsed - start)
+
+    if request_checks is not None and valid_rows:
+        reasons = request_checks.reasons(pd.DataFrame(valid_rows))
+        metrics.observe_phase("validate", time.perf_counter() - parsed)
+        for i, reason in zip(valid_idx, reasons):
+            if reason is not None:
+                results[i] = {"index": i, "error": f"failed checks: {reason}"}
+        valid_rows = [row for row, reason in zip(valid_rows, reasons) if reason is None]
+        valid_idx = [i for i, reason in zip(valid_idx, reasons) if reason is None]
+
+    if drift_monitor is not None:
+        drift_monitor.observe_many(valid_rows)
+
+    if cache is not None:
+        keys = [cache.key(row, loaded.version) for row in valid_rows]
+        uncached = []
+        for row, key, i in zip(valid_rows, keys, valid_idx):
+            y_prob = cache.get(key)
+            if y_prob is None:
+                uncached.append((row, key, i))
+            else:
+                results[i] = {"index": i, **format_prediction(y_prob, loaded.threshold), "error": None}
+        valid_rows = [row for row, _, _ in uncached]
+        valid_idx = [i for _, _, i in uncached]
+        valid_keys = [key for _, key, _ in uncached]
+
+    if valid_rows:
+        try:
+            y_prob = predict_records(valid_rows, loaded)
+        except Exception:
+            # one bad row (e.g. unseen category) fails the vectorized call,
+            # fall back to row-wise scoring so only that row gets the error
+            y_prob = np.full(len(valid_rows), np.nan)
+            for j, row in enumerate(valid_rows):
+                try:
+                    y_prob[j] = predict_records([row], loaded)[0]
+                except Exception as row_error:
+                    results[valid_idx[j]] = {"index": valid_idx[j], "error": str(row_error)}
+
+        for j, i in enumerate(valid_idx):
+            if results[i] is None:
+                results[i] = {"index": i, **format_prediction(y_prob[j], loaded.threshold), "error": None}
+                if cache is not None:
+                    cache.set(valid_keys[j], float(y_prob[j]))
+
+    return results
+
+
+def internal_error(endpoint: str, e: Exception) -> HTTPException:
+    metrics.exceptions.labels(endpoint, type(e).__name__).inc()
+    logger.error(f"{endpoint} failed: {type(e).__name__}: {e}")
+    return HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/")
 async def health_check():
     return {"status": "ok"}
 
 @app.post("/predict")
-async def predict_cancellation(data: HotelReservationInput):
+async def predict_cancellation(data: HotelReservationInput, request: Request, response: Response,
+                               x_model_version: Optional[str] = Header(default=None)):
+    start = time.perf_counter()
+    if "metrics_start" in request.scope:
+        # body read and pydantic validation happen before the handler is called
+        metrics.observe_phase("parse", start - request.scope["metrics_start"])
+
+    # pin the model for the whole request so a concurrent swap cannot change it midway
+    loaded = resolve_model(x_model_version)
+    response.headers["X-Model-Version"] = loaded.version
+    metrics.rows_by_endpoint["/predict"].inc()
+
+    payload = data.model_dump()
+    if request_checks is not None:
+        reason = request_checks.record_reasons(payload)
+        metrics.observe_phase("validate", time.perf_counter() - start)
+        if reason is not None:
+            raise HTTPException(status_code=422, detail=f"failed checks: {reason}")
+    if drift_monitor is not None:
+        # queued only, the summaries are updated by the monitor's thread
+        drift_monitor.observe(payload)
+
+    try:
+        if cache is not None:
+            key = cache.key(payload, loaded.version)
+            y_prob = cache.get(key)
+            if y_prob is not None:
+                return format_prediction(y_prob, loaded.threshold)
+
+        if batcher is not None:
+            # the batch's own phases are recorded by predict_records in the worker thread
+            submitted = time.perf_counter()
+            y_prob = await batcher.submit((loaded, payload))
+            metrics.observe_phase("batch_wait", time.perf_counter() - submitted)
+        else:
+            y_prob = predict_one(payload, loaded)
+
+        if cache is not None:
+            cache.set(key, float(y_prob))
+
+        return format_prediction(y_prob, loaded.threshold)
+
+    except Exception as e:
+        raise internal_error("/predict", e)
+
+@app.post("/predict/batch")
+async def predict_batch(request: Request, response: Response,
+                        x_model_version: Optional[str] = Header(default=None)):
+    loaded = resolve_model(x_model_version)
+    response.headers["X-Model-Version"] = loaded.version
+
     try:
-        df = pd.DataFrame([data.model_dump()])
-        
-        df['total_nights'] = df['no_of_weekend_nights'] + df['no_of_week_nights']
-        df['total_guests'] = df['no_of_adults'] + df['no_of_children']
-        df['price_per_night'] = df['avg_price_per_room']
-        df['is_weekend_only'] = (df['no_of_week_nights'] == 0).astype(int)
-
-        y_prob = model.predict_proba(df)[0, 1]
-
-        threshold = 0.55 
-        custom_pred = 1 if y_prob >= threshold else 0
-
-        prediction_label = "Not Canceled" if custom_pred == 1 else "Canceled"
-        
-        return {
-            "prediction_code": int(custom_pred),
-            "prediction_label": prediction_label,
-            "probability": round(float(y_prob), 3)
-        }
+        records = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    metrics.rows_by_endpoint["/predict/batch"].inc(len(records))
+    try:
+        results = score_records(records, loaded)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    
+        raise internal_error("/predict/batch", e)
+
+    return {
+        "n_records": len(results),
+        "n_errors": sum(r["error"] is not None for r in results),
+        "results": results
+    }
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+@app.get("/drift")
+async def drift_report():
+    if drift_monitor is None or not drift_monitor.enabled:
+        raise HTTPException(status_code=404, detail="drift monitoring is off or the active model has no reference")
+    await run_in_threadpool(drift_monitor.drain)
+    return {"worker": serving_worker, **drift_monitor.scores()}
+
+@app.get("/batcher/stats")
+async def batcher_stats():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if not admin_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=401, detail="invalid or missing X-Admin-Token")
+
+@app.get("/admin/models", dependencies=[Depends(require_admin)])
+async def list_models():
+    return registry.stats()
+
+@app.post("/admin/models/reload", dependencies=[Depends(require_admin)])
+async def reload_model(activate: bool = True):
+    # only the configured model, a request never picks the file that gets unpickled
+    try:
+        loaded = await run_in_threadpool(registry.load, model_path, activate)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model loading failed: {e}")
+    return loaded.info()
+
+@app.post("/admin/models/{version}/activate", dependencies=[Depends(require_admin)])
+async def activate_model(version: str):
+    try:
+        return registry.activate(version).info()
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
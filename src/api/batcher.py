@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one vectorized model call.
+
+    A batch is flushed once it holds `max_batch_size` rows or the oldest row
+    has waited `max_wait_ms`; a request that arrives alone while no batch is being
+    scored goes out at once. The model call runs in a worker thread so the
+    event loop keeps accepting requests while a batch is being scored; up to
+    `workers` batches are scored at once. While every worker is busy the queue
+    keeps filling, so the next batch starts out larger.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0, workers: int = 1):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="micro-batcher")
+        self._loop = None
+        self._queue = None
+        self._task = None
+        self._slots = None
+        self._flushes = set()
+
+        self.buckets = [1]
+        while self.buckets[-1] < max_batch_size:
+            self.buckets.append(min(self.buckets[-1] * 2, max_batch_size))
+        self.batch_size_counts = [0] * len(self.buckets)
+        self.flush_reasons = {"size": 0, "timeout": 0, "idle": 0}
+        self.batches = 0
+        self.rows = 0
+        self.max_queue_depth = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, record):
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((record, future))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _run(self):
+        while True:
+            # a free worker first, so the batch is not closed while it could not be scored anyway
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            # a lone request while no batch is being scored has nothing to wait for
+            idle = self._queue.empty() and not self._flushes
+
+            while not idle and len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self._record_batch(len(batch), "idle" if idle else None)
+            flush = self._loop.create_task(self._flush(batch))
+            # the loop only keeps weak references to tasks
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch):
+        records = [record for record, _ in batch]
+        try:
+            results = await self._loop.run_in_executor(self._executor, self._predict_batch, records)
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            self._slots.release()
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _predict_batch(self, records):
+        try:
+            return list(self.predict_fn(records))
+        except Exception:
+            # isolate the failing row(s) so the rest of the batch still gets answers
+            results = []
+            for record in records:
+                try:
+                    results.append(self.predict_fn([record])[0])
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    def _record_batch(self, size: int, reason: str = None):
+        self.batches += 1
+        self.rows += size
+        self.flush_reasons[reason or ("size" if size >= self.max_batch_size else "timeout")] += 1
+        for i, bound in enumerate(self.buckets):
+            if size <= bound:
+                self.batch_size_counts[i] += 1
+                break
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "workers": self.workers,
+            "in_flight_batches": len(self._flushes),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": round(self.rows / self.batches, 3) if self.batches else 0.0,
+            "flush_reasons": dict(self.flush_reasons),
+            "batch_size_histogram": {f"le_{b}": c for b, c in zip(self.buckets, self.batch_size_counts)}
+        }
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheBackend:
+    """Storage interface for PredictionCache; swap in a shared store by subclassing."""
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class InMemoryTTLCache(CacheBackend):
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if self.ttl_seconds and expires_at < self.clock():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._data[key] = (value, self.clock() + self.ttl_seconds)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PredictionCache:
+
+    def __init__(self, backend: CacheBackend, model_version: str = ""):
+        self.backend = backend
+        self.model_version = model_version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, payload: dict, model_version: str = None) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        version = self.model_version if model_version is None else model_version
+        return hashlib.sha1(f"{version}|{canonical}".encode()).hexdigest()
+
+    def get(self, key: str):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value) -> None:
+        self.backend.set(key, value)
+
+    def invalidate(self, model_version: str) -> None:
+        self.model_version = model_version
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "model_version": self.model_version,
+            "size": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
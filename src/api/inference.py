@@ -0,0 +1,275 @@
+import json
+import os
+import shutil
+import threading
+import numpy as np
+from src.threshold import THRESHOLD_FILE
+from src.drift import DRIFT_REFERENCE_FILE
+from src.api.trees import TreeEnsemble
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_ARRAYS = ("num_pos", "num_offset", "num_scale", "ohe_pos")
+ENGINES = ("xgboost", "trees", "auto")
+
+
+def preprocess_frame(pipeline, df):
+    # the steps pipeline.predict_proba would run before the classifier, samplers are fit-only
+    for _, step in pipeline.steps[:-1]:
+        if step not in (None, "passthrough") and not hasattr(step, "fit_resample"):
+            df = step.transform(df)
+    return df
+
+
+class CompiledPipeline:
+    """Flattens the fitted preprocessing + XGBoost pipeline into NumPy arrays
+    so a single booking can be scored without building a DataFrame.
+
+    Build it from a fitted pipeline with `from_pipeline`, or from a serving
+    bundle with `load`, which needs neither sklearn nor imblearn.
+
+    Scores go through the native booster by default; `use_engine("trees")` switches to
+    the flattened trees of src/api/trees.py, "auto" uses them for small batches only.
+    """
+
+    def __init__(self, num_cols, num_pos, num_offset, num_scale, ohe, n_features, booster, iteration_range=(0, 0),
+                 decision: dict = None, trees: TreeEnsemble = None, reference: dict = None):
+        self.num_cols = list(num_cols)
+        self.num_pos = num_pos
+        self.num_offset = num_offset
+        self.num_scale = num_scale
+        self.ohe = ohe
+        self.ohe_pos = np.asarray(
+            [pos for _, lookup, _ in self.ohe for pos in lookup.values() if pos is not None],
+            dtype=np.intp)
+        self.n_features = int(n_features)
+        self.booster = booster
+        self.iteration_range = tuple(iteration_range)
+        # decision threshold chosen on the out-of-fold probabilities, see src/threshold.py
+        self.decision = decision
+        # training distribution of the inputs the API's drift monitor compares against, see src/drift.py
+        self.reference = reference
+        self.trees = trees
+        self.engine = "xgboost"
+        # batches of up to this many rows go through self.trees
+        self._trees_max_rows = -1
+
+        self._local = threading.local()
+        self._ohe_arrays = None
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        from sklearn.preprocessing import StandardScaler, RobustScaler, OneHotEncoder, FunctionTransformer
+
+        pre_pipeline = pipeline.steps[0][1]
+        classifier = pipeline.steps[-1][1]
+
+        num_cols, num_pos, num_offset, num_scale = [], [], [], []
+        ohe = []
+
+        for name, transformer, cols in pre_pipeline.transformers_:
+            if transformer == "drop" or len(cols) == 0:
+                continue
+            out = pre_pipeline.output_indices_[name]
+            step = transformer.steps[-1][1] if hasattr(transformer, "steps") else transformer
+
+            if step == "passthrough" or (isinstance(step, FunctionTransformer) and step.func is None):
+                offset, scale = np.zeros(len(cols)), np.ones(len(cols))
+
+            elif isinstance(step, StandardScaler):
+                offset = step.mean_ if step.mean_ is not None and step.with_mean else np.zeros(len(cols))
+                scale = step.scale_ if step.scale_ is not None else np.ones(len(cols))
+
+            elif isinstance(step, RobustScaler):
+                offset = step.center_ if step.with_centering else np.zeros(len(cols))
+                scale = step.scale_ if step.with_scaling else np.ones(len(cols))
+
+            elif isinstance(step, OneHotEncoder):
+                ohe.extend(cls._compile_ohe(step, cols, out.start))
+                continue
+
+            else:
+                raise TypeError(f"cannot compile transformer {name!r} of type {type(step).__name__}")
+
+            num_cols.extend(cols)
+            num_pos.extend(range(out.start, out.stop))
+            num_offset.extend(offset)
+            num_scale.extend(scale)
+
+        best_iteration = getattr(classifier, "best_iteration", None)
+
+        return cls(num_cols,
+                   np.asarray(num_pos, dtype=np.intp),
+                   np.asarray(num_offset, dtype=np.float64),
+                   np.asarray(num_scale, dtype=np.float64),
+                   ohe,
+                   max(s.stop for s in pre_pipeline.output_indices_.values()),
+                   classifier.get_booster(),
+                   (0, best_iteration + 1) if best_iteration is not None else (0, 0))
+
+    @staticmethod
+    def _compile_ohe(encoder, cols, start):
+        pos = start
+        ohe = []
+        for i, col in enumerate(cols):
+            drop_idx = None if encoder.drop_idx_ is None else encoder.drop_idx_[i]
+            lookup = {}
+            for j, category in enumerate(encoder.categories_[i]):
+                if drop_idx is not None and j == drop_idx:
+                    lookup[category] = None
+                else:
+                    lookup[category] = pos
+                    pos += 1
+            ohe.append((col, lookup, encoder.handle_unknown == "error"))
+        return ohe
+
+    def save(self, bundle_dir: str):
+        # write next to the target and swap in, so a watcher never sees half a bundle
+        tmp_dir = bundle_dir.rstrip("/\\") + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for name in BUNDLE_ARRAYS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        self.booster.save_model(os.path.join(tmp_dir, "booster.ubj"))
+        try:
+            trees = self.trees or TreeEnsemble.from_booster(self.booster, self.iteration_range)
+            trees.save(tmp_dir)
+        except ValueError:
+            # boosters the tree engine cannot score keep to xgboost
+            pass
+        if self.decision is not None:
+            with open(os.path.join(tmp_dir, THRESHOLD_FILE), "w") as file:
+                json.dump(self.decision, file)
+        if self.reference is not None:
+            with open(os.path.join(tmp_dir, DRIFT_REFERENCE_FILE), "w") as file:
+                json.dump(self.reference, file)
+
+        with open(os.path.join(tmp_dir, "preprocessing.json"), "w") as file:
+            json.dump({
+                "format_version": BUNDLE_FORMAT_VERSION,
+                "num_cols": self.num_cols,
+                "ohe": [[col, {str(k): v for k, v in lookup.items()}, strict] for col, lookup, strict in self.ohe],
+                "n_features": self.n_features,
+                "iteration_range": list(self.iteration_range)
+            }, file, indent=2)
+
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+        os.replace(tmp_dir, bundle_dir)
+
+    @classmethod
+    def load(cls, bundle_dir: str, mmap: bool = True):
+        from xgboost import Booster
+
+        with open(os.path.join(bundle_dir, "preprocessing.json"), "r") as file:
+            meta = json.load(file)
+        if meta.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"unsupported serving bundle format {meta.get('format_version')!r}")
+
+        arrays = {name: np.load(os.path.join(bundle_dir, f"{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in BUNDLE_ARRAYS}
+        booster = Booster(model_file=os.path.join(bundle_dir, "booster.ubj"))
+        decision = None
+        if os.path.exists(os.path.join(bundle_dir, THRESHOLD_FILE)):
+            with open(os.path.join(bundle_dir, THRESHOLD_FILE), "r") as file:
+                decision = json.load(file)
+        trees = TreeEnsemble.load(bundle_dir, mmap) if TreeEnsemble.exists(bundle_dir) else None
+        reference = None
+        if os.path.exists(os.path.join(bundle_dir, DRIFT_REFERENCE_FILE)):
+            with open(os.path.join(bundle_dir, DRIFT_REFERENCE_FILE), "r") as file:
+                reference = json.load(file)
+
+        return cls(meta["num_cols"],
+                   arrays["num_pos"],
+                   arrays["num_offset"],
+                   arrays["num_scale"],
+                   [(col, lookup, strict) for col, lookup, strict in meta["ohe"]],
+                   meta["n_features"],
+                   booster,
+                   meta["iteration_range"],
+                   decision,
+                   trees,
+                   reference)
+
+    def _row(self):
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.zeros((1, self.n_features), dtype=np.float32)
+        return row
+
+    def _fill(self, row, record: dict):
+        values = np.fromiter((record[c] for c in self.num_cols), dtype=np.float64, count=len(self.num_cols))
+        row[self.num_pos] = (values - self.num_offset) / self.num_scale
+        row[self.ohe_pos] = 0.0
+        for col, lookup, strict in self.ohe:
+            category = record[col]
+            if category not in lookup:
+                if strict:
+                    raise ValueError(f"Found unknown category {category!r} in column {col!r} during transform")
+                continue
+            pos = lookup[category]
+            if pos is not None:
+                row[pos] = 1.0
+
+    def transform(self, records: list) -> np.ndarray:
+        matrix = np.zeros((len(records), self.n_features), dtype=np.float32)
+        for i, record in enumerate(records):
+            self._fill(matrix[i], record)
+        return matrix
+
+    def _ohe_lookup_arrays(self) -> list:
+        # per OHE column: sorted category labels and their matrix position (-1 = dropped)
+        if self._ohe_arrays is None:
+            arrays = []
+            for col, lookup, strict in self.ohe:
+                labels = np.asarray([str(category) for category in lookup])
+                positions = np.asarray([-1 if pos is None else pos for pos in lookup.values()], dtype=np.intp)
+                order = np.argsort(labels)
+                arrays.append((col, labels[order], positions[order], strict))
+            self._ohe_arrays = arrays
+        return self._ohe_arrays
+
+    def transform_columns(self, columns) -> np.ndarray:
+        """Column-wise `transform`: `columns` maps every input, derived features included, to
+        an array (a dict or a DataFrame). One vectorized scale of the numeric block and a
+        sorted-label search per OHE column replace the per-record loop."""
+        values = np.column_stack([np.asarray(columns[col], dtype=np.float64) for col in self.num_cols])
+        n = len(values)
+        matrix = np.zeros((n, self.n_features), dtype=np.float32)
+        matrix[:, self.num_pos] = (values - self.num_offset) / self.num_scale
+        rows = np.arange(n)
+        for col, labels, positions, strict in self._ohe_lookup_arrays():
+            categories = np.asarray(columns[col]).astype(str)
+            idx = np.minimum(np.searchsorted(labels, categories), len(labels) - 1)
+            found = labels[idx] == categories
+            if strict and not found.all():
+                raise ValueError(f"Found unknown category {categories[~found][0]!r} in column {col!r} during transform")
+            pos = np.where(found, positions[idx], -1)
+            hit = pos >= 0
+            matrix[rows[hit], pos[hit]] = 1.0
+        return matrix
+
+    def transform_one(self, record: dict) -> np.ndarray:
+        # (1, n_features) row reused per thread, valid until the next call on this thread
+        row = self._row()
+        self._fill(row[0], record)
+        return row
+
+    def use_engine(self, engine: str = "xgboost", trees_max_rows: int = 16):
+        if engine not in ENGINES:
+            raise ValueError(f"unknown inference engine {engine!r}, expected one of {ENGINES}")
+        if engine != "xgboost" and self.trees is None:
+            self.trees = TreeEnsemble.from_booster(self.booster, self.iteration_range)
+        self.engine = engine
+        self._trees_max_rows = {"xgboost": -1, "trees": np.inf, "auto": trees_max_rows}[engine]
+        return self
+
+    def predict_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        if len(matrix) <= self._trees_max_rows:
+            return self.trees.predict(matrix)
+        return self.booster.inplace_predict(matrix, iteration_range=self.iteration_range)
+
+    def predict_one(self, record: dict) -> float:
+        return float(self.predict_matrix(self.transform_one(record))[0])
+
+    def predict_many(self, records: list) -> np.ndarray:
+        return self.predict_matrix(self.transform(records))
@@ -0,0 +1,267 @@
+import bisect
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds, fine below 1ms where a single booking is scored
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# where a request spends its time: body + pydantic, range checks, derived features and
+# DataFrame construction, preprocessing to the model matrix, booster evaluation, micro-batch wait
+PHASES = ("parse", "validate", "features", "preprocess", "predict", "batch_wait")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, *extra: str) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(label for label in extra if label)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# children take no lock: updates come from the event loop and the micro-batcher thread,
+# and an increment lost to a GIL switch is an acceptable error for monitoring counters,
+# where a lock would double the cost of every observation
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class _HistogramChild:
+    """Bucket counts live in one list sized at creation; an observation is a bisect and two adds."""
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: tuple):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name: str, documentation: str, labelnames: tuple = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """The child for these label values; resolve it once and keep it on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield self.name, _format_labels(self.labelnames, values, self.registry.const_labels), child.value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name: str, documentation: str, labelnames: tuple = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def samples(self):
+        les = [repr(b) for b in self.upper_bounds] + ["+Inf"]
+        const = self.registry.const_labels
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for le, count in zip(les, list(child.counts)):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, values, const, f'le="{le}"'), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, values, const), child.sum
+            yield f"{self.name}_count", _format_labels(self.labelnames, values, const), cumulative
+
+
+class MetricsRegistry:
+
+    def __init__(self, enabled: bool = True, const_labels: dict = None):
+        self.enabled = enabled
+        self.metrics = []
+        # added to every sample, e.g. the serve worker, so per-process series never collide
+        self.const_labels = ",".join(f'{name}="{_escape(value)}"' for name, value in (const_labels or {}).items())
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._add(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._add(Gauge(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(self, name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+class ApiMetrics:
+    """The prediction API's request counters, latency and per-phase histograms, in-flight
+    gauges and active model version.
+
+    Children for the fixed label sets (endpoints, phases) are resolved up front, so
+    recording on the request path allocates nothing but the (endpoint, status,
+    version) key of the request counter.
+    """
+
+    def __init__(self, endpoints=("/predict", "/predict/batch"), buckets=DEFAULT_BUCKETS, enabled: bool = True,
+                 const_labels: dict = None):
+        self.registry = MetricsRegistry(enabled, const_labels)
+        self.endpoints = frozenset(endpoints)
+        registry = self.registry
+
+        self.requests = registry.counter("hotel_api_requests_total", "Requests by endpoint, status and model version.",
+                                         ("endpoint", "status", "model_version"))
+        self.errors = registry.counter("hotel_api_errors_total", "Error responses by endpoint and kind.",
+                                       ("endpoint", "kind"))
+        self.exceptions = registry.counter("hotel_api_exceptions_total", "Exceptions behind 500 responses.",
+                                           ("endpoint", "exception"))
+        self.rows = registry.counter("hotel_api_rows_total", "Bookings scored, including cache hits.", ("endpoint",))
+        self.latency = registry.histogram("hotel_api_request_seconds", "Request latency by endpoint.",
+                                          ("endpoint",), buckets)
+        self.phase = registry.histogram("hotel_api_phase_seconds", "Time spent per request phase.",
+                                        ("phase",), buckets)
+        self.in_flight = registry.gauge("hotel_api_in_flight_requests", "Requests being served.", ("endpoint",))
+        self.model = registry.gauge("hotel_api_model_info", "1 for the active model version.", ("version",))
+        self.feature_psi = registry.gauge("hotel_api_feature_psi",
+                                          "PSI against the training data in the last drift report window.",
+                                          ("feature",))
+
+        labels = list(self.endpoints) + ["other"]
+        self.latency_by_endpoint = {endpoint: self.latency.labels(endpoint) for endpoint in labels}
+        self.in_flight_by_endpoint = {endpoint: self.in_flight.labels(endpoint) for endpoint in labels}
+        self.rows_by_endpoint = {endpoint: self.rows.labels(endpoint) for endpoint in labels}
+        self.phases = {phase: self.phase.labels(phase) for phase in PHASES}
+        self.error_kinds = {(endpoint, kind): self.errors.labels(endpoint, kind)
+                            for endpoint in labels for kind in ("validation", "client", "server")}
+
+    @property
+    def enabled(self) -> bool:
+        return self.registry.enabled
+
+    def observe_phase(self, phase: str, seconds: float):
+        if self.registry.enabled:
+            self.phases[phase].observe(seconds)
+
+    def observe_model(self, start: float, features_done: float, preprocessed: float, done: float):
+        if self.registry.enabled:
+            self.phases["features"].observe(features_done - start)
+            self.phases["preprocess"].observe(preprocessed - features_done)
+            self.phases["predict"].observe(done - preprocessed)
+
+    def observe_request(self, endpoint: str, status: int, version: str, seconds: float):
+        self.latency_by_endpoint[endpoint].observe(seconds)
+        self.requests.labels(endpoint, status, version).inc()
+        if status >= 400:
+            kind = "validation" if status == 422 else "client" if status < 500 else "server"
+            self.error_kinds[endpoint, kind].inc()
+
+    def set_model(self, version: str):
+        self.model.clear()
+        self.model.labels(version).set(1)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware timing every HTTP request and counting it by status and the
+    X-Model-Version the handler answered with. `scope["metrics_start"]` lets a handler
+    measure how long parsing took before it was called."""
+
+    def __init__(self, app, metrics: ApiMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.metrics.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope["path"] if scope["path"] in self.metrics.endpoints else "other"
+        in_flight = self.metrics.in_flight_by_endpoint[endpoint]
+        status, version = 500, "none"
+
+        async def send_wrapper(message):
+            nonlocal status, version
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for key, value in message.get("headers", ()):
+                    if key == b"x-model-version":
+                        version = value.decode("latin-1")
+            await send(message)
+
+        scope["metrics_start"] = start = time.perf_counter()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            self.metrics.observe_request(endpoint, status, version, time.perf_counter() - start)
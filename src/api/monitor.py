@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from src.drift import FeatureSummary, drift_scores
+from src.features import add_features_record
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class DriftMonitor:
+    """Compares the bookings the API scores with the active model's training data.
+
+    The request path only appends the validated payload to a bounded deque, O(1)
+    and lock-free. A background thread drains it every `update_interval_seconds`,
+    derives the features and adds them to two fixed-size summaries: `total` since
+    the model was activated and `window` since the last report. Every
+    `report_interval_seconds` the window's PSI/KS scores are written to
+    `report_dir` and the window starts over. When the deque is full the oldest
+    payloads are dropped, so a slow drain costs coverage, never request latency.
+    """
+
+    def __init__(self, queue_size: int = 100000, update_interval_seconds: float = 1.0,
+                 report_interval_seconds: float = 3600, report_dir: str = "reports/drift",
+                 psi_alert: float = 0.2, min_rows: int = 500, on_report=None):
+        self.update_interval = update_interval_seconds
+        self.report_interval = report_interval_seconds
+        self.report_dir = report_dir
+        self.psi_alert = psi_alert
+        self.min_rows = min_rows
+        self.on_report = on_report
+
+        self._pending = deque(maxlen=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+        self.reference = None
+        self.version = None
+        self.total = None
+        self.window = None
+        self.window_started = time.time()
+        self.observed = 0
+        self.summarised = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.reference is not None
+
+    def set_reference(self, reference: dict, version: str = None):
+        # a new model means new bins, summaries start over; queued payloads still count
+        with self._lock:
+            self.reference = reference
+            self.version = version
+            self.total = FeatureSummary(reference) if reference is not None else None
+            self.window = FeatureSummary(reference) if reference is not None else None
+            self.window_started = time.time()
+
+    def observe(self, payload: dict):
+        if self.reference is not None:
+            self._pending.append(payload)
+            self.observed += 1
+
+    def observe_many(self, payloads: list):
+        if self.reference is not None:
+            self._pending.extend(payloads)
+            self.observed += len(payloads)
+
+    def drain(self, max_records: int = 10000) -> int:
+        drained = 0
+        while self._pending:
+            batch = []
+            pop = self._pending.popleft
+            try:
+                while len(batch) < max_records:
+                    batch.append(pop())
+            except IndexError:
+                pass
+            # the same derived features the model sees
+            records = [add_features_record(dict(payload)) for payload in batch]
+            with self._lock:
+                if self.total is not None:
+                    self.total.update(records)
+                    self.window.update(records)
+            self.summarised += len(records)
+            drained += len(records)
+        return drained
+
+    def stats(self) -> dict:
+        return {"observed": self.observed,
+                "summarised": self.summarised,
+                "pending": len(self._pending),
+                "dropped": max(self.observed - self.summarised - len(self._pending), 0)}
+
+    def _scores(self) -> dict:
+        # caller holds the lock
+        if self.reference is None:
+            return None
+        return {
+            "model_version": self.version,
+            "window_started": self.window_started,
+            "window": drift_scores(self.reference, self.window, self.psi_alert, self.min_rows),
+            "total": drift_scores(self.reference, self.total, self.psi_alert, self.min_rows),
+            **self.stats()
+        }
+
+    def scores(self) -> dict:
+        with self._lock:
+            return self._scores()
+
+    def report(self) -> dict:
+        self.drain()
+        with self._lock:
+            # one acquisition, a concurrent drain lands either in this report or in the next window
+            report = self._scores()
+            if report is None:
+                return None
+            self.window = FeatureSummary(self.reference)
+            self.window_started = time.time()
+
+        os.makedirs(self.report_dir, exist_ok=True)
+        generated = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        # serve workers share report_dir and report within the same second
+        report = {"generated_at": generated, "worker": os.environ.get("SERVING_WORKER"), "pid": os.getpid(), **report}
+        with open(os.path.join(self.report_dir, f"drift-{generated}-{report['pid']}.json"), "w") as file:
+            json.dump(report, file, indent=2)
+
+        if report["window"]["drifted"]:
+            logger.warning(f"feature drift against the training data: {report['window']['drifted']}")
+        if self.on_report is not None:
+            self.on_report(report)
+        return report
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        last_report = time.monotonic()
+        while not self._stop.wait(self.update_interval):
+            try:
+                self.drain()
+                if time.monotonic() - last_report >= self.report_interval:
+                    last_report = time.monotonic()
+                    self.report()
+            except Exception as e:
+                # a bad payload or a full disk must not stop monitoring
+                logger.error(f"drift monitor update failed: {type(e).__name__}: {e}")
@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from src.api.inference import CompiledPipeline
+from src.utils import file_digest, current_rss
+
+
+# decision threshold for models whose bundle carries none (pickles, bundles from before selection)
+DEFAULT_THRESHOLD = 0.55
+
+
+class ModelVersion:
+
+    def __init__(self, version: str, path: str, pipeline, fast_model, load_seconds: float, rss_delta: int,
+                 threshold: float = DEFAULT_THRESHOLD, decision: dict = None):
+        self.version = version
+        self.path = path
+        self.pipeline = pipeline
+        self.fast_model = fast_model
+        self.load_seconds = load_seconds
+        self.rss_delta = rss_delta
+        self.threshold = threshold
+        self.decision = decision
+        self.file_size = path_size(path)
+        self.loaded_at = time.time()
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "path": self.path,
+            "format": "pickle" if self.pipeline is not None else "bundle",
+            "fast_path": self.fast_model is not None,
+            "engine": self.fast_model.engine if self.fast_model is not None else "pipeline",
+            "threshold": self.threshold,
+            "threshold_objective": self.decision["objective"] if self.decision else None,
+            "load_seconds": round(self.load_seconds, 4),
+            "file_size_bytes": self.file_size,
+            "rss_delta_bytes": self.rss_delta,
+            "loaded_at": self.loaded_at
+        }
+
+
+def path_size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def path_mtime(path: str) -> float:
+    if os.path.isdir(path):
+        return max([os.path.getmtime(path)] + [os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)])
+    return os.path.getmtime(path)
+
+
+def load_version(path: str, fast_path: bool = True, version: str = None, threads: int = None,
+                 default_threshold: float = DEFAULT_THRESHOLD, engine: str = "xgboost",
+                 trees_max_rows: int = 16) -> ModelVersion:
+    rss_before = current_rss()
+    start = time.perf_counter()
+
+    version = version or file_digest(path)
+    pipeline = None
+    fast_model = None
+    if os.path.isdir(path):
+        # serving bundle: booster + preprocessing arrays, no sklearn/imblearn unpickling
+        fast_model = CompiledPipeline.load(path)
+    else:
+        # the pickle needs sklearn and imblearn, import them only for this fallback
+        import joblib
+
+        pipeline = joblib.load(path)
+
+    if pipeline is not None and fast_path:
+        try:
+            fast_model = CompiledPipeline.from_pipeline(pipeline)
+        except Exception:
+            # unsupported pipeline layout, keep serving through the full pipeline
+            fast_model = None
+
+    if fast_model is not None:
+        try:
+            fast_model.use_engine(engine, trees_max_rows)
+        except ValueError:
+            # objective or split type the tree engine cannot score
+            fast_model.use_engine("xgboost")
+
+    if threads is not None:
+        # one worker of several: stay within its share of the CPU budget
+        if pipeline is not None:
+            pipeline.steps[-1][1].set_params(n_jobs=threads)
+        if fast_model is not None:
+            fast_model.booster.set_param({"nthread": threads})
+
+    # the threshold chosen at train time travels with the bundle
+    decision = fast_model.decision if fast_model is not None else None
+    threshold = decision["threshold"] if decision is not None else default_threshold
+
+    load_seconds = time.perf_counter() - start
+    return ModelVersion(version, path, pipeline, fast_model, load_seconds, max(current_rss() - rss_before, 0),
+                        threshold, decision)
+
+
+class ModelRegistry:
+    """Keeps up to `max_versions` models resident and swaps the active one atomically.
+
+    Callers grab a ModelVersion once per request, so a request that started on
+    the old model finishes on it even if a new version is activated meanwhile.
+    """
+
+    def __init__(self, max_versions: int = 3, fast_path: bool = True, on_activate=None, threads: int = None,
+                 default_threshold: float = DEFAULT_THRESHOLD, engine: str = "xgboost", trees_max_rows: int = 16):
+        if max_versions < 1:
+            # the active version always stays resident, eviction could never get below zero
+            raise ValueError(f"max_versions must be at least 1, got {max_versions}")
+        self.max_versions = max_versions
+        self.fast_path = fast_path
+        self.threads = threads
+        self.default_threshold = default_threshold
+        self.engine = engine
+        self.trees_max_rows = trees_max_rows
+        self.on_activate = on_activate
+        self._versions = OrderedDict()
+        self._active = None
+        self._lock = threading.Lock()
+        self._watch_thread = None
+        self._stop_watch = threading.Event()
+
+    @property
+    def active(self) -> ModelVersion:
+        return self._active
+
+    def load(self, path: str, activate: bool = True) -> ModelVersion:
+        version = file_digest(path)
+        with self._lock:
+            loaded = self._versions.get(version)
+
+        # the expensive unpickle happens outside the lock, requests keep flowing
+        if loaded is None:
+            loaded = load_version(path, self.fast_path, version, self.threads, self.default_threshold,
+                                  self.engine, self.trees_max_rows)
+
+        with self._lock:
+            self._versions[loaded.version] = loaded
+            self._versions.move_to_end(loaded.version)
+            if activate or self._active is None:
+                self._active = loaded
+            self._evict()
+
+        if activate and self.on_activate is not None:
+            self.on_activate(loaded)
+        return loaded
+
+    def activate(self, version: str) -> ModelVersion:
+        with self._lock:
+            if version not in self._versions:
+                raise KeyError(f"model version {version!r} is not loaded")
+            self._active = self._versions[version]
+            self._versions.move_to_end(version)
+
+        if self.on_activate is not None:
+            self.on_activate(self._active)
+        return self._active
+
+    def get(self, version: str = None) -> ModelVersion:
+        if version is None:
+            return self._active
+        loaded = self._versions.get(version)
+        if loaded is None:
+            raise KeyError(f"model version {version!r} is not loaded")
+        return loaded
+
+    def _evict(self):
+        while len(self._versions) > self.max_versions:
+            for version in self._versions:
+                if self._versions[version] is not self._active:
+                    del self._versions[version]
+                    break
+
+    def watch(self, path: str, interval_seconds: float = 5.0):
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._stop_watch.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, args=(path, interval_seconds),
+                                              name="model-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watch(self):
+        self._stop_watch.set()
+
+    def _watch_loop(self, path: str, interval_seconds: float):
+        last_mtime = path_mtime(path) if os.path.exists(path) else None
+        while not self._stop_watch.wait(interval_seconds):
+            try:
+                mtime = path_mtime(path)
+                if mtime != last_mtime:
+                    self.load(path)
+                    last_mtime = mtime
+            except Exception:
+                # half-written artifact or transient IO error, retry on the next tick
+                continue
+
+    def stats(self) -> dict:
+        with self._lock:
+            versions = list(self._versions.values())
+            active = self._active
+        return {
+            "active": active.version if active is not None else None,
+            "max_versions": self.max_versions,
+            "versions": [v.info() for v in versions]
+        }
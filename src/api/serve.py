@@ -0,0 +1,218 @@
+import argparse
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from src.logger import get_logger
+from src.utils import load_config
+
+
+logger = get_logger(__name__)
+
+
+def parse_cpus(spec=None) -> list:
+    """CPU ids from "0-3,6", a list, or None for every CPU this process may run on."""
+    if spec is None:
+        return sorted(os.sched_getaffinity(0))
+    if isinstance(spec, (list, tuple)):
+        return sorted(int(cpu) for cpu in spec)
+    cpus = set()
+    for part in str(spec).split(","):
+        low, _, high = part.strip().partition("-")
+        cpus.update(range(int(low), int(high or low) + 1))
+    return sorted(cpus)
+
+
+def plan_workers(cpus: list, workers: int = None, threads: int = None) -> list:
+    """Splits the CPU budget into one CPU set and XGBoost thread count per worker.
+
+    By default every worker gets len(cpus) // workers CPUs and as many threads, so
+    workers x threads never exceeds the budget; asking for more workers than CPUs
+    wraps around and runs them single-threaded.
+    """
+    workers = len(cpus) if workers in (None, -1) else workers
+    threads = threads or max(1, len(cpus) // workers)
+    if workers * threads > len(cpus):
+        logger.warning(f"{workers} workers x {threads} threads oversubscribe the {len(cpus)} CPU budget")
+
+    plans = []
+    for index in range(workers):
+        start = index * threads
+        plans.append({"index": index, "threads": threads,
+                      "cpus": sorted({cpus[(start + i) % len(cpus)] for i in range(threads)})})
+    return plans
+
+
+class Supervisor:
+    """Pre-fork style server: binds the port once and runs one uvicorn worker process per
+    plan on the shared listening socket, each pinned to its CPUs.
+
+    Workers load the memory-mapped serving bundle, so the preprocessing arrays are shared
+    page cache and only the native booster is per process. SIGHUP restarts the workers
+    one at a time, each replacement has to report ready before the old one is stopped
+    and drains its in-flight requests; SIGTERM/SIGINT stop all of them. Workers share
+    nothing else: each has its own registry, metrics and drift summaries, which is why
+    the app turns the admin routes off and labels its metrics with SERVING_WORKER.
+    """
+
+    def __init__(self, plans: list, host: str = "0.0.0.0", port: int = 8000, app: str = "src.api.app:app",
+                 restart_timeout: float = 120, log_level: str = "warning"):
+        self.plans = plans
+        self.host = host
+        self.port = port
+        self.app = app
+        self.restart_timeout = restart_timeout
+        self.log_level = log_level
+        self.workers = {}
+        self.sock = None
+        self.run_dir = None
+        self._restart_requested = False
+        self._stopping = False
+
+    def bind(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        self.sock.listen(2048)
+        self.sock.set_inheritable(True)
+        self.port = self.sock.getsockname()[1]
+        self.run_dir = tempfile.mkdtemp(prefix="hotel-serve-")
+
+    def spawn(self, plan: dict) -> subprocess.Popen:
+        ready_file = os.path.join(self.run_dir, f"worker-{plan['index']}-{time.monotonic_ns()}.ready")
+        env = {**os.environ,
+               "SERVING_WORKER": str(plan["index"]),
+               "SERVING_WORKERS": str(len(self.plans)),
+               "SERVING_THREADS": str(plan["threads"]),
+               "OMP_NUM_THREADS": str(plan["threads"]),
+               "SERVING_READY_FILE": ready_file}
+        fd = self.sock.fileno()
+        process = subprocess.Popen([sys.executable, "-m", "src.api.serve", "--worker-fd", str(fd), "--app", self.app,
+                                    "--log-level", self.log_level], pass_fds=(fd,), env=env)
+        # set before the interpreter is up, the xgboost threads started later inherit it
+        os.sched_setaffinity(process.pid, plan["cpus"])
+        process.ready_file = ready_file
+        logger.info(f"worker {plan['index']} pid {process.pid} on cpus {plan['cpus']} with {plan['threads']} threads")
+        return process
+
+    def wait_ready(self, process: subprocess.Popen):
+        deadline = time.monotonic() + self.restart_timeout
+        while not os.path.exists(process.ready_file):
+            if process.poll() is not None:
+                raise RuntimeError(f"worker pid {process.pid} exited with {process.returncode} during startup")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"worker pid {process.pid} not ready after {self.restart_timeout}s")
+            time.sleep(0.1)
+
+    def stop_worker(self, process: subprocess.Popen):
+        # uvicorn stops accepting on SIGTERM and finishes the requests it has
+        process.terminate()
+        try:
+            process.wait(timeout=self.restart_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def start(self):
+        if self.sock is None:
+            self.bind()
+        for plan in self.plans:
+            self.workers[plan["index"]] = self.spawn(plan)
+        for process in self.workers.values():
+            self.wait_ready(process)
+        logger.info(f"serving on {self.host}:{self.port} with {len(self.workers)} workers")
+
+    def rolling_restart(self):
+        for plan in self.plans:
+            old = self.workers[plan["index"]]
+            new = self.spawn(plan)
+            try:
+                self.wait_ready(new)
+            except RuntimeError as e:
+                # keep the old worker serving, a broken model or release must not take the API down
+                logger.error(f"restart of worker {plan['index']} failed, keeping pid {old.pid}: {e}")
+                self.stop_worker(new)
+                return
+            self.workers[plan["index"]] = new
+            self.stop_worker(old)
+        logger.info("rolling restart done")
+
+    def restart_dead_workers(self):
+        for plan in self.plans:
+            process = self.workers[plan["index"]]
+            if process.poll() is not None:
+                logger.error(f"worker {plan['index']} pid {process.pid} exited with {process.returncode}, respawning")
+                self.workers[plan["index"]] = self.spawn(plan)
+
+    def request_restart(self, *_):
+        self._restart_requested = True
+
+    def request_stop(self, *_):
+        self._stopping = True
+
+    def stop(self):
+        for process in self.workers.values():
+            process.terminate()
+        for process in self.workers.values():
+            self.stop_worker(process)
+        if self.sock is not None:
+            self.sock.close()
+        if self.run_dir is not None:
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def run(self):
+        signal.signal(signal.SIGHUP, self.request_restart)
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        try:
+            self.start()
+            while not self._stopping:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self.rolling_restart()
+                self.restart_dead_workers()
+                time.sleep(0.5)
+        finally:
+            self.stop()
+
+
+def run_worker(fd: int, app: str, log_level: str = "warning"):
+    import uvicorn
+
+    # family detected from the fd; uvicorn --fd would treat it as AF_UNIX and leave Nagle on for TCP
+    sock = socket.socket(fileno=fd)
+    uvicorn.Server(uvicorn.Config(app, log_level=log_level)).run(sockets=[sock])
+
+
+def supervisor_from_config(host: str = None, port: int = None, workers: int = None, cpus=None,
+                           threads: int = None, config: dict = None) -> Supervisor:
+    settings = (config or load_config()).get("api", {}).get("serving", {})
+    plans = plan_workers(parse_cpus(cpus if cpus is not None else settings.get("cpus")),
+                         workers or settings.get("workers", -1),
+                         threads or settings.get("threads"))
+    return Supervisor(plans,
+                      host=host or settings.get("host", "0.0.0.0"),
+                      port=port if port is not None else settings.get("port", 8000),
+                      restart_timeout=settings.get("restart_timeout_seconds", 120))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="multi-process API server, SIGHUP for a rolling restart")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="-1 = one per CPU in the budget")
+    parser.add_argument("--cpus", default=None, help='CPU budget, e.g. "0-3"; default: the CPUs we may run on')
+    parser.add_argument("--threads", type=int, default=None, help="xgboost threads per worker")
+    parser.add_argument("--worker-fd", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--app", default="src.api.app:app", help=argparse.SUPPRESS)
+    parser.add_argument("--log-level", default="warning", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_fd is not None:
+        run_worker(args.worker_fd, args.app, args.log_level)
+    else:
+        supervisor_from_config(args.host, args.port, args.workers, args.cpus, args.threads).run()
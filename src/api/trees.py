@@ -0,0 +1,154 @@
+import json
+import os
+import numpy as np
+
+TREE_ARRAYS = ("feature", "threshold", "children", "default_left", "value", "roots")
+TREES_META = "trees.json"
+# rows traversed together, larger batches are walked block by block
+BLOCK_ROWS = 256
+
+
+class TreeEnsemble:
+    """The booster's trees flattened into contiguous arrays and scored level by level.
+
+    Every node of every tree sits in one set of arrays: split feature, threshold,
+    (left, right) child ids, the side missing values take and the leaf value. Leaves
+    point back at themselves, so `depth` rounds of "look up the row's feature, step to
+    a child" move all rows through all trees at once and leave each on its leaf. The
+    same code scores one row or a large batch.
+
+    Margins are summed in float32 in tree order from the base margin, the way XGBoost's
+    CPU predictor does, so they match bit for bit; the sigmoid on top can differ from
+    XGBoost's vectorised expf by one float32 ulp.
+    """
+
+    def __init__(self, feature, threshold, children, default_left, value, roots, base_margin: float, depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base_margin = np.float32(base_margin)
+        self.depth = int(depth)
+
+    @classmethod
+    def from_booster(cls, booster, iteration_range=(0, 0)):
+        model = json.loads(booster.save_raw("json"))["learner"]
+        objective = model["objective"]["name"]
+        if objective not in ("binary:logistic", "reg:logistic"):
+            raise ValueError(f"tree engine supports logistic objectives only, not {objective!r}")
+        if model["gradient_booster"]["name"] != "gbtree":
+            raise ValueError(f"tree engine supports gbtree only, not {model['gradient_booster']['name']!r}")
+
+        trees = model["gradient_booster"]["model"]["trees"]
+        indptr = model["gradient_booster"]["model"]["iteration_indptr"]
+        begin, end = iteration_range
+        end = end or len(indptr) - 1
+        trees = trees[indptr[begin]:indptr[end]]
+
+        feature, threshold, children, default_left, value, roots = [], [], [], [], [], []
+        depth = 0
+        offset = 0
+        for tree in trees:
+            if any(tree["split_type"]):
+                raise ValueError("tree engine does not support categorical splits")
+            left = np.asarray(tree["left_children"], dtype=np.int32)
+            right = np.asarray(tree["right_children"], dtype=np.int32)
+            node_ids = np.arange(len(left), dtype=np.int32)
+            leaf = left == -1
+
+            # leaves hold their value in split_conditions and loop back onto themselves
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            feature.append(np.where(leaf, 0, tree["split_indices"]).astype(np.int32))
+            threshold.append(np.where(leaf, np.float32(0), conditions))
+            children.append(np.stack([np.where(leaf, node_ids, left), np.where(leaf, node_ids, right)], axis=1) + offset)
+            default_left.append(np.asarray(tree["default_left"], dtype=bool))
+            value.append(np.where(leaf, conditions, np.float32(0)))
+            roots.append(offset)
+            depth = max(depth, tree_depth(left, right))
+            offset += len(left)
+
+        # base_score is stored as a probability, the predictor starts from -log(1/p - 1)
+        # taken in float32; log from float64 rounds like the C logf
+        base_score = model["learner_model_param"]["base_score"]
+        base_score = np.float32(json.loads(base_score)[0] if base_score.startswith("[") else base_score)
+        base_margin = -np.log(np.float64(np.float32(1) / base_score - np.float32(1)))
+
+        return cls(np.concatenate(feature),
+                   np.concatenate(threshold),
+                   np.concatenate(children).astype(np.int32),
+                   np.concatenate(default_left),
+                   np.concatenate(value),
+                   np.asarray(roots, dtype=np.int32),
+                   base_margin,
+                   depth)
+
+    def save(self, bundle_dir: str):
+        for name in TREE_ARRAYS:
+            np.save(os.path.join(bundle_dir, f"trees_{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        with open(os.path.join(bundle_dir, TREES_META), "w") as file:
+            json.dump({"base_margin": float(self.base_margin), "depth": self.depth}, file)
+
+    @classmethod
+    def load(cls, bundle_dir: str, mmap: bool = True):
+        with open(os.path.join(bundle_dir, TREES_META), "r") as file:
+            meta = json.load(file)
+        arrays = [np.load(os.path.join(bundle_dir, f"trees_{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in TREE_ARRAYS]
+        return cls(*arrays, meta["base_margin"], meta["depth"])
+
+    @staticmethod
+    def exists(bundle_dir: str) -> bool:
+        return os.path.exists(os.path.join(bundle_dir, TREES_META))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def leaves(self, matrix: np.ndarray) -> np.ndarray:
+        """(rows, trees) node ids of the leaf each row lands on in each tree."""
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if len(matrix) > BLOCK_ROWS:
+            # the (rows, trees) working arrays stay cache sized
+            return np.concatenate([self.leaves(matrix[start:start + BLOCK_ROWS])
+                                   for start in range(0, len(matrix), BLOCK_ROWS)])
+
+        n_rows, n_features = matrix.shape
+        flat = matrix.ravel()
+        row_start = (np.arange(n_rows, dtype=np.int32) * n_features)[:, None]
+        children = self.children.reshape(-1)
+        missing = np.isnan(flat).any()
+
+        nodes = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+        for _ in range(self.depth):
+            x = flat[row_start + self.feature[nodes]]
+            # xgboost sends x < threshold left
+            go_right = x >= self.threshold[nodes]
+            if missing:
+                go_right = np.where(np.isnan(x), ~self.default_left[nodes], go_right)
+            nodes = children[2 * nodes + go_right]
+        return nodes
+
+    def predict_margin(self, matrix: np.ndarray) -> np.ndarray:
+        leaf_values = self.value[self.leaves(matrix)]
+        # running sum from the base margin in tree order, float32 like the predictor's accumulator
+        summed = np.empty((len(leaf_values), self.n_trees + 1), dtype=np.float32)
+        summed[:, 0] = self.base_margin
+        summed[:, 1:] = leaf_values
+        return np.cumsum(summed, axis=1, dtype=np.float32)[:, -1]
+
+    def predict(self, matrix: np.ndarray) -> np.ndarray:
+        margin = self.predict_margin(matrix)
+        # exp rounded from float64 tracks the C expf better than numpy's float32 loop
+        exp = np.exp(-margin.astype(np.float64)).astype(np.float32)
+        return np.float32(1) / (np.float32(1) + exp)
+
+
+def tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = np.zeros(len(left), dtype=np.int32)
+    # parents come before their children in xgboost's node order
+    for node in range(len(left)):
+        if left[node] != -1:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max())
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import resource
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.utils import load_config, file_digest
+from src.storage import iter_frames
+from src.features import add_features
+from src.threshold import load_threshold
+from src.api.inference import CompiledPipeline, preprocess_frame
+
+
+logger = get_logger(__name__)
+
+JSON_LINES = (".jsonl", ".ndjson")
+RUN_FILE = "_run.json"
+
+# model and its known categories, loaded once per worker process by the initializer
+_MODEL = None
+_KNOWN = None
+_COMPILED = None
+
+
+def iter_input(path: str, chunksize: int):
+    # NDJSON lines are /predict payloads, the same format /predict/batch accepts
+    if path.endswith(JSON_LINES):
+        yield from pd.read_json(path, lines=True, chunksize=chunksize)
+    else:
+        yield from iter_frames(path, chunksize)
+
+
+def known_categories(pipeline) -> dict:
+    from sklearn.preprocessing import OneHotEncoder
+
+    known = {}
+    for _, transformer, cols in pipeline.steps[0][1].transformers_:
+        step = transformer.steps[-1][1] if hasattr(transformer, "steps") else transformer
+        if isinstance(step, OneHotEncoder) and step.handle_unknown == "error":
+            known.update({col: categories for col, categories in zip(cols, step.categories_)})
+    return known
+
+
+def _init_worker(model_path: str, threads: int = None, engine: str = "xgboost"):
+    global _MODEL, _KNOWN, _COMPILED
+    _MODEL = joblib.load(model_path)
+    if threads is not None:
+        _MODEL.steps[-1][1].set_params(n_jobs=threads)
+    _KNOWN = known_categories(_MODEL)
+    # the classifier's trees as flat arrays, the pipeline still does the preprocessing
+    _COMPILED = CompiledPipeline.from_pipeline(_MODEL).use_engine(engine) if engine != "xgboost" else None
+
+
+def score_chunk(job: tuple) -> tuple:
+    index, df, threshold = job
+    df = add_features(df.reset_index(drop=True))
+
+    # unseen categories would fail the encoder for the whole chunk, flag those rows instead
+    error = pd.Series(None, index=df.index, dtype=object)
+    for col, categories in _KNOWN.items():
+        error[~df[col].isin(categories) & error.isna()] = f"unknown category in {col}"
+    ok = error.isna().to_numpy()
+
+    probability = np.full(len(df), np.nan)
+    if ok.any() and _COMPILED is not None:
+        probability[ok] = _COMPILED.predict_matrix(preprocess_frame(_MODEL, df.loc[ok]))
+    elif ok.any():
+        probability[ok] = _MODEL.predict_proba(df.loc[ok])[:, 1]
+
+    out = pd.DataFrame({"probability": probability.round(6)})
+    if "Booking_ID" in df.columns:
+        out.insert(0, "Booking_ID", df["Booking_ID"].astype(str).to_numpy())
+    prediction = np.where(ok, (probability >= threshold).astype(int), -1)
+    out["prediction_code"] = prediction
+    out["prediction_label"] = np.select([prediction == 1, prediction == 0], ["Not Canceled", "Canceled"], "")
+    out["error"] = error.to_numpy()
+    return index, out
+
+
+def part_path(output_dir: str, index: int, fmt: str) -> str:
+    return os.path.join(output_dir, f"part-{index:05d}.{fmt}")
+
+
+def write_part(df: pd.DataFrame, path: str):
+    # write then rename, so a part that exists is always complete and a resume can skip it
+    tmp_path = path + ".tmp"
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp_path, index=False, engine="pyarrow")
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def check_run(output_dir: str, run: dict, resume: bool):
+    run_path = os.path.join(output_dir, RUN_FILE)
+    if os.path.exists(run_path) and resume:
+        with open(run_path, "r") as file:
+            previous = json.load(file)
+        if previous != run:
+            raise ValueError(f"cannot resume, the run settings changed: {previous} -> {run}")
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name in os.listdir(output_dir):
+        if name.startswith("part-"):
+            os.remove(os.path.join(output_dir, name))
+    with open(run_path, "w") as file:
+        json.dump(run, file, indent=2)
+
+
+def peak_rss_mb() -> dict:
+    # ru_maxrss is in KiB on Linux; children covers the worker processes that have exited
+    return {
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_worker_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    }
+
+
+def resolve_threshold(model_path: str, settings: dict, default: float, threshold: float = None) -> float:
+    if threshold is None:
+        threshold = settings.get("threshold")
+    if threshold is not None:
+        return threshold
+
+    # the bundle's threshold was chosen for the configured model only, not for any other pickle
+    configured = settings.get("model", "models/xgb_model.pkl")
+    if os.path.abspath(model_path) != os.path.abspath(configured):
+        raise ValueError(f"{model_path} is not the configured model {configured}, pass its threshold explicitly")
+    # the one the API serves: chosen at train time and stored in the bundle
+    return load_threshold(settings.get("bundle", "models/serving_bundle"), default)
+
+
+def batch_score(input_path: str, output_dir: str, model_path: str = None,
+                chunksize: int = None, workers: int = None, fmt: str = None,
+                resume: bool = False, config: dict = None, engine: str = None,
+                threshold: float = None) -> dict:
+    """Scores `input_path` chunk by chunk into ordered part files in `output_dir`.
+
+    Chunks are scored in a process pool with a bounded number in flight; parts are
+    written in input order. With `resume`, parts already on disk are skipped.
+    Without `threshold` the serving bundle's one is used, which needs `model_path`
+    to be the configured model.
+    """
+    try:
+        config = config or load_config()
+        settings = config.get("batch_score", {})
+        model_path = model_path or settings.get("model", "models/xgb_model.pkl")
+        chunksize = chunksize or settings.get("chunksize", 50000)
+        workers = workers or settings.get("workers", -1)
+        workers = os.cpu_count() if workers in (-1, None) else workers
+        fmt = fmt or settings.get("format", "parquet")
+        engine = engine or settings.get("engine", "xgboost")
+        threshold = resolve_threshold(model_path, settings, config.get("threshold", {}).get("default", 0.55),
+                                      threshold)
+
+        run = {"input": os.path.abspath(input_path), "model_digest": file_digest(model_path),
+               "chunksize": chunksize, "format": fmt, "threshold": threshold, "engine": engine}
+        check_run(output_dir, run, resume)
+
+        start = time.perf_counter()
+        stats = {"chunks": 0, "chunks_skipped": 0, "rows": 0, "errors": 0}
+
+        def jobs():
+            for index, chunk in enumerate(iter_input(input_path, chunksize)):
+                if resume and os.path.exists(part_path(output_dir, index, fmt)):
+                    stats["chunks_skipped"] += 1
+                    continue
+                yield index, chunk, threshold
+
+        def collect(index, out):
+            write_part(out, part_path(output_dir, index, fmt))
+            stats["chunks"] += 1
+            stats["rows"] += len(out)
+            stats["errors"] += int(out["error"].notna().sum())
+
+        if workers <= 1:
+            _init_worker(model_path, None, engine)
+            for job in jobs():
+                collect(*score_chunk(job))
+        else:
+            # workers x 1 xgboost thread; at most 2 chunks per worker in flight bounds memory
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(model_path, 1, engine)) as pool:
+                pending = deque()
+                for job in jobs():
+                    pending.append(pool.submit(score_chunk, job))
+                    if len(pending) >= 2 * workers:
+                        collect(*pending.popleft().result())
+                while pending:
+                    collect(*pending.popleft().result())
+
+        seconds = time.perf_counter() - start
+        stats.update({
+            "workers": workers,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(stats["rows"] / seconds, 1) if seconds else None,
+            **peak_rss_mb()
+        })
+        with open(os.path.join(output_dir, "_stats.json"), "w") as file:
+            json.dump(stats, file, indent=2)
+
+        logger.info(f"batch scoring done: {stats}")
+        return stats
+
+    except Exception as e:
+        logger.error(f"batch scoring failed! Error: {str(e)}")
+        raise CustomException(f"batch scoring failed!", e)
+
+
+def read_scores(output_dir: str) -> pd.DataFrame:
+    parts = sorted(name for name in os.listdir(output_dir) if name.startswith("part-") and not name.endswith(".tmp"))
+    frames = [pd.read_parquet(os.path.join(output_dir, name)) if name.endswith(".parquet")
+              else pd.read_csv(os.path.join(output_dir, name)) for name in parts]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", required=True, help="CSV, Parquet or NDJSON (.jsonl/.ndjson) bookings")
+    parser.add_argument("--output", required=True, help="directory for the ordered part files")
+    parser.add_argument("--model", default=None, help="defaults to batch_score.model")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="required when --model is not the model of the serving bundle")
+    parser.add_argument("--chunksize", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=["parquet", "csv"], default=None)
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--engine", choices=["xgboost", "trees"], default=None)
+    args = parser.parse_args()
+
+    print(json.dumps(batch_score(args.input, args.output, args.model, args.chunksize,
+                                 args.workers, args.format, args.resume, engine=args.engine,
+                                 threshold=args.threshold), indent=2))
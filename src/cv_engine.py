@@ -0,0 +1,94 @@
+import time
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.fold_cache import dataset_digest
+from src.utils import take_rows
+
+
+logger = get_logger(__name__)
+
+cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+
+
+def _fit_fold(pipe_line, x, y, train_idx, test_idx, metrics, fold_cache=None, data_key=None):
+    y_train, y_test = take_rows(y, train_idx), take_rows(y, test_idx)
+    cache_hit, seconds_saved = False, 0.0
+
+    start = time.perf_counter()
+    if fold_cache is None:
+        estimator = clone(pipe_line)
+        x_train, x_test = take_rows(x, train_idx), take_rows(x, test_idx)
+        estimator.fit(x_train, y_train)
+    else:
+        # preprocessing/resampling comes from the fold cache, only the final estimator is fit
+        matrices, cache_hit, seconds_saved = fold_cache.fold_matrices(pipe_line, x, y, train_idx, test_idx, data_key)
+        estimator = clone(pipe_line.steps[-1][1])
+        estimator.fit(matrices["x_fit"], matrices["y_fit"])
+        x_train, x_test = matrices["x_train"], matrices["x_test"]
+    fit_time = time.perf_counter() - start
+
+    # one predict_proba per split, labels are derived from it instead of a second predict
+    start = time.perf_counter()
+    classes = estimator.classes_
+    train_proba = estimator.predict_proba(x_train)
+    test_proba = estimator.predict_proba(x_test)
+    train_pred = classes[train_proba.argmax(axis=1)]
+    test_pred = classes[test_proba.argmax(axis=1)]
+
+    scores = {}
+    for name, metric in metrics.items():
+        scores[f"train_{name}"] = metric(y_train, train_pred)
+        scores[f"test_{name}"] = metric(y_test, test_pred)
+    score_time = time.perf_counter() - start
+
+    return test_idx, test_pred, test_proba, fit_time, score_time, scores, cache_hit, seconds_saved
+
+
+def cross_validate_once(pipe_line, x, y, metrics: dict = None, cv=cv, n_jobs: int = -1, fold_cache=None) -> dict:
+    """Fits every fold once and returns cross_validate-style scores together with
+    the out-of-fold labels (`oof_pred`) and probabilities (`oof_proba`).
+
+    With a `fold_cache` the transformed fold matrices are reused across runs and
+    `cache_hits` / `cache_seconds_saved` are added to the result."""
+    try:
+        metrics = metrics or {}
+        y = np.asarray(y)
+        data_key = dataset_digest(x, y) if fold_cache is not None else None
+        folds = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_fold)(pipe_line, x, y, train_idx, test_idx, metrics, fold_cache, data_key)
+            for train_idx, test_idx in cv.split(x, y)
+        )
+
+        oof_pred = np.empty(len(y), dtype=y.dtype)
+        oof_proba = None
+        result = {"fit_time": [], "score_time": [], "cache_hit": [], "cache_seconds_saved": []}
+
+        for test_idx, test_pred, test_proba, fit_time, score_time, scores, cache_hit, seconds_saved in folds:
+            if oof_proba is None:
+                oof_proba = np.empty((len(y), test_proba.shape[1]), dtype=test_proba.dtype)
+            oof_pred[test_idx] = test_pred
+            oof_proba[test_idx] = test_proba
+            result["fit_time"].append(fit_time)
+            result["score_time"].append(score_time)
+            result["cache_hit"].append(cache_hit)
+            result["cache_seconds_saved"].append(seconds_saved)
+            for key, value in scores.items():
+                result.setdefault(key, []).append(value)
+
+        result = {key: np.asarray(value) for key, value in result.items()}
+        result["oof_pred"] = oof_pred
+        result["oof_proba"] = oof_proba
+
+        if fold_cache is not None:
+            logger.info(f"fold cache: {int(result['cache_hit'].sum())}/{len(folds)} hits, "
+                        f"{result['cache_seconds_saved'].sum():.2f}s saved")
+        logger.info(f"cross validation done with {len(folds)} fits")
+        return result
+
+    except Exception as e:
+        logger.error(f"cross validation failed! Error: {str(e)}")
+        raise CustomException(f"cross validation failed!", e)
@@ -0,0 +1,131 @@
+import json
+import os
+import numpy as np
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.utils import load_config, write_json_atomic
+
+
+logger = get_logger(__name__)
+
+DRIFT_REFERENCE_FILE = "drift_reference.json"
+# PSI of empty bins is undefined, proportions are floored at this
+PSI_EPSILON = 1e-4
+
+
+def build_reference(x, num_cols: list, cat_cols: list, bins: int = 20) -> dict:
+    """Binned distribution of every model input in the training frame.
+
+    Numeric columns get inner bin edges at the training quantiles, so bins hold
+    roughly equal mass (fewer for columns with few distinct values). Categorical
+    columns get a count per training category.
+    """
+    reference = {"rows": int(len(x)), "bins": bins, "numeric": {}, "categorical": {}}
+    for col in num_cols:
+        values = np.asarray(x[col], dtype=np.float64)
+        values = values[~np.isnan(values)]
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        reference["numeric"][col] = {"edges": edges.tolist(), "counts": counts.tolist()}
+    for col in cat_cols:
+        counts = x[col].astype(str).value_counts(sort=False)
+        reference["categorical"][col] = {"categories": counts.index.tolist(), "counts": counts.tolist()}
+    return reference
+
+
+class FeatureSummary:
+    """Streaming counts of incoming records on the reference's bins.
+
+    Memory is fixed by the reference: one count per numeric bin, one per training
+    category plus a slot for categories training never saw.
+    """
+
+    def __init__(self, reference: dict):
+        self.edges = {col: np.asarray(spec["edges"], dtype=np.float64) for col, spec in reference["numeric"].items()}
+        self.numeric = {col: np.zeros(len(edges) + 1, dtype=np.int64) for col, edges in self.edges.items()}
+        self.index = {col: {category: i for i, category in enumerate(spec["categories"])}
+                      for col, spec in reference["categorical"].items()}
+        self.categorical = {col: np.zeros(len(index) + 1, dtype=np.int64) for col, index in self.index.items()}
+        self.rows = 0
+
+    def update(self, records: list):
+        n = len(records)
+        if n == 0:
+            return
+        for col, edges in self.edges.items():
+            values = np.fromiter((record[col] for record in records), dtype=np.float64, count=n)
+            self.numeric[col] += np.bincount(np.searchsorted(edges, values, side="right"),
+                                             minlength=len(edges) + 1)
+        for col, index in self.index.items():
+            unseen = len(index)
+            positions = np.fromiter((index.get(str(record[col]), unseen) for record in records), dtype=np.intp, count=n)
+            self.categorical[col] += np.bincount(positions, minlength=unseen + 1)
+        self.rows += n
+
+
+def psi(expected, actual) -> float:
+    expected = np.maximum(np.asarray(expected, dtype=np.float64) / max(np.sum(expected), 1), PSI_EPSILON)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64) / max(np.sum(actual), 1), PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected, actual) -> float:
+    # largest CDF gap at the bin edges, a lower bound of the exact two-sample KS statistic
+    expected = np.cumsum(expected) / max(np.sum(expected), 1)
+    actual = np.cumsum(actual) / max(np.sum(actual), 1)
+    return float(np.max(np.abs(expected - actual)))
+
+
+def drift_scores(reference: dict, summary: FeatureSummary, psi_alert: float = 0.2, min_rows: int = 500) -> dict:
+    """PSI (and binned KS for numerics) of each feature in `summary` against `reference`.
+
+    Features with PSI of at least `psi_alert` are listed under "drifted", once the
+    summary holds `min_rows` records; fewer rows give too noisy a PSI to alert on.
+    """
+    features = {}
+    for col, spec in reference["numeric"].items():
+        counts = summary.numeric[col]
+        features[col] = {"type": "numeric", "psi": round(psi(spec["counts"], counts), 6),
+                         "ks": round(binned_ks(spec["counts"], counts), 6)}
+    for col, spec in reference["categorical"].items():
+        counts = summary.categorical[col]
+        features[col] = {"type": "categorical", "psi": round(psi(spec["counts"] + [0], counts), 6),
+                         "unseen": int(counts[-1])}
+
+    drifted = []
+    if summary.rows >= min_rows:
+        drifted = sorted((col for col, score in features.items() if score["psi"] >= psi_alert),
+                         key=lambda col: -features[col]["psi"])
+    return {"rows": summary.rows, "reference_rows": reference["rows"], "drifted": drifted, "features": features}
+
+
+def read_reference(bundle_dir: str):
+    path = os.path.join(bundle_dir, DRIFT_REFERENCE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def write_reference(bundle_dir: str, reference: dict):
+    write_json_atomic(os.path.join(bundle_dir, DRIFT_REFERENCE_FILE), reference)
+
+
+if __name__ == "__main__":
+    # rebuild the drift reference of the current bundle from x, e.g. after changing the bins
+    from src.storage import read_frame, data_path
+    from src.api.inference import CompiledPipeline
+
+    try:
+        config = load_config()
+        bundle_dir = config.get("api", {}).get("registry", {}).get("model_path", "models/serving_bundle")
+        compiled = CompiledPipeline.load(bundle_dir)
+
+        reference = build_reference(read_frame(data_path("x")), compiled.num_cols, [col for col, _, _ in compiled.ohe],
+                                    config.get("drift", {}).get("bins", 20))
+        write_reference(bundle_dir, reference)
+        logger.info(f"drift reference of {reference['rows']} rows written to {bundle_dir}")
+
+    except Exception as e:
+        logger.error(f"drift reference failed! Error: {str(e)}")
+        raise CustomException("drift reference failed!", e)
@@ -1,40 +1,35 @@
 from sklearn.metrics import confusion_matrix, roc_curve, auc
-from sklearn.model_selection import cross_val_predict
 import pandas as pd 
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src.cv_engine import cross_validate_once
+from src.storage import read_frame, write_frame, data_path
+from src.profiling import profile_stage
 import joblib
-import plotly.express as px
 import os
-import mlflow
-from sklearn.model_selection import StratifiedKFold
-
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
 
 
 
 
 logger = get_logger(__name__)
 
-def evaluate(x, y, pipe_line, run_id= None):
+@profile_stage()
+def evaluate(x, y, pipe_line, run_id= None, cv_result= None):
     
     try:
-        y_pred = cross_val_predict(pipe_line,
-                                x,
-                                y,
-                                cv=cv,
-                                n_jobs=-1
-                                )
-        pd.DataFrame({"y_pred": y_pred}).to_csv("data/processed/y_pred.csv", index=False)
-
-        y_proba = cross_val_predict(pipe_line,
-                                x,
-                                y,
-                                cv=cv,
-                                n_jobs=-1,
-                                method='predict_proba'
-                                )
-        pd.DataFrame(y_proba, columns=["proba_0", "proba_1"]).to_csv("data/processed/y_proba.csv", index=False)
+        # plotting and tracking are only needed here, keep them off the import path
+        import plotly.express as px
+        import mlflow
+
+        # reuse the out-of-fold predictions from training instead of refitting every fold
+        if cv_result is None:
+            cv_result = cross_validate_once(pipe_line, x, y)
+
+        y_pred = cv_result["oof_pred"]
+        write_frame(pd.DataFrame({"y_pred": y_pred}), data_path("y_pred"))
+
+        y_proba = cv_result["oof_proba"]
+        write_frame(pd.DataFrame(y_proba, columns=["proba_0", "proba_1"]), data_path("y_proba"))
         
 
         os.makedirs("artifact", exist_ok=True)
@@ -83,9 +78,9 @@ def evaluate(x, y, pipe_line, run_id= None):
     
 if __name__ == "__main__":
 
-    x = pd.read_csv("data/processed/x.csv")
+    x = read_frame(data_path("x"))
 
-    y = pd.read_csv("data/processed/y.csv").values.ravel()
+    y = read_frame(data_path("y")).values.ravel()
 
     model = joblib.load("models/xgb_model.pkl")
 
@@ -0,0 +1,121 @@
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.utils import check_random_state
+from imblearn.utils import check_sampling_strategy
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# above this many features a KD-tree prunes almost nothing, one GEMM per batch is faster
+KD_TREE_MAX_FEATURES = 15
+# distance block rows x columns, ~4 MB of float32 so the argmin passes stay in cache
+BRUTE_BLOCK_ELEMENTS = 1 << 20
+
+
+def _drop_self(neighbors: np.ndarray) -> np.ndarray:
+    # with duplicate rows the point itself is not guaranteed to come back first,
+    # drop it wherever it is (or the farthest neighbour if it was not returned)
+    rows = np.arange(len(neighbors))[:, None]
+    is_self = neighbors == rows
+    is_self[~is_self.any(axis=1), -1] = True
+    return neighbors[~is_self].reshape(len(neighbors), -1)
+
+
+def kneighbors(x: np.ndarray, n_neighbors: int, algorithm: str = "auto") -> np.ndarray:
+    """Indices of the `n_neighbors` nearest rows of `x` to each row of `x`, nearest first,
+    excluding the row itself."""
+    if algorithm == "auto":
+        algorithm = "kd_tree" if x.shape[1] <= KD_TREE_MAX_FEATURES else "brute"
+
+    if algorithm == "kd_tree":
+        from scipy.spatial import cKDTree
+
+        _, neighbors = cKDTree(x).query(x, k=n_neighbors + 1, workers=-1)
+        return _drop_self(neighbors.reshape(len(x), n_neighbors + 1).astype(np.intp))
+
+    if algorithm != "brute":
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected 'auto', 'kd_tree' or 'brute'")
+
+    # centering keeps the float32 expansion below from cancelling, distances do not change
+    x = np.asarray(x - x.mean(axis=0), dtype=np.float32)
+    n = len(x)
+    # |a - b|^2 = |a|^2 - 2ab + |b|^2 and |a|^2 is constant along a row, so rows are ranked
+    # by |b|^2 / 2 - ab; the extra column folds that into a single GEMM per block
+    left = np.hstack([x, np.ones((n, 1), dtype=np.float32)])
+    right = np.ascontiguousarray(np.hstack([-x, 0.5 * np.einsum("ij,ij->i", x, x)[:, None]]).T)
+
+    neighbors = np.empty((n, n_neighbors), dtype=np.intp)
+    batch = max(1, BRUTE_BLOCK_ELEMENTS // n)
+    block = np.empty((batch, n), dtype=np.float32)
+
+    for start in range(0, n, batch):
+        stop = min(start + batch, n)
+        rows = np.arange(stop - start)
+        distances = block[:stop - start]
+        np.matmul(left[start:stop], right, out=distances)
+        distances[rows, rows + start] = np.inf
+        # k is small: k argmin passes over a cache-sized block beat a full argpartition
+        for j in range(n_neighbors):
+            nearest = distances.argmin(axis=1)
+            neighbors[start:stop, j] = nearest
+            distances[rows, nearest] = np.inf
+
+    return neighbors
+
+
+class FastSMOTE(BaseEstimator):
+    """Drop-in replacement for imblearn's SMOTE on dense matrices.
+
+    Neighbours are searched only within each class being over-sampled (KD-tree or
+    blocked brute force, picked by dimensionality) and the synthetic rows are built
+    with one vectorized interpolation in float32. The random draws follow imblearn,
+    so for the same seed and neighbour lists the samples are the same.
+    """
+
+    def __init__(self, sampling_strategy="auto", k_neighbors: int = 5, random_state=None, algorithm: str = "auto"):
+        self.sampling_strategy = sampling_strategy
+        self.k_neighbors = k_neighbors
+        self.random_state = random_state
+        self.algorithm = algorithm
+
+    def fit_resample(self, X, y):
+        x = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y)
+        self.sampling_strategy_ = check_sampling_strategy(self.sampling_strategy, y, "over-sampling")
+
+        x_resampled, y_resampled = [x], [y]
+        for class_sample, n_samples in self.sampling_strategy_.items():
+            if n_samples == 0:
+                continue
+            x_class = x[y == class_sample]
+            if self.k_neighbors >= len(x_class):
+                raise ValueError(f"k_neighbors={self.k_neighbors} needs more than {len(x_class)} "
+                                 f"samples of class {class_sample}")
+
+            neighbors = kneighbors(x_class, self.k_neighbors, self.algorithm)
+
+            # same draws, in the same order, as imblearn's BaseSMOTE._make_samples
+            random_state = check_random_state(self.random_state)
+            sample_indices = random_state.randint(low=0, high=neighbors.size, size=n_samples)
+            steps = random_state.uniform(size=n_samples)[:, np.newaxis].astype(np.float32)
+            rows = sample_indices // neighbors.shape[1]
+            cols = sample_indices % neighbors.shape[1]
+
+            base = x_class[rows]
+            x_resampled.append(base + steps * (x_class[neighbors[rows, cols]] - base))
+            y_resampled.append(np.full(n_samples, class_sample, dtype=y.dtype))
+
+        return np.vstack(x_resampled), np.hstack(y_resampled)
+
+
+def smote_from_config(config: dict, random_state=42):
+    smote = config.get("smote", {})
+    k_neighbors = smote.get("k_neighbors", 5)
+    if smote.get("fast", False):
+        return FastSMOTE(k_neighbors=k_neighbors, random_state=random_state,
+                         algorithm=smote.get("algorithm", "auto"))
+
+    from imblearn.over_sampling import SMOTE
+
+    return SMOTE(k_neighbors=k_neighbors, random_state=random_state)
@@ -1,24 +1,27 @@
 from src.logger import get_logger
 from src.custom_exception import CustomException
-import pandas as pd
+from src.storage import read_frame, write_frame, data_path
+from src.features import add_features
+from src.profiling import profile_stage, write_profile_report
 
 
 logger = get_logger(__name__)
 
-def feature_engineering(file_path:str = "data/processed/validated_data.csv"):
+def make_features(df):
+    # same definition the API and the offline scorers use, see src/features.py
+    return add_features(df)
+
+@profile_stage()
+def feature_engineering(file_path:str = None):
     try:
 
         logger.info("loading processed data")
-        df = pd.read_csv(file_path)
+        df = read_frame(file_path or data_path("validated_data"))
         logger.info("data loaded successfully")
 
         logger.info("start making features")
 
-        df["total_guests"] = df["no_of_adults"] + df["no_of_children"]
-        df["total_nights"] = df["no_of_weekend_nights"] + df["no_of_week_nights"]
-        df.loc[df['total_nights'] == 0, 'total_nights'] = 1
-        df['price_per_night'] = df['avg_price_per_room'] / df['total_nights']
-        df['is_weekend_only'] = (df['total_nights'] == df['no_of_weekend_nights']).astype(int)
+        df = make_features(df)
 
         logger.info("feature engineering done!")
 
@@ -26,9 +29,10 @@ def feature_engineering(file_path:str = "data/processed/validated_data.csv"):
 
 
 
-        df.to_csv("data/processed/feature_engineered_data.csv", index=False)
+        write_frame(df, data_path("feature_engineered_data"))
         logger.info("final data saved in data/processed")
-        
+
+        return df
 
     except Exception as e :
         logger.error("feature engineering failed!")
@@ -40,4 +44,5 @@ def feature_engineering(file_path:str = "data/processed/validated_data.csv"):
 
 if __name__ == "__main__":
 
-    feature_engineering()
\ No newline at end of file
+    feature_engineering()
+    write_profile_report("feature_engineering")
\ No newline at end of file
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+
+# raw columns the derived features are built from, and the derived ones in output order
+BASE_COLUMNS = ["no_of_adults", "no_of_children", "no_of_weekend_nights", "no_of_week_nights", "avg_price_per_room"]
+DERIVED_COLUMNS = ["total_guests", "total_nights", "price_per_night", "is_weekend_only"]
+
+
+def derive_columns(columns) -> dict:
+    """The derived features from a mapping of base column -> NumPy array.
+
+    Training and offline scoring use it through `add_features`, and API batches
+    of `api.columnwise_min_rows` or more through `add_features_columns`.
+    Single requests and smaller batches use `add_features_record`, which repeats
+    the formulas on plain Python scalars on purpose: going through NumPy costs
+    about 13us per request against 1us. tests/test_features.py checks that the
+    paths agree, zero-night stays included, so a change here has to be made in both.
+    """
+    total_nights = np.maximum(columns["no_of_weekend_nights"] + columns["no_of_week_nights"], 1)
+    return {
+        "total_guests": columns["no_of_adults"] + columns["no_of_children"],
+        "total_nights": total_nights,
+        "price_per_night": columns["avg_price_per_room"] / total_nights,
+        "is_weekend_only": (total_nights == columns["no_of_weekend_nights"]).astype(int)
+    }
+
+
+def add_features(df: pd.DataFrame) -> pd.DataFrame:
+    # column-wise on the underlying arrays so a whole batch is derived in one pass
+    derived = derive_columns({name: df[name].to_numpy() for name in BASE_COLUMNS})
+    for name in DERIVED_COLUMNS:
+        df[name] = derived[name]
+    return df
+
+
+def add_features_columns(records: list) -> dict:
+    # column arrays of a list of request records plus the derived ones, add_features without a DataFrame
+    columns = {name: np.asarray([record[name] for record in records]) for name in records[0]}
+    columns.update(derive_columns(columns))
+    return columns
+
+
+def add_features_record(record: dict) -> dict:
+    # scalar copy of derive_columns for single requests, keep the two in step
+    total_nights = max(record["no_of_weekend_nights"] + record["no_of_week_nights"], 1)
+    record["total_guests"] = record["no_of_adults"] + record["no_of_children"]
+    record["total_nights"] = total_nights
+    record["price_per_night"] = record["avg_price_per_room"] / total_nights
+    record["is_weekend_only"] = int(total_nights == record["no_of_weekend_nights"])
+    return record
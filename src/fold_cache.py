@@ -0,0 +1,161 @@
+import argparse
+import os
+import shutil
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.utils import load_config, take_rows
+
+
+logger = get_logger(__name__)
+
+
+def dataset_digest(x, y) -> str:
+    x_hash = pd.util.hash_pandas_object(x, index=False).to_numpy() if hasattr(x, "iloc") else x
+    return joblib.hash((x_hash, list(getattr(x, "columns", [])), np.asarray(y)))
+
+
+class FoldCache:
+    """Content-addressed store for the preprocessed (and resampled) matrices of a CV fold.
+
+    The key covers the data, the fold's row indices and every step before the final
+    estimator (unfitted params), so a run that only changes booster params reuses
+    the matrices and just fits the booster. Every write prunes the least recently
+    used entries until the directory fits in `max_bytes` (None = unbounded).
+    """
+
+    def __init__(self, cache_dir: str = "cache/folds", enabled: bool = True, max_bytes: int = None):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_config(cls, config: dict = None):
+        fold_cache = (config or load_config()).get("fold_cache", {})
+        max_size_mb = fold_cache.get("max_size_mb")
+        return cls(fold_cache.get("dir", "cache/folds"), fold_cache.get("enabled", False),
+                   int(max_size_mb * 1024 ** 2) if max_size_mb else None)
+
+    def entries(self) -> list:
+        """(path, bytes, last used) of every entry, least recently used first."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".joblib"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # pruned by a concurrent run
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def prune(self, max_bytes: int = None) -> int:
+        """Deletes least recently used entries until the cache fits in max_bytes; returns bytes freed."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return 0
+        entries = self.entries()
+        size = sum(entry[1] for entry in entries)
+        freed = 0
+        for path, entry_bytes, _ in entries:
+            if size - freed <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                freed += entry_bytes
+            except FileNotFoundError:
+                pass
+        if freed:
+            logger.info(f"fold cache pruned {freed / 1024 ** 2:.1f} MB from {self.cache_dir}")
+        return freed
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def key(self, pipe_line, data_key: str, train_idx, test_idx) -> str:
+        steps = [(name, clone(step)) for name, step in pipe_line.steps[:-1]]
+        return joblib.hash((data_key, np.asarray(train_idx), np.asarray(test_idx), steps))
+
+    def fold_matrices(self, pipe_line, x, y, train_idx, test_idx, data_key: str):
+        """Returns (matrices, hit, seconds_saved)."""
+        path = os.path.join(self.cache_dir, self.key(pipe_line, data_key, train_idx, test_idx) + ".joblib")
+
+        if self.enabled and os.path.exists(path):
+            start = time.perf_counter()
+            try:
+                entry = joblib.load(path, mmap_mode="r")
+                # mtime is the last use, atime is unreliable with relatime/noatime mounts
+                os.utime(path)
+                return entry["matrices"], True, max(entry["seconds"] - (time.perf_counter() - start), 0.0)
+            except Exception as e:
+                logger.warning(f"unreadable fold cache entry {path}, rebuilding: {e}")
+
+        start = time.perf_counter()
+        matrices = self._compute(pipe_line, x, y, train_idx, test_idx)
+        seconds = time.perf_counter() - start
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            joblib.dump({"matrices": matrices, "seconds": seconds}, tmp_path)
+            os.replace(tmp_path, path)
+            self.prune()
+
+        return matrices, False, 0.0
+
+    @staticmethod
+    def _compute(pipe_line, x, y, train_idx, test_idx) -> dict:
+        x_fit, y_fit = take_rows(x, train_idx), take_rows(np.asarray(y), train_idx)
+        x_train, x_test = x_fit, take_rows(x, test_idx)
+        resampled = False
+
+        # same semantics as imblearn's Pipeline.fit: samplers only touch the fit data
+        for _, step in pipe_line.steps[:-1]:
+            if step is None or step == "passthrough":
+                continue
+            step = clone(step)
+            if hasattr(step, "fit_resample"):
+                x_fit, y_fit = step.fit_resample(x_fit, y_fit)
+                resampled = True
+            else:
+                step.fit(x_fit, y_fit)
+                x_fit = step.transform(x_fit)
+                x_train = x_fit if not resampled else step.transform(x_train)
+                x_test = step.transform(x_test)
+
+        return {
+            "x_fit": np.asarray(x_fit),
+            "y_fit": np.asarray(y_fit),
+            "x_train": np.asarray(x_train),
+            "x_test": np.asarray(x_test)
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="inspect, prune or clear the CV fold cache")
+    parser.add_argument("--clear", action="store_true", help="delete every entry")
+    parser.add_argument("--max-size-mb", type=float, default=None, help="prune to this size, default: config")
+    args = parser.parse_args()
+
+    try:
+        fold_cache = FoldCache.from_config()
+        if args.clear:
+            fold_cache.clear()
+            logger.info(f"fold cache {fold_cache.cache_dir} cleared")
+        else:
+            fold_cache.prune(int(args.max_size_mb * 1024 ** 2) if args.max_size_mb is not None else None)
+            entries = fold_cache.entries()
+            logger.info(f"fold cache {fold_cache.cache_dir}: {len(entries)} entries, "
+                        f"{sum(entry[1] for entry in entries) / 1024 ** 2:.1f} MB")
+
+    except Exception as e:
+        logger.error(f"fold cache maintenance failed! Error: {str(e)}")
+        raise CustomException("fold cache maintenance failed!", e)
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import time
+import joblib
+import mlflow
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import f1_score, roc_auc_score
+from xgboost import XGBClassifier
+from imblearn.pipeline import Pipeline
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.utils import load_config, file_digest
+from src.storage import read_frame, write_frame, data_path
+from src.split_data import split_features_target
+
+
+logger = get_logger(__name__)
+
+BOOKING_STATUS_CLASSES = ["Canceled", "Not_Canceled"]
+
+
+def read_lineage(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def append_lineage(path: str, entry: dict) -> list:
+    lineage = read_lineage(path) + [{**entry, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(lineage, file, indent=2)
+    return lineage
+
+
+def updates_since_full_refit(lineage: list) -> int:
+    count = 0
+    for entry in reversed(lineage):
+        if entry.get("mode") != "incremental":
+            break
+        count += 1
+    return count
+
+
+def continue_training(pipe_line, x_new, y_new, rounds: int):
+    """Returns a new pipeline with the same fitted preprocessing and the booster boosted
+    `rounds` more times on the new rows; `pipe_line` itself is left untouched."""
+    x_fit, y_fit = x_new, np.asarray(y_new)
+    # scaler statistics and OHE categories stay frozen, samplers still only touch the fit data
+    for _, step in pipe_line.steps[:-1]:
+        if hasattr(step, "fit_resample"):
+            x_fit, y_fit = clone(step).fit_resample(x_fit, y_fit)
+        else:
+            x_fit = step.transform(x_fit)
+
+    name, booster = pipe_line.steps[-1]
+    model = XGBClassifier(**{**booster.get_params(), "n_estimators": rounds})
+    model.fit(x_fit, y_fit, xgb_model=booster.get_booster())
+
+    return Pipeline(pipe_line.steps[:-1] + [(name, model)])
+
+
+def append_history(x_new: pd.DataFrame, y_new: pd.DataFrame):
+    # new batches are kept next to the split outputs so a full refit trains on everything
+    # without rewriting x/y, which belong to the DVC split stage
+    x_path, y_path = data_path("x_increments"), data_path("y_increments")
+    if os.path.exists(x_path):
+        x_new = pd.concat([read_frame(x_path), x_new], ignore_index=True)
+        y_new = pd.concat([read_frame(y_path), y_new], ignore_index=True)
+    write_frame(x_new, x_path)
+    write_frame(y_new, y_path)
+
+
+def full_history(x_new: pd.DataFrame = None, y_new: pd.DataFrame = None):
+    # split outputs, the increments applied so far and the batch being applied, if any
+    x, y = read_frame(data_path("x")), read_frame(data_path("y"))
+    if os.path.exists(data_path("x_increments")):
+        x = pd.concat([x, read_frame(data_path("x_increments"))], ignore_index=True)
+        y = pd.concat([y, read_frame(data_path("y_increments"))], ignore_index=True)
+    if x_new is not None:
+        x = pd.concat([x, x_new], ignore_index=True)
+        y = pd.concat([y, y_new], ignore_index=True)
+    return x, y.values.ravel()
+
+
+def incremental_train(new_data_path: str, model_path: str = "models/xgb_model.pkl",
+                      full_refit: bool = False, config: dict = None) -> dict:
+    try:
+        config = config or load_config()
+        settings = config.get("incremental", {})
+        lineage_path = settings.get("lineage", "models/lineage.json")
+        refit_every = settings.get("full_refit_every", 0)
+
+        x_new, y_frame = split_features_target(read_frame(new_data_path), classes=BOOKING_STATUS_CLASSES)
+        y_new = y_frame["target"].to_numpy()
+
+        pipe_line = joblib.load(model_path)
+        since_full = updates_since_full_refit(read_lineage(lineage_path))
+
+        if full_refit or (refit_every and since_full >= refit_every):
+            from src.preprocessing import preprocessor
+            from src.xgboost_model import xgb_model
+
+            logger.info(f"full refit after {since_full} incremental updates")
+            x, y = full_history(x_new, y_frame)
+            xgb_model(x, y, preprocessor(config), with_smote="smote" in pipe_line.named_steps)
+            # kept for later refits only once the model and its lineage entry are written,
+            # a failed run can be repeated without duplicating the batch
+            append_history(x_new, y_frame)
+            return {"mode": "full", "rows": len(x)}
+
+        from src.api.inference import CompiledPipeline
+        from src.threshold import read_decision
+        from src.drift import read_reference
+
+        # the bundle the API serves and watches
+        bundle_dir = config.get("api", {}).get("registry", {}).get("model_path", "models/serving_bundle")
+        parent_digest = file_digest(model_path)
+        parent_run = read_lineage(lineage_path)[-1:] or [{}]
+        rounds = settings.get("rounds", 50)
+
+        mlflow.set_experiment("hotel_reservation")
+        with mlflow.start_run(run_name="incremental") as run:
+            # how the current model does on outcomes it has not seen yet, before updating on them
+            proba_before = pipe_line.predict_proba(x_new)[:, 1]
+
+            start = time.perf_counter()
+            updated = continue_training(pipe_line, x_new, y_new, rounds)
+            fit_seconds = time.perf_counter() - start
+
+            joblib.dump(updated, model_path)
+            compiled = CompiledPipeline.from_pipeline(updated)
+            # threshold and drift reference are rebuilt on the next full refit, keep the current ones until then
+            compiled.decision = read_decision(bundle_dir)
+            compiled.reference = read_reference(bundle_dir)
+            compiled.save(bundle_dir)
+
+            summary = {
+                "mode": "incremental",
+                "run_id": run.info.run_id,
+                "parent_run_id": parent_run[0].get("run_id"),
+                "parent_model_digest": parent_digest,
+                "model_digest": file_digest(model_path),
+                "rows": len(x_new),
+                "rounds_added": rounds,
+                "total_rounds": updated.steps[-1][1].get_booster().num_boosted_rounds(),
+                "updates_since_full_refit": since_full + 1
+            }
+
+            mlflow.set_tags({"mode": "incremental",
+                             "parent_run_id": str(summary["parent_run_id"]),
+                             "parent_model_digest": parent_digest})
+            mlflow.log_params({"rows": summary["rows"],
+                               "rounds_added": rounds,
+                               "total_rounds": summary["total_rounds"],
+                               "new_data": new_data_path})
+            metrics = {"fit_seconds": round(fit_seconds, 3)}
+            if len(np.unique(y_new)) > 1:
+                metrics["new_batch_f1_before"] = f1_score(y_new, (proba_before >= 0.5).astype(int))
+                metrics["new_batch_roc_auc_before"] = roc_auc_score(y_new, proba_before)
+            mlflow.log_metrics(metrics)
+
+            append_lineage(lineage_path, summary)
+            append_history(x_new, y_frame)
+
+        logger.info(f"incremental update done: {summary}")
+        return summary
+
+    except Exception as e:
+        logger.error(f"incremental training failed! Error: {str(e)}")
+        raise CustomException(f"incremental training failed!", e)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--new-data", required=True, help="feature engineered batch with booking_status")
+    parser.add_argument("--model", default="models/xgb_model.pkl")
+    parser.add_argument("--full-refit", action="store_true")
+    args = parser.parse_args()
+
+    print(incremental_train(args.new_data, args.model, args.full_refit))
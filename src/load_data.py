@@ -1,21 +1,26 @@
-import pandas as pd 
 import os
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src.storage import read_frame, write_frame, data_path
+from src.profiling import profile_stage, write_profile_report
 
 logger = get_logger(__name__)
 
-def load_data(file_path = r"data\raw\Hotel Reservations.csv"):
+@profile_stage()
+def load_data(file_path = os.path.join("data", "raw", "Hotel Reservations.csv")):
     try:
 
         logger.info("start loading data")
 
-        os.makedirs("data/processed",exist_ok=True)
-        df = pd.read_csv(file_path)
-        df.to_csv("data/processed/hotel_data.csv")
+        # stored as parsed: casting here would truncate 12.5 to 12 or fail on "soon",
+        # validate_data quarantines such rows
+        df = read_frame(file_path, typed=False)
+        write_frame(df, data_path("hotel_data"), typed=False)
 
         logger.info(f"loading data successfully and saved in data/processed")
 
+        return df
+
     except Exception as e :
         logger.error("failed loading data")
         raise CustomException("failed loading data", e)
@@ -23,4 +28,5 @@ def load_data(file_path = r"data\raw\Hotel Reservations.csv"):
 
 
 if __name__ == "__main__":
-    load_data()
\ No newline at end of file
+    load_data()
+    write_profile_report("load_data")
@@ -3,13 +3,20 @@ import os
 from datetime import datetime
 
 
-LOGS_DIR = "logs"
-os.makedirs(LOGS_DIR, exist_ok=True)
+LOGS_DIR = os.environ.get("LOGS_DIR", "logs")
 
 LOGS_FILE = os.path.join(LOGS_DIR, f'LOGS_{datetime.now().strftime("%Y-%m-%d")}.log')
 
+
+class _LazyFileHandler(logging.FileHandler):
+    # opens (and creates logs/) on the first record, so importing a module touches no files
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 logging.basicConfig(
-                    filename=LOGS_FILE,
+                    handlers=[_LazyFileHandler(LOGS_FILE, delay=True)],
                     level=logging.INFO,
                     format="%(asctime)s - %(levelname)s - %(message)s"
                     )
@@ -18,4 +25,3 @@ def get_logger(name):
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     return logger
-
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.storage import read_frame, write_frame, data_path, apply_dtypes
+from src.validate_data import validate_with_quarantine, write_report
+from src.feature_engineering import make_features
+from src.split_data import split_features_target
+from src.utils import current_rss
+
+
+logger = get_logger(__name__)
+
+RAW_DATA_PATH = os.path.join("data", "raw", "Hotel Reservations.csv")
+
+
+class StageRecorder:
+
+    def __init__(self):
+        self.stages = []
+
+    def run(self, name, fn, *args):
+        rss_before = current_rss()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        result = fn(*args)
+
+        frame = result[0] if isinstance(result, tuple) else result
+        self.stages.append({
+            "stage": name,
+            "seconds": round(time.perf_counter() - wall_start, 4),
+            "cpu_seconds": round(time.process_time() - cpu_start, 4),
+            "rows": len(frame),
+            "rss_mb": round(current_rss() / 2 ** 20, 1),
+            "rss_delta_mb": round((current_rss() - rss_before) / 2 ** 20, 1)
+        })
+        logger.info(f"{name} done in {self.stages[-1]['seconds']}s ({len(frame)} rows)")
+        return result
+
+
+def run_pipeline(raw_path: str = RAW_DATA_PATH, dry_run: bool = False, only_final: bool = False):
+    """Runs load_data -> validate_data -> feature_engineering -> split_data in one
+    process, handing the DataFrame from stage to stage instead of re-reading it.
+
+    Outputs declared in dvc.yaml are written on a background thread while the next
+    stage computes; `only_final` writes just x/y and `dry_run` writes nothing.
+    """
+    try:
+        recorder = StageRecorder()
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-writer")
+        pending = []
+
+        def save(df, name, intermediate=True, typed=True):
+            if dry_run or (only_final and intermediate):
+                return
+            # copy so the next stage can keep mutating its frame while this one is written
+            pending.append(writer.submit(write_frame, df.copy(), data_path(name), typed))
+
+        start = time.perf_counter()
+
+        # untyped until validated, like the load_data stage
+        df = recorder.run("load_data", lambda path: read_frame(path, typed=False), raw_path)
+        save(df, "hotel_data", typed=False)
+
+        # keep the in-memory frame on the same dtype layout the stored artifacts use
+        df, quarantine, validation = recorder.run("validate_data", validate_with_quarantine, df)
+        df = apply_dtypes(df)
+        save(df, "validated_data")
+        save(quarantine, "quarantine", typed=False)
+        if not (dry_run or only_final):
+            write_report(validation, os.path.join(os.path.dirname(data_path("validated_data")), "validation_report.json"))
+
+        df = apply_dtypes(recorder.run("feature_engineering", make_features, df))
+        save(df, "feature_engineered_data")
+
+        x, y = recorder.run("split_data", split_features_target, df)
+        x = x.reset_index(drop=True)
+        save(x, "x", intermediate=False)
+        save(y, "y", intermediate=False)
+
+        for future in pending:
+            future.result()
+        writer.shutdown()
+
+        report = {
+            "total_seconds": round(time.perf_counter() - start, 4),
+            "dry_run": dry_run,
+            "written": [] if dry_run else [f.result() for f in pending],
+            "validation": validation,
+            "stages": recorder.stages
+        }
+        logger.info(f"data pipeline done in {report['total_seconds']}s")
+
+        return x, y["target"].to_numpy(), report
+
+    except Exception as e:
+        logger.error(f"data pipeline failed! Error: {str(e)}")
+        raise CustomException(f"data pipeline failed!", e)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=RAW_DATA_PATH)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--only-final", action="store_true")
+    parser.add_argument("--report", default=None)
+    args = parser.parse_args()
+
+    _, _, report = run_pipeline(args.input, dry_run=args.dry_run, only_final=args.only_final)
+
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report, file, indent=2)
@@ -3,6 +3,7 @@ from src.custom_exception import CustomException
 from sklearn.preprocessing import OneHotEncoder,StandardScaler,RobustScaler
 from sklearn.compose import ColumnTransformer
 from src.utils import load_config
+from src.profiling import profile_stage, write_profile_report
 from imblearn.pipeline import Pipeline
 import joblib
 import os
@@ -12,6 +13,7 @@ logger = get_logger(__name__)
 
 
 
+@profile_stage()
 def preprocessor(config):
     try:
 
@@ -60,6 +62,7 @@ def preprocessor(config):
 if __name__ == "__main__":
     config = load_config()
     preprocessor(config)
+    write_profile_report("preprocessing")
 
 
 
@@ -0,0 +1,159 @@
+import functools
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.utils import load_config, current_rss
+
+
+logger = get_logger(__name__)
+
+profiling_config = load_config().get("profiling", {})
+
+# every stage profiled in this process, written out by write_profile_report
+STAGES = []
+
+
+def _rows(result, args) -> int:
+    # rows of the frame a stage returns, else of the first frame it was given
+    for value in ([result[0]] if isinstance(result, tuple) and result else [result]) + list(args):
+        if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+            return len(value)
+    return None
+
+
+class _PeakRss:
+    """Samples RSS on a background thread, the peak of a stage rather than of the process."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+class _Profiler:
+    """Optional call profile dump: cProfile (.prof) or pyinstrument (.html) if installed."""
+
+    def __init__(self, kind: str, path_stem: str):
+        self.kind = kind
+        self.path_stem = path_stem
+        self.profiler = None
+        self.path = None
+
+    def __enter__(self):
+        if self.kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+
+                self.profiler = Profiler()
+            except ImportError:
+                logger.warning("pyinstrument is not installed, falling back to cProfile")
+                self.kind = "cprofile"
+        if self.kind == "cprofile":
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+        if self.profiler is not None:
+            self.profiler.start() if self.kind == "pyinstrument" else self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler is None:
+            return
+        os.makedirs(os.path.dirname(self.path_stem) or ".", exist_ok=True)
+        if self.kind == "pyinstrument":
+            self.profiler.stop()
+            self.path = self.path_stem + ".html"
+            with open(self.path, "w") as file:
+                file.write(self.profiler.output_html())
+        else:
+            self.profiler.disable()
+            self.path = self.path_stem + ".prof"
+            self.profiler.dump_stats(self.path)
+
+
+def profile_stage(name: str = None):
+    """Decorator recording wall time, CPU time, peak RSS and rows for a pipeline stage.
+
+    Results are logged and kept in STAGES; `write_profile_report` persists them. Set
+    `profiling.profiler` (or the PROFILER env var) to cprofile/pyinstrument for a dump.
+    """
+    def decorator(fn):
+        stage = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiling_config.get("enabled", True):
+                return fn(*args, **kwargs)
+
+            kind = os.environ.get("PROFILER", profiling_config.get("profiler", "none"))
+            path_stem = os.path.join(profiling_config.get("report_dir", "reports/profile"), stage)
+            rss_before = current_rss()
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+            with _PeakRss(profiling_config.get("rss_interval_seconds", 0.01)) as rss, \
+                    _Profiler(kind, path_stem) as profiler:
+                result = fn(*args, **kwargs)
+
+            record = {
+                "stage": stage,
+                "wall_seconds": round(time.perf_counter() - wall_start, 4),
+                "cpu_seconds": round(time.process_time() - cpu_start, 4),
+                "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+                "rss_delta_mb": round((rss.peak - rss_before) / 2 ** 20, 1),
+                "rows": _rows(result, args)
+            }
+            if profiler.path:
+                record["profile"] = profiler.path
+            STAGES.append(record)
+            logger.info(f"profile {record}")
+            return result
+
+        return wrapper
+    return decorator
+
+
+def write_profile_report(name: str, log_to_mlflow: bool = None) -> dict:
+    """Writes the stages profiled in this process to <report_dir>/<name>.json (a DVC
+    metrics file) and logs them to the active, or last, MLflow run of this process."""
+    report = {record["stage"]: {k: v for k, v in record.items() if k != "stage"} for record in STAGES}
+
+    path = os.path.join(profiling_config.get("report_dir", "reports/profile"), f"{name}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+    if log_to_mlflow if log_to_mlflow is not None else profiling_config.get("mlflow", True):
+        import sys
+
+        # only stages that already talk to MLflow get their profile there, importing it is not free
+        if "mlflow" in sys.modules:
+            import mlflow
+
+            metrics = {f"profile_{stage}_{key}": value for stage, values in report.items()
+                       for key, value in values.items() if isinstance(value, (int, float))}
+            if mlflow.active_run() is not None:
+                mlflow.log_metrics(metrics)
+            elif mlflow.last_active_run() is not None:
+                # the training run has ended by the time the stage returns, reopen it
+                with mlflow.start_run(run_id=mlflow.last_active_run().info.run_id):
+                    mlflow.log_metrics(metrics)
+
+    return report
@@ -0,0 +1,24 @@
+# the hotel reservations table: column -> (type, nullable, checks), as plain data so the
+# API can compile its request checks without importing pandera. checks use pandera's
+# Check constructors: between (min, max, both inclusive), ge (min), isin (allowed values)
+HOTEL_COLUMNS = {
+    "Booking_ID": (str, False, {}),
+    "no_of_adults": (int, False, {"between": (0, 10)}),
+    "no_of_children": (float, True, {"between": (0, 10)}),
+    "no_of_weekend_nights": (int, False, {"between": (0, 15)}),
+    "no_of_week_nights": (int, False, {"between": (0, 30)}),
+    "type_of_meal_plan": (str, True, {}),
+    "required_car_parking_space": (int, False, {"isin": [0, 1]}),
+    "room_type_reserved": (str, True, {}),
+    "lead_time": (int, False, {"between": (0, 500)}),
+    "arrival_year": (int, False, {"between": (2015, 2030)}),
+    "arrival_month": (int, False, {"between": (1, 12)}),
+    "arrival_date": (int, False, {"between": (1, 31)}),
+    "market_segment_type": (str, True, {}),
+    "repeated_guest": (int, False, {"isin": [0, 1]}),
+    "no_of_previous_cancellations": (int, False, {"ge": 0}),
+    "no_of_previous_bookings_not_canceled": (int, False, {"ge": 0}),
+    "avg_price_per_room": (float, False, {"ge": 0}),
+    "no_of_special_requests": (int, False, {"ge": 0}),
+    "booking_status": (str, False, {"isin": ["Canceled", "Not_Canceled"]})
+}
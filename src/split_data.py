@@ -2,33 +2,42 @@ from src.logger import get_logger
 from src.custom_exception import CustomException
 from sklearn.preprocessing import LabelEncoder
 import pandas as pd
+from src.storage import read_frame, write_frame, data_path
+from src.profiling import profile_stage, write_profile_report
 
 
 logger = get_logger(__name__)
 
 
-def features_target_split(file_path: str = r"data/processed/feature_engineered_data.csv"):
+def split_features_target(df, classes: list = None):
+    x = df.drop(columns=["booking_status","Booking_ID"])
+    y = df["booking_status"]
+
+    # fixed classes keep the encoding stable for batches that only contain one label
+    le =LabelEncoder()
+    y_encoded = le.fit(classes).transform(y) if classes is not None else le.fit_transform(y)
+
+    return x, pd.DataFrame({"target": y_encoded})
+
+
+@profile_stage()
+def features_target_split(file_path: str = None):
     try:
 
         logger.info("loading final data!")        
-        df = pd.read_csv(file_path)
+        df = read_frame(file_path or data_path("feature_engineered_data"))
 
-        logger.info("spliting data")
-        x = df.drop(columns=["booking_status","Booking_ID"])
-        y = df["booking_status"]
+        logger.info("spliting data and encoding label")
+        x, y = split_features_target(df)
         logger.info("spliting data done!")
 
-
-        logger.info("encoding label")
-        le =LabelEncoder()
-        y_encoded = le.fit_transform(y)
-        logger.info("encoding label done!")
-
         
-        x.to_csv("data/processed/x.csv", index=False)
-        pd.DataFrame({"target": y_encoded}).to_csv("data/processed/y.csv", index=False)
+        write_frame(x, data_path("x"))
+        write_frame(y, data_path("y"))
+
+        logger.info("x and y saved successfully.")
 
-        logger.info("X.csv and y.csv saved successfully.")
+        return x, y
 
     except Exception as e:
         logger.error("spliting data failed!")
@@ -38,3 +47,4 @@ def features_target_split(file_path: str = r"data/processed/feature_engineered_d
 
 if __name__ == "__main__":
     features_target_split()
+    write_profile_report("split_data")
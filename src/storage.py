@@ -0,0 +1,132 @@
+import os
+import pandas as pd
+from src.logger import get_logger
+from src.utils import load_config
+
+
+logger = get_logger(__name__)
+
+INT_COLS = [
+    "no_of_adults", "no_of_children", "no_of_weekend_nights", "no_of_week_nights",
+    "required_car_parking_space", "lead_time", "arrival_year", "arrival_month", "arrival_date",
+    "repeated_guest", "no_of_previous_cancellations", "no_of_previous_bookings_not_canceled",
+    "no_of_special_requests", "total_guests", "total_nights", "is_weekend_only", "target", "y_pred"
+]
+FLOAT_COLS = ["avg_price_per_room", "price_per_night", "proba_0", "proba_1"]
+CATEGORY_COLS = ["type_of_meal_plan", "room_type_reserved", "market_segment_type", "booking_status"]
+STR_COLS = ["Booking_ID"]
+
+EXTENSIONS = {"parquet": ".parquet", "csv": ".csv"}
+
+storage_config = load_config().get("storage", {})
+
+
+def data_path(name: str, fmt: str = None) -> str:
+    fmt = fmt or storage_config.get("format", "csv")
+    return os.path.join(storage_config.get("processed_dir", "data/processed"), name + EXTENSIONS[fmt])
+
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    # one typed layout for every stage so ints do not drift to float between CSV round-trips
+    for col in df.columns:
+        if col in INT_COLS and not df[col].isna().any():
+            df[col] = df[col].astype("int64")
+        elif col in FLOAT_COLS:
+            df[col] = df[col].astype("float64")
+        elif col in CATEGORY_COLS:
+            df[col] = df[col].astype("category")
+        elif col in STR_COLS:
+            df[col] = df[col].astype(str)
+    return df
+
+
+def read_frame(path: str, columns: list = None, fallback: bool = False, typed: bool = True) -> pd.DataFrame:
+    # untyped reads keep values as parsed, inputs not yet validated must reach the schema's dtype checks
+    if fallback and not os.path.exists(path):
+        # opt-in for tools run on artifacts produced before a format switch; pipeline stages
+        # read exactly what the previous stage wrote, a stale file in the other format would go unnoticed
+        stem = os.path.splitext(path)[0]
+        for ext in EXTENSIONS.values():
+            if os.path.exists(stem + ext):
+                logger.warning(f"{path} not found, reading {stem + ext} instead")
+                path = stem + ext
+                break
+
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+        df = df.drop(columns=[c for c in df.columns if c.startswith("Unnamed: ")])
+    return apply_dtypes(df) if typed else df
+
+
+def write_frame(df: pd.DataFrame, path: str, typed: bool = True) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df = df.reset_index(drop=True)
+    # untyped writes keep whatever the rows hold, e.g. quarantined values that fail the casts
+    df = apply_dtypes(df) if typed else df.astype({c: str for c in df.columns if df[c].dtype == object})
+
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False, engine="pyarrow")
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def iter_frames(path: str, chunksize: int):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield chunk.drop(columns=[c for c in chunk.columns if c.startswith("Unnamed: ")])
+
+
+class FrameWriter:
+    """Appends DataFrame chunks to one CSV/Parquet file with a stable schema."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._parquet_writer = None
+        self._schema = None
+        self._template = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            # an empty first chunk would pin an untyped schema, keep it only as a fallback
+            if self._template is None:
+                self._template = df
+            return
+
+        df = apply_dtypes(df.reset_index(drop=True))
+        # categories differ chunk to chunk, store plain strings and re-categorize on read
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(str)
+
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._schema = table.schema
+                self._parquet_writer = pq.ParquetWriter(self.path, self._schema)
+            self._parquet_writer.write_table(table.cast(self._schema))
+        else:
+            df.to_csv(self.path, mode="a", header=self.rows == 0, index=False)
+
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        elif self.rows == 0 and self._template is not None:
+            write_frame(self._template, self.path)
@@ -0,0 +1,135 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.storage import iter_frames, FrameWriter, write_frame, data_path, storage_config
+from src.validate_data import compiled_schema
+from src.feature_engineering import make_features
+
+
+logger = get_logger(__name__)
+
+NULL_THRESHOLD = 0.4
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    # normalize dtypes first: the same row must hash the same in every chunk even if
+    # the CSV reader inferred int in one chunk and float (because of a NaN) in another
+    normalized = pd.DataFrame({
+        col: df[col].astype("float64") if pd.api.types.is_numeric_dtype(df[col]) else df[col].astype(object)
+        for col in df.columns
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+class Deduplicator:
+    """Streaming equivalent of DataFrame.drop_duplicates(keep="first") over a sequence of chunks."""
+
+    def __init__(self):
+        self.seen = set()
+
+    def __call__(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        hashes = row_hashes(chunk)
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        keep &= np.fromiter((h not in self.seen for h in hashes.tolist()), dtype=bool, count=len(hashes))
+        self.seen.update(hashes[keep].tolist())
+        return chunk[keep]
+
+
+def null_rates(input_path: str, chunksize: int) -> pd.Series:
+    """First pass: per-column null rate over the de-duplicated rows, which is exactly
+    what clean_data_on_the_fly bases its 40% column-drop rule on."""
+    dedupe = Deduplicator()
+    nulls = None
+    rows = 0
+    for chunk in iter_frames(input_path, chunksize):
+        chunk = dedupe(chunk)
+        counts = chunk.isna().sum()
+        nulls = counts if nulls is None else nulls.add(counts, fill_value=0)
+        rows += len(chunk)
+    return nulls / rows if rows else nulls
+
+
+def run_streaming_pipeline(input_path: str = None, validated_path: str = None,
+                           features_path: str = None, chunksize: int = None,
+                           quarantine_path: str = None) -> dict:
+    """Chunked validate_data + feature_engineering for inputs that do not fit in memory.
+
+    Produces the same rows as run_validation_pipeline followed by feature_engineering:
+    duplicates are removed across chunks through a set of row hashes, columns over
+    the null threshold are found in a first pass, and each chunk is validated,
+    featurized and appended to the outputs. Rows failing the schema checks are
+    collected into the quarantine file.
+    """
+    try:
+        input_path = input_path or data_path("hotel_data")
+        validated_path = validated_path or data_path("validated_data")
+        features_path = features_path or data_path("feature_engineered_data")
+        quarantine_path = quarantine_path or data_path("quarantine")
+        chunksize = chunksize or storage_config.get("chunksize", 100000)
+        start = time.perf_counter()
+
+        rates = null_rates(input_path, chunksize)
+        cols_to_drop = list(rates[rates > NULL_THRESHOLD].index) if rates is not None else []
+        if cols_to_drop:
+            logger.warning(f" Dropped corrupted columns: {cols_to_drop}")
+
+        dedupe = Deduplicator()
+        validated_writer = FrameWriter(validated_path)
+        features_writer = FrameWriter(features_path)
+        stats = {"chunks": 0, "rows_in": 0, "duplicates": 0, "rows_with_nulls": 0, "violations": {}}
+        quarantined = []
+
+        try:
+            for chunk in iter_frames(input_path, chunksize):
+                stats["chunks"] += 1
+                stats["rows_in"] += len(chunk)
+
+                unique = dedupe(chunk)
+                stats["duplicates"] += len(chunk) - len(unique)
+
+                cleaned = unique.drop(columns=cols_to_drop).dropna()
+                stats["rows_with_nulls"] += len(unique) - len(cleaned)
+
+                result = compiled_schema.validate(cleaned)
+                validated = result.valid
+                quarantined.append(result.quarantine)
+                for code, count in result.report["violations"].items():
+                    stats["violations"][code] = stats["violations"].get(code, 0) + count
+                validated_writer.write(validated)
+                features_writer.write(make_features(validated.copy()))
+        finally:
+            validated_writer.close()
+            features_writer.close()
+
+        # quarantined rows are expected to be few, they are written once at the end
+        quarantine = pd.concat(quarantined, ignore_index=True) if quarantined else pd.DataFrame()
+        write_frame(quarantine, quarantine_path, typed=False)
+
+        stats["rows_out"] = features_writer.rows
+        stats["rows_quarantined"] = len(quarantine)
+        stats["dropped_columns"] = cols_to_drop
+        stats["seconds"] = round(time.perf_counter() - start, 4)
+
+        if stats["duplicates"]:
+            logger.warning(f" Deleted {stats['duplicates']} duplicate rows.")
+        if stats["rows_with_nulls"]:
+            logger.warning(f" Dropped {stats['rows_with_nulls']} rows containing missing values.")
+        logger.info(f"streaming validation and feature engineering done: {stats}")
+
+        return stats
+
+    except Exception as e:
+        logger.error(f"streaming pipeline failed! Error: {str(e)}")
+        raise CustomException(f"streaming pipeline failed!", e)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=None)
+    parser.add_argument("--chunksize", type=int, default=None)
+    args = parser.parse_args()
+
+    print(run_streaming_pipeline(args.input, chunksize=args.chunksize))
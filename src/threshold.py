@@ -0,0 +1,158 @@
+import json
+import os
+import numpy as np
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.utils import load_config, write_json_atomic
+
+
+logger = get_logger(__name__)
+
+THRESHOLD_FILE = "threshold.json"
+OBJECTIVES = ("f1", "recall_at_precision", "cost")
+
+
+def threshold_curve(y_true, proba) -> dict:
+    """Confusion counts for every distinct threshold, in one sort and one cumulative sum.
+
+    A booking is predicted 1 (Not_Canceled) when proba >= threshold. Thresholds run from
+    the highest probability down, then one just above it where nothing is predicted 1.
+    `n{actual}{predicted}` holds the four counts per threshold.
+    """
+    y_true = np.asarray(y_true).astype(np.int64).ravel()
+    proba = np.asarray(proba, dtype=np.float64).ravel()
+    if len(y_true) != len(proba):
+        raise ValueError(f"{len(y_true)} labels but {len(proba)} probabilities")
+
+    order = np.argsort(-proba, kind="stable")
+    proba_sorted = proba[order]
+    positives = y_true[order] == 1
+
+    # last index of each run of equal probabilities: everything up to it is predicted 1
+    last = np.flatnonzero(np.diff(proba_sorted, append=-np.inf) != 0)
+    n11 = np.cumsum(positives)[last]
+    n01 = (last + 1) - n11
+
+    total_1 = int(positives.sum())
+    total_0 = len(y_true) - total_1
+    thresholds = np.concatenate([[np.nextafter(proba_sorted[0], np.inf)], proba_sorted[last]])
+    n11 = np.concatenate([[0], n11])
+    n01 = np.concatenate([[0], n01])
+    return {"threshold": thresholds, "n11": n11, "n01": n01, "n10": total_1 - n11, "n00": total_0 - n01}
+
+
+def curve_metrics(counts: dict, pos_label: int = 1, costs=None) -> dict:
+    """Precision, recall and F1 of `pos_label`, and the total cost when `costs` is given
+    as a 2x2 matrix indexed [actual][predicted]."""
+    other = 1 - pos_label
+    tp = counts[f"n{pos_label}{pos_label}"]
+    fp = counts[f"n{other}{pos_label}"]
+    fn = counts[f"n{pos_label}{other}"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 1.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    metrics = {"threshold": counts["threshold"], "precision": precision, "recall": recall, "f1": f1}
+    if costs is not None:
+        costs = np.asarray(costs, dtype=np.float64)
+        metrics["cost"] = sum(costs[i, j] * counts[f"n{i}{j}"] for i in (0, 1) for j in (0, 1))
+    return metrics
+
+
+def select_threshold(y_true, proba, objective: str = "f1", pos_label: int = 1, min_precision: float = None,
+                     costs=None, curve_points: int = 201) -> dict:
+    """The threshold that optimises `objective` over the out-of-fold probabilities.
+
+    f1: highest F1 of `pos_label`. recall_at_precision: highest recall whose precision is
+    at least `min_precision`. cost: lowest total of the [actual][predicted] cost matrix.
+    Ties go to the threshold closest to 0.5.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown threshold objective {objective!r}, expected one of {OBJECTIVES}")
+    if objective == "cost" and costs is None:
+        raise ValueError("the cost objective needs a cost matrix")
+
+    metrics = curve_metrics(threshold_curve(y_true, proba), pos_label, costs)
+    tie_break = -np.abs(metrics["threshold"] - 0.5)
+
+    if objective == "f1":
+        score = metrics["f1"]
+    elif objective == "cost":
+        score = -metrics["cost"]
+    else:
+        feasible = metrics["precision"] >= min_precision
+        if not (feasible & (metrics["recall"] > 0)).any():
+            raise ValueError(f"no threshold reaches precision {min_precision}")
+        score = np.where(feasible, metrics["recall"], -np.inf)
+
+    best = np.lexsort((tie_break, score))[-1]
+
+    # thresholds are dense where the probabilities are, keep an evenly spaced subset for the curve
+    keep = np.unique(np.linspace(0, len(metrics["threshold"]) - 1, min(curve_points, len(metrics["threshold"])))
+                     .round().astype(int))
+    return {
+        "threshold": float(metrics["threshold"][best]),
+        "objective": objective,
+        "pos_label": pos_label,
+        "min_precision": min_precision,
+        "costs": np.asarray(costs).tolist() if costs is not None else None,
+        "rows": int(len(np.asarray(y_true).ravel())),
+        "metrics": {name: float(values[best]) for name, values in metrics.items() if name != "threshold"},
+        "curve": {name: np.round(values[keep], 6).tolist() for name, values in metrics.items()}
+    }
+
+
+def decision_from_config(y_true, proba, config: dict = None) -> dict:
+    settings = (config or load_config()).get("threshold", {})
+    return select_threshold(y_true, proba,
+                            objective=settings.get("objective", "f1"),
+                            pos_label=settings.get("pos_label", 1),
+                            min_precision=settings.get("min_precision"),
+                            costs=settings.get("costs"),
+                            curve_points=settings.get("curve_points", 201))
+
+
+def read_decision(bundle_dir: str):
+    path = os.path.join(bundle_dir, THRESHOLD_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def write_decision(bundle_dir: str, decision: dict):
+    write_json_atomic(os.path.join(bundle_dir, THRESHOLD_FILE), decision)
+
+
+def load_threshold(bundle_dir: str, default: float = 0.55) -> float:
+    decision = read_decision(bundle_dir) if bundle_dir and os.path.isdir(bundle_dir) else None
+    return decision["threshold"] if decision is not None else default
+
+
+def write_report(decision: dict, path: str):
+    # the chosen point without the curve, small enough for dvc metrics
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump({key: value for key, value in decision.items() if key != "curve"}, file, indent=2)
+
+
+if __name__ == "__main__":
+    # re-select the threshold of the current bundle, e.g. after changing the objective
+    from src.storage import read_frame, data_path
+
+    try:
+        config = load_config()
+        y = read_frame(data_path("y")).values.ravel()
+        y_proba = read_frame(data_path("y_proba"))["proba_1"].to_numpy()
+        bundle_dir = config.get("api", {}).get("registry", {}).get("model_path", "models/serving_bundle")
+
+        decision = decision_from_config(y, y_proba, config)
+        write_decision(bundle_dir, decision)
+        write_report(decision, config.get("threshold", {}).get("report", "reports/threshold.json"))
+        logger.info(f"threshold {decision['threshold']:.4f} ({decision['objective']}): {decision['metrics']}")
+
+    except Exception as e:
+        logger.error(f"threshold selection failed! Error: {str(e)}")
+        raise CustomException("threshold selection failed!", e)
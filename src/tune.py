@@ -0,0 +1,191 @@
+import math
+import os
+import time
+import numpy as np
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.base import clone
+from sklearn.metrics import f1_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from xgboost import XGBClassifier
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.utils import load_config
+from src.preprocessing import preprocessor
+from src.storage import read_frame, data_path
+from src.fast_smote import smote_from_config
+
+
+logger = get_logger(__name__)
+
+METRICS = {
+    "f1": lambda y, proba: f1_score(y, (proba >= 0.5).astype(int)),
+    "roc_auc": roc_auc_score
+}
+
+# fold matrices shared with the worker processes, set once per worker by the initializer
+_FOLDS = None
+
+
+def _init_worker(folds):
+    global _FOLDS
+    _FOLDS = folds
+
+
+def prepare_folds(x, y, pre_pipeline, n_splits: int, random_state: int, with_smote: bool, config: dict = None) -> list:
+    """Preprocess (and optionally SMOTE-resample) every fold once; trials only fit the booster."""
+    config = config or load_config()
+    folds = []
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for train_idx, val_idx in cv.split(x, y):
+        pre = clone(pre_pipeline).fit(x.iloc[train_idx], y[train_idx])
+        x_train, y_train = pre.transform(x.iloc[train_idx]), y[train_idx]
+        x_val, y_val = pre.transform(x.iloc[val_idx]), y[val_idx]
+        if with_smote:
+            x_train, y_train = smote_from_config(config, random_state).fit_resample(x_train, y_train)
+        folds.append((x_train.astype(np.float32), y_train, x_val.astype(np.float32), y_val))
+    return folds
+
+
+def evaluate_trial(trial: dict) -> dict:
+    start = time.perf_counter()
+    scores, best_iterations = [], []
+    metric = METRICS[trial["metric"]]
+
+    for x_train, y_train, x_val, y_val in _FOLDS[trial["with_smote"]]:
+        model = XGBClassifier(**trial["params"],
+                              n_estimators=trial["n_estimators"],
+                              early_stopping_rounds=trial["early_stopping_rounds"],
+                              n_jobs=trial["threads"])
+        model.fit(x_train, y_train, eval_set=[(x_val, y_val)], verbose=False)
+        scores.append(metric(y_val, model.predict_proba(x_val)[:, 1]))
+        best_iterations.append(model.best_iteration)
+
+    return {
+        **trial,
+        "score": float(np.mean(scores)),
+        "score_std": float(np.std(scores)),
+        "best_iteration": int(np.median(best_iterations)),
+        "seconds": time.perf_counter() - start
+    }
+
+
+def sample_candidates(search_space: dict, smote_options: list, n_candidates: int, random_state: int) -> list:
+    rng = np.random.default_rng(random_state)
+    candidates, seen = [], set()
+    # every distinct combination is sampled at most once
+    max_unique = math.prod(len(v) for v in search_space.values()) * len(smote_options)
+    while len(candidates) < min(n_candidates, max_unique):
+        params = {name: values[rng.integers(len(values))] for name, values in search_space.items()}
+        with_smote = bool(smote_options[rng.integers(len(smote_options))])
+        key = (tuple(sorted(params.items())), with_smote)
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append({"params": params, "with_smote": with_smote})
+    return candidates
+
+
+def successive_halving(x, y, pre_pipeline, tuning: dict, log_to_mlflow: bool = True) -> dict:
+    try:
+        n_jobs = tuning.get("n_jobs", -1)
+        n_jobs = os.cpu_count() if n_jobs in (-1, None) else n_jobs
+        threads = max(1, tuning.get("threads_per_trial", 1))
+        # trials x xgboost threads never exceeds the core budget
+        workers = max(1, n_jobs // threads)
+        eta = tuning.get("eta", 3)
+        resource = tuning.get("min_resource", 50)
+        max_resource = tuning.get("max_resource", 800)
+        smote_options = tuning.get("smote", [False])
+        random_state = tuning.get("random_state", 42)
+
+        candidates = sample_candidates(tuning["search_space"], smote_options,
+                                       tuning.get("n_candidates", 27), random_state)
+        logger.info(f"tuning {len(candidates)} candidates on {workers} workers x {threads} threads")
+
+        folds = {with_smote: prepare_folds(x, y, pre_pipeline, tuning.get("cv_folds", 3), random_state, with_smote)
+                 for with_smote in {c["with_smote"] for c in candidates}}
+
+        history = []
+        rung = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(folds,)) as pool:
+            while True:
+                trials = [{**c,
+                           "rung": rung,
+                           "n_estimators": resource,
+                           "early_stopping_rounds": tuning.get("early_stopping_rounds", 30),
+                           "metric": tuning.get("metric", "f1"),
+                           "threads": threads} for c in candidates]
+                results = sorted(pool.map(evaluate_trial, trials), key=lambda r: r["score"], reverse=True)
+                history.extend(results)
+                logger.info(f"rung {rung}: {len(results)} trials at {resource} rounds, best {results[0]['score']:.4f}")
+
+                if len(results) <= 1 or resource >= max_resource:
+                    break
+                candidates = [{"params": r["params"], "with_smote": r["with_smote"]}
+                              for r in results[:max(1, math.ceil(len(results) / eta))]]
+                resource = min(resource * eta, max_resource)
+                rung += 1
+
+        best = results[0]
+        if log_to_mlflow:
+            log_trials(history, best)
+
+        return {"best": best, "history": history}
+
+    except Exception as e:
+        logger.error(f"hyperparameter tuning failed! Error: {str(e)}")
+        raise CustomException(f"hyperparameter tuning failed!", e)
+
+
+def log_trials(history: list, best: dict):
+    import mlflow
+
+    mlflow.set_experiment("hotel_reservation")
+    with mlflow.start_run(run_name="tune"):
+        for i, trial in enumerate(history):
+            with mlflow.start_run(run_name=f"trial_{i}", nested=True):
+                mlflow.log_params({**trial["params"],
+                                   "with_smote": trial["with_smote"],
+                                   "rung": trial["rung"],
+                                   "n_estimators": trial["n_estimators"]})
+                mlflow.log_metrics({"score": trial["score"],
+                                    "score_std": trial["score_std"],
+                                    "best_iteration": trial["best_iteration"],
+                                    "trial_seconds": trial["seconds"]})
+        mlflow.log_params({f"best_{k}": v for k, v in best["params"].items()})
+        mlflow.log_metric("best_score", best["score"])
+
+
+def best_params_for_training(best: dict, xgb_params: dict) -> dict:
+    params = {**xgb_params, **best["params"]}
+    # early stopping picked the useful number of rounds on the validation folds
+    params["n_estimators"] = best["best_iteration"] + 1
+    return {"xgb_params": params, "with_smote": best["with_smote"], "score": best["score"]}
+
+
+def load_best_params(config: dict):
+    tuning = config.get("tuning", {})
+    path = tuning.get("output", "config/best_params.yaml")
+    if not tuning.get("use_best_params", False) or not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        return yaml.safe_load(file)
+
+
+if __name__ == "__main__":
+
+    x = read_frame(data_path("x"))
+    y = read_frame(data_path("y")).values.ravel()
+
+    config = load_config()
+    pre_pipeline = preprocessor(config)
+
+    result = successive_halving(x, y, pre_pipeline, config["tuning"])
+    best = best_params_for_training(result["best"], config["xgb_params"])
+
+    output = config["tuning"].get("output", "config/best_params.yaml")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as file:
+        yaml.safe_dump(best, file, sort_keys=False)
+    logger.info(f"best params saved in {output}: {best}")
@@ -1,8 +1,47 @@
+import json
 import yaml 
 import os
+import hashlib
 
 def load_config(file_path:str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "config.yaml")):
     with open(file_path, "r") as file :
         config = yaml.safe_load(file)
 
     return config
+
+
+def file_digest(file_path: str, length: int = 12) -> str:
+    # directories (e.g. serving bundles) are hashed file by file in name order
+    if os.path.isdir(file_path):
+        paths = [os.path.join(file_path, name) for name in sorted(os.listdir(file_path))]
+    else:
+        paths = [file_path]
+
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+
+    return digest.hexdigest()[:length]
+
+
+def current_rss() -> int:
+    # resident set size in bytes, read from /proc so it works without psutil
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def take_rows(data, idx):
+    # positional rows of a DataFrame/Series or an array, as CV folds index them
+    return data.iloc[idx] if hasattr(data, "iloc") else data[idx]
+
+
+def write_json_atomic(path: str, obj):
+    # write then rename, a reader (e.g. the registry's bundle watcher) never sees a half-written file
+    with open(path + ".tmp", "w") as file:
+        json.dump(obj, file)
+    os.replace(path + ".tmp", path)
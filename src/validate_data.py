@@ -1,37 +1,32 @@
 from src.logger import get_logger
 from src.custom_exception import CustomException
+import json
+import os
 import pandas as pd
-import pandera as pa
 from pandera import Column, Check, DataFrameSchema
+from src.storage import read_frame, write_frame, data_path
+from src.validation_engine import CompiledSchema
+from src.schemas.hotel_schema import HOTEL_COLUMNS
+from src.profiling import profile_stage, write_profile_report
 
 logger = get_logger(__name__)
 
+def pandera_check(check: str, args) -> Check:
+    # between takes (min, max), ge and isin a single value
+    return Check.between(*args) if check == "between" else getattr(Check, check)(args)
+
 hotel_schema = DataFrameSchema(
     columns={
-        "Booking_ID": Column(str, nullable=False),
-        "no_of_adults": Column(int, Check.between(0, 10)),
-        "no_of_children": Column(float, Check.between(0, 10), nullable=True),
-        "no_of_weekend_nights": Column(int, Check.between(0, 15)),
-        "no_of_week_nights": Column(int, Check.between(0, 30)),
-        "type_of_meal_plan": Column(str, nullable=True),
-        "required_car_parking_space": Column(int, Check.isin([0, 1])),
-        "room_type_reserved": Column(str, nullable=True),
-        "lead_time": Column(int, Check.between(0, 500)),
-        "arrival_year": Column(int, Check.between(2015, 2030)),
-        "arrival_month": Column(int, Check.between(1, 12)),
-        "arrival_date": Column(int, Check.between(1, 31)),
-        "market_segment_type": Column(str, nullable=True),
-        "repeated_guest": Column(int, Check.isin([0, 1])),
-        "no_of_previous_cancellations": Column(int, Check.ge(0)),
-        "no_of_previous_bookings_not_canceled": Column(int, Check.ge(0)),
-        "avg_price_per_room": Column(float, Check.ge(0)),
-        "no_of_special_requests": Column(int, Check.ge(0)),
-        "booking_status": Column(str, Check.isin(["Canceled", "Not_Canceled"]))
+        name: Column(dtype, [pandera_check(check, args) for check, args in checks.items()], nullable=nullable)
+        for name, (dtype, nullable, checks) in HOTEL_COLUMNS.items()
     },
     strict="filter",
     coerce=True
 )
 
+# the same checks as NumPy masks; the API compiles them from HOTEL_COLUMNS without pandera
+compiled_schema = CompiledSchema.from_schema(hotel_schema)
+
 def clean_data_on_the_fly(df: pd.DataFrame) -> pd.DataFrame:
     init_count = len(df)
     df = df.drop_duplicates()
@@ -56,25 +51,46 @@ def clean_data_on_the_fly(df: pd.DataFrame) -> pd.DataFrame:
             
     return df
 
-def run_validation_pipeline(input_path: str, output_path: str):
+def validate_with_quarantine(df: pd.DataFrame):
+    """Returns (valid rows, quarantined rows with a `reason` column, report)."""
+    df_cleaned = clean_data_on_the_fly(df)
+    logger.info(" Validating Schema...")
+    result = compiled_schema.validate(df_cleaned)
+    if result.report["rows_quarantined"]:
+        logger.warning(f" Quarantined {result.report['rows_quarantined']} rows: {result.report['violations']}")
+    logger.info(f" Validation report: {result.report}")
+    return result.valid, result.quarantine, result.report
+
+def validate_frame(df: pd.DataFrame) -> pd.DataFrame:
+    return validate_with_quarantine(df)[0]
+
+def write_report(report: dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+@profile_stage()
+def run_validation_pipeline(input_path: str, output_path: str, quarantine_path: str = None, report_path: str = None):
     try:
         logger.info(f" Loading: {input_path}")
-        df = pd.read_csv(input_path)
-        df_cleaned = clean_data_on_the_fly(df)
-        logger.info(" Validating Schema...")
-        validated_df = hotel_schema.validate(df_cleaned)
-        validated_df.to_csv(output_path, index=False)
+        df = read_frame(input_path, typed=False)
+        validated_df, quarantine, report = validate_with_quarantine(df)
+        write_frame(validated_df, output_path)
+        if quarantine_path:
+            write_frame(quarantine, quarantine_path, typed=False)
+        if report_path:
+            write_report(report, report_path)
         logger.info(f" Success! Clean data saved to: {output_path}")
         return validated_df
-    except pa.errors.SchemaError as e:
-        logger.error(f" Validation failed: {e}")
-        raise CustomException(f" Validation failed: {e}")
     except Exception as e:
         logger.error(f" Unexpected error: {e}")
         raise CustomException(f" Unexpected error: {e}")
     
 if __name__ == "__main__":
     run_validation_pipeline(
-        input_path="data/processed/hotel_data.csv", 
-        output_path="data/processed/validated_data.csv"
+        input_path=data_path("hotel_data"), 
+        output_path=data_path("validated_data"),
+        quarantine_path=data_path("quarantine"),
+        report_path=os.path.join(os.path.dirname(data_path("validated_data")), "validation_report.json")
     )
+    write_profile_report("validate_data")
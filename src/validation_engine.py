@@ -0,0 +1,195 @@
+import time
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# pandera check name -> (lower bound key, upper bound key, include_min, include_max)
+RANGE_CHECKS = {
+    "in_range": ("min_value", "max_value", None, None),
+    "greater_than_or_equal_to": ("min_value", None, True, True),
+    "greater_than": ("min_value", None, False, True),
+    "less_than_or_equal_to": (None, "max_value", True, True),
+    "less_than": (None, "max_value", True, False),
+}
+
+
+class ValidationResult:
+
+    def __init__(self, valid: pd.DataFrame, quarantine: pd.DataFrame, report: dict):
+        self.valid = valid
+        self.quarantine = quarantine
+        self.report = report
+
+
+class CompiledSchema:
+    """The column types and range/membership checks of a pandera DataFrameSchema,
+    compiled to NumPy arrays.
+
+    All range checks run as one broadcast comparison over an (n_rows, n_checks)
+    matrix. Failing rows are returned separately with `column:check` reason codes
+    instead of failing the whole frame.
+    """
+
+    def __init__(self, columns: list, ranges: list, memberships: list):
+        # columns: (name, kind, nullable) with kind int | float | str
+        self.columns = columns
+        self.ranges = ranges
+        self.memberships = memberships
+
+        self.range_columns = [name for name, *_ in ranges]
+        self.lower = np.array([r[1] for r in ranges], dtype=np.float64)
+        self.upper = np.array([r[2] for r in ranges], dtype=np.float64)
+        self.include_min = np.array([r[3] for r in ranges], dtype=bool)
+        self.include_max = np.array([r[4] for r in ranges], dtype=bool)
+        self.range_codes = [f"{name}:range" for name in self.range_columns]
+
+    @classmethod
+    def from_schema(cls, schema):
+        columns, ranges, memberships = [], [], []
+        for name, column in schema.columns.items():
+            dtype = str(column.dtype)
+            kind = "int" if dtype.startswith("int") else "float" if dtype.startswith("float") else "str"
+            columns.append((name, kind, column.nullable))
+
+            for check in column.checks:
+                stats = check.statistics
+                if check.name in RANGE_CHECKS:
+                    low_key, high_key, include_min, include_max = RANGE_CHECKS[check.name]
+                    ranges.append((name,
+                                   stats[low_key] if low_key else -np.inf,
+                                   stats[high_key] if high_key else np.inf,
+                                   stats.get("include_min", include_min),
+                                   stats.get("include_max", include_max)))
+                elif check.name == "isin":
+                    memberships.append((name, np.asarray(list(stats["allowed_values"]))))
+                else:
+                    raise ValueError(f"check {check.name} on {name} cannot be compiled")
+
+        return cls(columns, ranges, memberships)
+
+    @classmethod
+    def from_spec(cls, spec: dict):
+        """Compiles the plain-data column spec of src/schemas/hotel_schema.py, no pandera needed."""
+        columns, ranges, memberships = [], [], []
+        for name, (dtype, nullable, checks) in spec.items():
+            columns.append((name, {int: "int", float: "float"}.get(dtype, "str"), nullable))
+            for check, args in checks.items():
+                if check == "between":
+                    ranges.append((name, args[0], args[1], True, True))
+                elif check == "ge":
+                    ranges.append((name, args, np.inf, True, True))
+                elif check == "isin":
+                    memberships.append((name, np.asarray(list(args))))
+                else:
+                    raise ValueError(f"check {check} on {name} cannot be compiled")
+
+        return cls(columns, ranges, memberships)
+
+    def select(self, names) -> "CompiledSchema":
+        """The checks for a subset of columns, e.g. the fields an API request carries."""
+        names = set(names)
+        return CompiledSchema([c for c in self.columns if c[0] in names],
+                              [r for r in self.ranges if r[0] in names],
+                              [m for m in self.memberships if m[0] in names])
+
+    def _evaluate(self, df: pd.DataFrame):
+        missing = [name for name, _, _ in self.columns if name not in df.columns]
+        if missing:
+            raise ValueError(f"missing columns: {missing}")
+
+        codes, masks, numbers = [], [], {}
+        timings = {}
+        start = time.perf_counter()
+        for name, kind, nullable in self.columns:
+            values = df[name]
+            isnull = values.isna().to_numpy()
+            if not nullable:
+                codes.append(f"{name}:not_null")
+                masks.append(isnull)
+            if kind == "str":
+                continue
+
+            number = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+            bad_type = np.isnan(number) & ~isnull
+            if kind == "int":
+                bad_type |= np.isfinite(number) & (number != np.floor(number))
+            codes.append(f"{name}:dtype")
+            masks.append(bad_type)
+            numbers[name] = number
+        timings["coerce_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self.ranges:
+            matrix = np.column_stack([numbers[name] for name in self.range_columns])
+            # NaN compares False on both sides, nulls are only judged by not_null
+            below = np.where(self.include_min, matrix < self.lower, matrix <= self.lower)
+            above = np.where(self.include_max, matrix > self.upper, matrix >= self.upper)
+            codes.extend(self.range_codes)
+            masks.extend((below | above).T)
+        timings["range_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name, allowed in self.memberships:
+            codes.append(f"{name}:isin")
+            values = df[name]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # judge each category once and look the answer up through the codes
+                allowed_categories = np.isin(np.asarray(values.cat.categories, dtype=object), allowed)
+                category_codes = values.cat.codes.to_numpy()
+                masks.append(~allowed_categories[category_codes] & (category_codes >= 0))
+            else:
+                values = numbers.get(name, values.to_numpy())
+                masks.append(~np.isin(values, allowed) & ~pd.isna(values))
+        timings["isin_seconds"] = time.perf_counter() - start
+
+        failures = np.column_stack(masks) if masks else np.zeros((len(df), 0), dtype=bool)
+        return np.asarray(codes), failures, timings
+
+    def reasons(self, df: pd.DataFrame) -> list:
+        """One `;`-joined reason string per row, None for rows that pass."""
+        codes, failures, _ = self._evaluate(df)
+        return [";".join(codes[row]) if row.any() else None for row in failures]
+
+    def record_reasons(self, record: dict):
+        """`reasons` for a single already type-checked record, without building a DataFrame."""
+        row = np.array([record[name] for name in self.range_columns], dtype=np.float64)
+        below = np.where(self.include_min, row < self.lower, row <= self.lower)
+        above = np.where(self.include_max, row > self.upper, row >= self.upper)
+        codes = [code for code, bad in zip(self.range_codes, below | above) if bad]
+        codes.extend(f"{name}:isin" for name, allowed in self.memberships if record[name] not in allowed)
+        return ";".join(codes) or None
+
+    def validate(self, df: pd.DataFrame) -> ValidationResult:
+        start = time.perf_counter()
+        codes, failures, timings = self._evaluate(df)
+        bad = failures.any(axis=1)
+
+        valid = df.loc[~bad, [name for name, _, _ in self.columns]].copy()
+        for name, kind, nullable in self.columns:
+            values = valid[name]
+            if kind in ("int", "float"):
+                dtype = "int64" if kind == "int" else "float64"
+                if values.dtype != dtype:
+                    valid[name] = pd.to_numeric(values).astype(dtype)
+            elif isinstance(values.dtype, pd.CategoricalDtype):
+                labels = np.append(np.asarray(values.cat.categories.astype(str), dtype=object), np.nan)
+                valid[name] = labels[values.cat.codes.to_numpy()]
+            elif values.dtype != object or not values.map(type).eq(str).all():
+                valid[name] = values.astype(str).where(values.notna(), np.nan)
+
+        quarantine = df.loc[bad].copy()
+        quarantine["reason"] = [";".join(codes[row]) for row in failures[bad]]
+
+        counts = failures.sum(axis=0)
+        report = {
+            "rows_in": len(df),
+            "rows_valid": len(valid),
+            "rows_quarantined": int(bad.sum()),
+            "violations": {code: int(count) for code, count in zip(codes, counts) if count},
+            **{key: round(value, 4) for key, value in timings.items()},
+            "seconds": round(time.perf_counter() - start, 4)
+        }
+        return ValidationResult(valid, quarantine, report)
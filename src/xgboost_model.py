@@ -3,34 +3,47 @@ from src.logger import get_logger
 from src.custom_exception import CustomException
 import joblib
 import mlflow
-from sklearn.metrics import make_scorer,f1_score,accuracy_score,precision_score,recall_score,confusion_matrix
-from sklearn.model_selection import cross_validate,cross_val_predict,StratifiedKFold
-from imblearn.over_sampling import SMOTE
-from src.utils import load_config
+from sklearn.metrics import f1_score,accuracy_score,precision_score,recall_score
+from src.utils import load_config, file_digest
 from imblearn.pipeline import Pipeline
 import os
-import pandas as pd
 from src.preprocessing import preprocessor
 from src.evaluation import evaluate
+from src.cv_engine import cross_validate_once, cv
+from src.storage import read_frame, data_path
+from src.tune import load_best_params
+from src.api.inference import CompiledPipeline
+from src.fold_cache import FoldCache
+from src.fast_smote import smote_from_config
+from src.incremental import append_lineage
+from src.profiling import profile_stage, write_profile_report
+from src.threshold import decision_from_config, write_report
+from src.drift import build_reference
 
 
 logger = get_logger(__name__)
 
 
 scoring = {
-            "F1" : make_scorer(f1_score),
-            "Accuracy" : make_scorer(accuracy_score),
-            "Recall" : make_scorer(recall_score),
-            "Precision" : make_scorer(precision_score)
+            "F1" : f1_score,
+            "Accuracy" : accuracy_score,
+            "Recall" : recall_score,
+            "Precision" : precision_score
         }
 
 config = load_config()
 
 xgb_params = config["xgb_params"]
 
+# parameters chosen by the tune stage take precedence over the pinned defaults
+best_params = load_best_params(config)
+if best_params is not None:
+    xgb_params = best_params["xgb_params"]
+
 model = XGBClassifier(**xgb_params)
 
 
+@profile_stage()
 def xgb_model(x, y, pre_pipeline, with_smote:bool = False):
     
     try:
@@ -42,7 +55,7 @@ def xgb_model(x, y, pre_pipeline, with_smote:bool = False):
             if with_smote:
                 pipe_line = Pipeline([
                                     ("pre_pipeline", pre_pipeline),
-                                    ("smote", SMOTE()),
+                                    ("smote", smote_from_config(config, random_state=42)),
                                     ("model", model)
                                     ])
                 
@@ -54,14 +67,15 @@ def xgb_model(x, y, pre_pipeline, with_smote:bool = False):
             
 
 
-            result = cross_validate(pipe_line,
-                                    x,
-                                    y
-                                    ,scoring=scoring,
-                                    cv=StratifiedKFold(n_splits=5, shuffle=True, random_state=42),
-                                    n_jobs=-1,
-                                    return_train_score=True
-                                    )
+            # one fit per fold gives the CV scores and the out-of-fold predictions used by evaluate
+            result = cross_validate_once(pipe_line,
+                                         x,
+                                         y,
+                                         metrics=scoring,
+                                         cv=cv,
+                                         n_jobs=-1,
+                                         fold_cache=FoldCache.from_config(config)
+                                         )
 
 
             
@@ -77,6 +91,27 @@ def xgb_model(x, y, pre_pipeline, with_smote:bool = False):
             os.makedirs("models", exist_ok=True)
             joblib.dump(pipe_line, "models/xgb_model.pkl")
 
+            # decision threshold from the out-of-fold probabilities, shipped inside the bundle
+            decision = decision_from_config(y, result["oof_proba"][:, 1], config)
+            write_report(decision, config.get("threshold", {}).get("report", "reports/threshold.json"))
+
+            # compact serving bundle: native booster + preprocessing arrays + threshold + drift reference
+            compiled = CompiledPipeline.from_pipeline(pipe_line)
+            compiled.decision = decision
+            # what the API's drift monitor compares live traffic with
+            compiled.reference = build_reference(x, compiled.num_cols, [col for col, _, _ in compiled.ohe],
+                                                 config.get("drift", {}).get("bins", 20))
+            compiled.save("models/serving_bundle")
+
+            # incremental updates chain their MLflow runs from here
+            append_lineage(config.get("incremental", {}).get("lineage", "models/lineage.json"), {
+                "mode": "full",
+                "run_id": run_id,
+                "model_digest": file_digest("models/xgb_model.pkl"),
+                "rows": len(x),
+                "total_rounds": pipe_line.steps[-1][1].get_booster().num_boosted_rounds()
+            })
+
             logger.info("model trained successfully!")
             logger.info("model saved in models/")
 
@@ -99,7 +134,9 @@ def xgb_model(x, y, pre_pipeline, with_smote:bool = False):
                         'Test_Precision': result['test_Precision'].mean().round(3),
                         'Train_Accuracy': result['train_Accuracy'].mean().round(3),
                         'Test_Accuracy': result['test_Accuracy'].mean().round(3),
-                        'Fit_Time': result['fit_time'].sum().round(2)
+                        'Fit_Time': result['fit_time'].sum().round(2),
+                        'Fold_Cache_Hits': int(result['cache_hit'].sum()),
+                        'Fold_Cache_Seconds_Saved': result['cache_seconds_saved'].sum().round(2)
                     }
 
 
@@ -117,10 +154,18 @@ def xgb_model(x, y, pre_pipeline, with_smote:bool = False):
                     'test_precision': model_results['Test_Precision'],
                     'train_accuracy': model_results['Train_Accuracy'],
                     'test_accuracy': model_results['Test_Accuracy'],
-                    'total_fit_time': model_results['Fit_Time']
+                    'total_fit_time': model_results['Fit_Time'],
+                    'fold_cache_hits': model_results['Fold_Cache_Hits'],
+                    'fold_cache_seconds_saved': model_results['Fold_Cache_Seconds_Saved']
                 })
+
+            logger.info(f"decision threshold {decision['threshold']:.4f} ({decision['objective']}): {decision['metrics']}")
+            mlflow.log_param("threshold_objective", decision["objective"])
+            mlflow.log_metrics({"threshold": decision["threshold"],
+                                **{f"threshold_{name}": value for name, value in decision["metrics"].items()}})
+            mlflow.log_dict(decision, "threshold.json")
             
-            y_pred, y_proba = evaluate(x, y, pipe_line, run_id)
+            y_pred, y_proba = evaluate(x, y, pipe_line, run_id, cv_result=result)
 
     except Exception as e:
         logger.error("error while training model")
@@ -134,13 +179,16 @@ def xgb_model(x, y, pre_pipeline, with_smote:bool = False):
 if __name__ == "__main__":
 
     # load splited data
-    x = pd.read_csv("data/processed/x.csv")
-    y = pd.read_csv("data/processed/y.csv").values.ravel()
+    x = read_frame(data_path("x"))
+    y = read_frame(data_path("y")).values.ravel()
 
     # preprocessing pipeline
     config = load_config()
     pre_pipeline = preprocessor(config)
 
     # train the model
-    xgb_model(x, y, pre_pipeline)
+    xgb_model(x, y, pre_pipeline, with_smote=bool(best_params and best_params.get("with_smote")))
     logger.info("training model done!")
+
+    # preprocessor, xgb_model and evaluate, logged to the training run as well
+    write_profile_report("train")
@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBClassifier
+from imblearn.pipeline import Pipeline
+from src.preprocessing import preprocessor
+from src.utils import load_config
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-token"}
+
+def make_bookings(n: int = 400, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "no_of_adults": rng.integers(1, 4, n),
+        "no_of_children": rng.choice([0, 0, 1, 2], n),
+        "no_of_weekend_nights": rng.integers(0, 3, n),
+        "no_of_week_nights": rng.integers(0, 6, n),
+        "type_of_meal_plan": rng.choice(["Meal Plan 1", "Meal Plan 2", "Not Selected"], n),
+        "required_car_parking_space": rng.choice([0, 1], n),
+        "room_type_reserved": rng.choice(["Room_Type 1", "Room_Type 2", "Room_Type 4"], n),
+        "lead_time": rng.integers(0, 300, n),
+        "arrival_year": rng.choice([2017, 2018], n),
+        "arrival_month": rng.integers(1, 13, n),
+        "arrival_date": rng.integers(1, 29, n),
+        "market_segment_type": rng.choice(["Online", "Offline", "Corporate"], n),
+        "repeated_guest": rng.choice([0, 1], n),
+        "no_of_previous_cancellations": rng.choice([0, 1], n),
+        "no_of_previous_bookings_not_canceled": rng.choice([0, 2], n),
+        "avg_price_per_room": np.round(rng.uniform(40, 200, n), 2),
+        "no_of_special_requests": rng.integers(0, 3, n),
+    })
+    df["total_guests"] = df["no_of_adults"] + df["no_of_children"]
+    df["total_nights"] = (df["no_of_weekend_nights"] + df["no_of_week_nights"]).clip(lower=1)
+    df["price_per_night"] = df["avg_price_per_room"] / df["total_nights"]
+    df["is_weekend_only"] = (df["total_nights"] == df["no_of_weekend_nights"]).astype(int)
+    return df
+
+
+def make_target(x: pd.DataFrame, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    logit = 0.01 * x["lead_time"] - 0.8 * x["no_of_special_requests"] - 1 + rng.normal(0, 1, len(x))
+    return (logit < 0).astype(int).to_numpy()
+
+
+@pytest.fixture(scope="session")
+def bookings():
+    x = make_bookings()
+    return x, make_target(x)
+
+
+def fit_pipeline(x, y, workdir: str):
+    config = load_config()
+    with pytest.MonkeyPatch.context() as mp:
+        # preprocessor() also writes models/prepipeline.pkl, keep it out of the repo's models/
+        mp.chdir(workdir)
+        pre_pipeline = preprocessor(config)
+    pipe_line = Pipeline([
+        ("pre_pipeline", pre_pipeline),
+        ("model", XGBClassifier(n_estimators=30, max_depth=4, random_state=0))
+    ])
+    return pipe_line.fit(x, y)
+
+
+@pytest.fixture(scope="session")
+def fitted_pipeline(bookings, tmp_path_factory):
+    x, y = bookings
+    return fit_pipeline(x, y, str(tmp_path_factory.mktemp("models")))
+
+
+def pytest_configure(config):
+    # src.api.app loads its model at import, during collection: point it (and serve's
+    # worker processes) at a bundle built from synthetic bookings instead of models/
+    from src.api.inference import CompiledPipeline
+    from src.drift import build_reference
+    from src.threshold import select_threshold
+
+    workdir = tempfile.mkdtemp(prefix="hotel-tests-")
+    x = make_bookings()
+    y = make_target(x)
+    pipe_line = fit_pipeline(x, y, workdir)
+    compiled = CompiledPipeline.from_pipeline(pipe_line)
+    compiled.decision = select_threshold(y, pipe_line.predict_proba(x)[:, 1], "f1")
+    compiled.reference = build_reference(x, compiled.num_cols, [col for col, _, _ in compiled.ohe])
+    compiled.save(os.path.join(workdir, "serving_bundle"))
+
+    config.serving_workdir = workdir
+    os.environ["SERVING_MODEL_PATH"] = os.path.join(workdir, "serving_bundle")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(getattr(config, "serving_workdir", ""), ignore_errors=True)
+
+
+@pytest.fixture
+def admin_api(monkeypatch):
+    # the API module with /admin/* switched on, requests send ADMIN_HEADERS
+    from src.api import app as api
+    monkeypatch.setattr(api, "admin_enabled", True)
+    monkeypatch.setattr(api, "admin_token", ADMIN_HEADERS["X-Admin-Token"])
+    return api
+
+
+@pytest.fixture
+def api_registry(monkeypatch):
+    # a fresh registry behind the API module, versions staged by a test never reach the next one
+    from src.api import app as api
+    from src.api.registry import ModelRegistry
+    registry = ModelRegistry(max_versions=api.registry.max_versions, fast_path=api.registry.fast_path,
+                             default_threshold=api.registry.default_threshold, engine=api.registry.engine,
+                             trees_max_rows=api.registry.trees_max_rows)
+    registry.load(api.model_path)
+    monkeypatch.setattr(api, "registry", registry)
+    return registry
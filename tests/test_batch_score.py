@@ -0,0 +1,103 @@
+import os
+import joblib
+import numpy as np
+import pytest
+from src.batch_score import batch_score, read_scores
+from src.custom_exception import CustomException
+from src.features import BASE_COLUMNS, DERIVED_COLUMNS
+from src.threshold import write_decision
+from tests.conftest import make_bookings
+
+CONFIG = {"batch_score": {"threshold": 0.55, "format": "parquet"}}
+
+
+def write_inputs(tmp_path, fitted_pipeline):
+    model_path = str(tmp_path / "model.pkl")
+    joblib.dump(fitted_pipeline, model_path)
+
+    raw = make_bookings(250, seed=5).drop(columns=DERIVED_COLUMNS)
+    raw.insert(0, "Booking_ID", [f"INN{i:05d}" for i in range(len(raw))])
+    raw.loc[7, "room_type_reserved"] = "Room_Type 99"
+    csv_path = str(tmp_path / "bookings.csv")
+    raw.to_csv(csv_path, index=False)
+    return model_path, csv_path, raw
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_scores_in_input_order(tmp_path, fitted_pipeline, workers):
+    model_path, csv_path, raw = write_inputs(tmp_path, fitted_pipeline)
+    output = str(tmp_path / "scores")
+
+    stats = batch_score(csv_path, output, model_path, chunksize=60, workers=workers, config=CONFIG)
+    scores = read_scores(output)
+
+    assert stats["rows"] == len(raw) and stats["chunks"] == 5 and stats["errors"] == 1
+    assert list(scores["Booking_ID"]) == list(raw["Booking_ID"])
+    assert scores.loc[7, "error"] == "unknown category in room_type_reserved"
+    assert scores.loc[7, "prediction_code"] == -1
+
+    expected = fitted_pipeline.predict_proba(
+        make_bookings(250, seed=5).drop(index=7))[:, 1]
+    scored = scores.drop(index=7)
+    np.testing.assert_allclose(scored["probability"], expected, atol=1e-6)
+    np.testing.assert_array_equal(scored["prediction_code"], (scored["probability"] >= 0.55).astype(int))
+
+
+def test_resume_skips_finished_parts(tmp_path, fitted_pipeline):
+    model_path, csv_path, _ = write_inputs(tmp_path, fitted_pipeline)
+    output = str(tmp_path / "scores")
+
+    batch_score(csv_path, output, model_path, chunksize=60, workers=1, config=CONFIG)
+    expected = read_scores(output)
+    os.remove(os.path.join(output, "part-00003.parquet"))
+
+    stats = batch_score(csv_path, output, model_path, chunksize=60, workers=1, resume=True, config=CONFIG)
+    assert stats["chunks"] == 1 and stats["chunks_skipped"] == 4
+    assert read_scores(output).equals(expected)
+
+
+def test_ndjson_request_payloads(tmp_path, fitted_pipeline):
+    model_path, _, _ = write_inputs(tmp_path, fitted_pipeline)
+    bookings = make_bookings(40, seed=6)
+    ndjson_path = str(tmp_path / "requests.jsonl")
+    bookings[BASE_COLUMNS + [c for c in bookings.columns if c not in BASE_COLUMNS + DERIVED_COLUMNS]].to_json(
+        ndjson_path, orient="records", lines=True)
+
+    batch_score(ndjson_path, str(tmp_path / "scores"), model_path, chunksize=16, workers=1, config=CONFIG)
+
+    np.testing.assert_allclose(read_scores(str(tmp_path / "scores"))["probability"],
+                               fitted_pipeline.predict_proba(bookings)[:, 1], atol=1e-6)
+
+
+def test_tree_engine_scores_like_xgboost(tmp_path, fitted_pipeline):
+    model_path, csv_path, _ = write_inputs(tmp_path, fitted_pipeline)
+
+    batch_score(csv_path, str(tmp_path / "xgb"), model_path, chunksize=100, workers=1, config=CONFIG)
+    batch_score(csv_path, str(tmp_path / "trees"), model_path, chunksize=100, workers=1, config=CONFIG,
+                engine="trees")
+
+    expected, scores = read_scores(str(tmp_path / "xgb")), read_scores(str(tmp_path / "trees"))
+    np.testing.assert_allclose(scores["probability"], expected["probability"], atol=1e-6)
+    assert list(scores["error"].isna()) == list(expected["error"].isna())
+
+
+def test_bundle_threshold_only_for_the_configured_model(tmp_path, fitted_pipeline):
+    model_path, csv_path, _ = write_inputs(tmp_path, fitted_pipeline)
+    bundle_dir = tmp_path / "bundle"
+    bundle_dir.mkdir()
+    write_decision(str(bundle_dir), {"threshold": 0.3})
+    config = {"batch_score": {"model": model_path, "bundle": str(bundle_dir)}}
+
+    batch_score(csv_path, str(tmp_path / "bundled"), chunksize=100, workers=1, config=config)
+    scores = read_scores(str(tmp_path / "bundled")).drop(index=7)
+    np.testing.assert_array_equal(scores["prediction_code"], (scores["probability"] >= 0.3).astype(int))
+
+    other_path = str(tmp_path / "other.pkl")
+    joblib.dump(fitted_pipeline, other_path)
+    with pytest.raises(CustomException):
+        batch_score(csv_path, str(tmp_path / "other"), other_path, workers=1, config=config)
+
+    batch_score(csv_path, str(tmp_path / "other"), other_path, chunksize=100, workers=1, config=config,
+                threshold=0.7)
+    scores = read_scores(str(tmp_path / "other")).drop(index=7)
+    np.testing.assert_array_equal(scores["prediction_code"], (scores["probability"] >= 0.7).astype(int))
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from src.api.batcher import MicroBatcher
+
+
+def double(records):
+    if any(r < 0 for r in records):
+        raise ValueError("negative input")
+    return [r * 2 for r in records]
+
+
+def test_concurrent_requests_are_coalesced():
+    batcher = MicroBatcher(double, max_batch_size=64, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(run()) == [i * 2 for i in range(10)]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["rows"] == 10
+    assert stats["batch_size_histogram"]["le_16"] == 1
+
+
+def test_batches_are_capped_at_max_batch_size():
+    batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(run()) == [i * 2 for i in range(10)]
+    stats = batcher.stats()
+    assert stats["batches"] == 3
+    assert stats["flush_reasons"] == {"size": 2, "timeout": 1, "idle": 0}
+
+
+def test_failing_row_only_fails_its_own_request():
+    batcher = MicroBatcher(double, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in [1, -1, 3]), return_exceptions=True)
+
+    first, second, third = asyncio.run(run())
+    assert (first, third) == (2, 6)
+    assert isinstance(second, ValueError)
+
+
+def test_workers_score_batches_concurrently():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def slow_double(records):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return [r * 2 for r in records]
+
+    batcher = MicroBatcher(slow_double, max_batch_size=2, max_wait_ms=1, workers=3)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(12)))
+
+    assert asyncio.run(run()) == [i * 2 for i in range(12)]
+    assert peak[0] == 3
+    assert batcher.stats()["batches"] == 6
+
+
+def test_lone_request_does_not_wait_for_a_batch():
+    batcher = MicroBatcher(double, max_batch_size=64, max_wait_ms=500)
+
+    async def run():
+        start = time.perf_counter()
+        result = await batcher.submit(21)
+        return result, time.perf_counter() - start
+
+    result, seconds = asyncio.run(run())
+    assert result == 42
+    assert seconds < 0.25
+    assert batcher.stats()["flush_reasons"]["idle"] == 1
@@ -0,0 +1,84 @@
+from src.api.cache import CacheBackend, InMemoryTTLCache, PredictionCache
+
+
+class DictBackend(CacheBackend):
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def clear(self):
+        self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    backend = InMemoryTTLCache(max_size=2, ttl_seconds=0)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+    assert backend.get("c") == 3
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    backend = InMemoryTTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    backend.set("a", 1)
+
+    clock.now = 4
+    assert backend.get("a") == 1
+    clock.now = 6
+    assert backend.get("a") is None
+
+
+def test_key_is_canonical_and_versioned():
+    cache = PredictionCache(DictBackend(), model_version="v1")
+    key = cache.key({"lead_time": 10, "no_of_adults": 2})
+
+    assert key == cache.key({"no_of_adults": 2, "lead_time": 10})
+
+    cache.set(key, 0.7)
+    assert cache.get(key) == 0.7
+
+    cache.invalidate("v2")
+    assert cache.get(key) is None
+    assert cache.key({"lead_time": 10, "no_of_adults": 2}) != key
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_predict_endpoint_uses_cache(monkeypatch):
+    from fastapi.testclient import TestClient
+    from src.api import app as api
+
+    monkeypatch.setattr(api, "cache", PredictionCache(DictBackend(), api.registry.active.version))
+    client = TestClient(api.app)
+    booking = {**api.HotelReservationInput.model_config["json_schema_extra"]["example"], "lead_time": 17}
+
+    first = client.post("/predict", json=booking).json()
+    second = client.post("/predict", json=booking).json()
+
+    assert first == second
+    assert client.get("/cache/stats").json()["hits"] == 1
+    assert client.post("/predict/batch", json=[booking]).json()["results"][0]["probability"] == first["probability"]
+    assert api.cache.hits == 2
@@ -0,0 +1,22 @@
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import f1_score, make_scorer
+from sklearn.model_selection import cross_validate, cross_val_predict
+from src.cv_engine import cross_validate_once, cv
+
+
+def test_single_pass_matches_sklearn_cross_validation(bookings, fitted_pipeline):
+    x, y = bookings
+    pipe_line = clone(fitted_pipeline)
+
+    result = cross_validate_once(pipe_line, x, y, metrics={"F1": f1_score}, n_jobs=1)
+
+    expected = cross_validate(pipe_line, x, y, scoring={"F1": make_scorer(f1_score)}, cv=cv,
+                              return_train_score=True)
+    np.testing.assert_allclose(result["test_F1"], expected["test_F1"])
+    np.testing.assert_allclose(result["train_F1"], expected["train_F1"])
+
+    np.testing.assert_array_equal(result["oof_pred"], cross_val_predict(pipe_line, x, y, cv=cv))
+    np.testing.assert_allclose(result["oof_proba"],
+                               cross_val_predict(pipe_line, x, y, cv=cv, method="predict_proba"))
+    assert len(result["fit_time"]) == cv.get_n_splits()
@@ -0,0 +1,101 @@
+import json
+import os
+from src.api.inference import CompiledPipeline
+from src.api.monitor import DriftMonitor
+from src.drift import FeatureSummary, build_reference, drift_scores, read_reference
+from src.features import DERIVED_COLUMNS
+from tests.conftest import make_bookings
+
+NUM_COLS = ["lead_time", "avg_price_per_room", "price_per_night", "no_of_adults"]
+CAT_COLS = ["market_segment_type", "room_type_reserved"]
+
+
+def payloads(n: int, seed: int, price_factor: float = 1.0) -> list:
+    x = make_bookings(n, seed=seed).drop(columns=DERIVED_COLUMNS)
+    x["avg_price_per_room"] = x["avg_price_per_room"] * price_factor
+    return x.to_dict(orient="records")
+
+
+def test_same_distribution_scores_zero():
+    x = make_bookings(2000, seed=1)
+    reference = build_reference(x, NUM_COLS, CAT_COLS, bins=10)
+    summary = FeatureSummary(reference)
+    summary.update(x.to_dict(orient="records"))
+
+    scores = drift_scores(reference, summary, min_rows=1)
+    assert scores["drifted"] == []
+    assert all(score["psi"] == 0 for score in scores["features"].values())
+    assert all(score["ks"] == 0 for score in scores["features"].values() if score["type"] == "numeric")
+
+
+def test_shift_and_unseen_categories_are_flagged():
+    reference = build_reference(make_bookings(2000, seed=1), NUM_COLS, CAT_COLS, bins=10)
+    summary = FeatureSummary(reference)
+    sizes = [len(counts) for counts in summary.numeric.values()]
+
+    for seed in range(5):
+        shifted = make_bookings(1000, seed=seed + 10)
+        shifted["price_per_night"] *= 1.5
+        shifted.loc[:99, "room_type_reserved"] = "Room_Type 7"
+        summary.update(shifted.to_dict(orient="records"))
+
+    scores = drift_scores(reference, summary, psi_alert=0.2, min_rows=500)
+    assert set(scores["drifted"]) == {"price_per_night", "room_type_reserved"}
+    assert scores["features"]["price_per_night"]["ks"] > 0.1
+    assert "lead_time" not in scores["drifted"]
+    assert scores["features"]["room_type_reserved"]["unseen"] == 500
+    # constant memory: the summaries never grow with the traffic
+    assert [len(counts) for counts in summary.numeric.values()] == sizes
+
+
+def test_monitor_drains_off_the_request_path_and_reports(tmp_path):
+    reports = []
+    monitor = DriftMonitor(queue_size=1500, report_dir=str(tmp_path), min_rows=100, on_report=reports.append)
+    monitor.observe(payloads(1, 0)[0])
+    assert monitor.stats()["observed"] == 0
+
+    monitor.set_reference(build_reference(make_bookings(2000, seed=1), NUM_COLS, CAT_COLS))
+    monitor.observe_many(payloads(2000, 2, price_factor=2.0))
+    assert monitor.window.rows == 0 and monitor.stats()["pending"] == 1500
+
+    report = monitor.report()
+    assert report["window"]["rows"] == 1500 and report["dropped"] == 500
+    assert "price_per_night" in report["window"]["drifted"]
+    assert reports == [report]
+    with open(os.path.join(tmp_path, f"drift-{report['generated_at']}-{os.getpid()}.json")) as file:
+        assert json.load(file)["window"]["drifted"] == report["window"]["drifted"]
+
+    # the window starts over, the total keeps everything since activation
+    monitor.observe_many(payloads(200, 3))
+    scores = monitor.scores()
+    assert scores["window"]["rows"] == 0 and scores["total"]["rows"] == 1500
+    monitor.drain()
+    assert monitor.scores()["window"]["rows"] == 200
+
+
+def test_bundle_reference_reaches_the_drift_endpoint(tmp_path, monkeypatch, fitted_pipeline, bookings):
+    from fastapi.testclient import TestClient
+    from src.api import app as api
+
+    x, _ = bookings
+    compiled = CompiledPipeline.from_pipeline(fitted_pipeline)
+    compiled.reference = build_reference(x, compiled.num_cols, [col for col, _, _ in compiled.ohe])
+    bundle_dir = str(tmp_path / "serving_bundle")
+    compiled.save(bundle_dir)
+    assert read_reference(bundle_dir) == compiled.reference
+
+    monitor = DriftMonitor(report_dir=str(tmp_path), min_rows=50)
+    monitor.set_reference(CompiledPipeline.load(bundle_dir).reference, "test")
+    monkeypatch.setattr(api, "drift_monitor", monitor)
+    client = TestClient(api.app)
+
+    for payload in payloads(60, 4, price_factor=1.5):
+        assert client.post("/predict", json=payload).status_code == 200
+    assert client.post("/predict/batch", json=payloads(40, 5, price_factor=1.5)).status_code == 200
+
+    scores = client.get("/drift").json()
+    assert scores["total"]["rows"] == 100
+    assert "price_per_night" in scores["total"]["drifted"]
+
+    monitor.set_reference(None)
+    assert client.get("/drift").status_code == 404
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from imblearn.over_sampling import SMOTE
+from src.fast_smote import FastSMOTE, kneighbors
+
+
+def imbalanced(n: int = 600, n_features: int = 8, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(n, n_features))
+    y = (rng.uniform(size=n) < 0.2).astype(int)
+    return x, y
+
+
+@pytest.mark.parametrize("n_features,algorithm", [(4, "kd_tree"), (30, "brute"), (30, "auto")])
+def test_matches_imblearn_for_the_same_seed(n_features, algorithm):
+    x, y = imbalanced(n_features=n_features)
+
+    expected_x, expected_y = SMOTE(random_state=42).fit_resample(x, y)
+    x_res, y_res = FastSMOTE(random_state=42, algorithm=algorithm).fit_resample(x, y)
+
+    assert x_res.dtype == np.float32
+    np.testing.assert_array_equal(y_res, expected_y)
+    np.testing.assert_allclose(x_res, expected_x, rtol=1e-5, atol=1e-5)
+
+
+def test_kd_tree_and_brute_force_agree():
+    x, _ = imbalanced(n=300, n_features=6)
+    np.testing.assert_array_equal(kneighbors(x, 5, "kd_tree"), kneighbors(x, 5, "brute"))
+
+
+@pytest.mark.parametrize("algorithm", ["kd_tree", "brute"])
+def test_duplicate_rows_never_return_self(algorithm):
+    x = np.repeat(np.arange(10, dtype=float)[:, None], 2, axis=0)
+    neighbors = kneighbors(x, 3, algorithm)
+    assert neighbors.shape == (len(x), 3)
+    assert not (neighbors == np.arange(len(x))[:, None]).any()
+    # the duplicate is the nearest neighbour
+    np.testing.assert_array_equal(neighbors[:, 0], np.arange(len(x)) ^ 1)
+
+
+def test_too_few_minority_samples():
+    x, y = np.zeros((10, 2)), np.array([0] * 7 + [1] * 3)
+    with pytest.raises(ValueError):
+        FastSMOTE(k_neighbors=5).fit_resample(x, y)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from src.api import app as api_app
+from src.feature_engineering import make_features
+from src.features import (BASE_COLUMNS, DERIVED_COLUMNS, add_features, add_features_columns, add_features_record,
+                          derive_columns)
+from tests.conftest import make_bookings
+
+
+def base_frame() -> pd.DataFrame:
+    df = make_bookings(300, seed=3)[BASE_COLUMNS].copy()
+    # zero-night stays are where the old serving formulas disagreed with training
+    df.loc[:20, ["no_of_weekend_nights", "no_of_week_nights"]] = 0
+    df.loc[21:40, "no_of_week_nights"] = 0
+    return df
+
+
+def test_frame_and_record_paths_agree():
+    df = base_frame()
+    frame = add_features(df.copy())
+    records = pd.DataFrame([add_features_record(r) for r in df.to_dict("records")])
+    assert list(records.columns) == BASE_COLUMNS + DERIVED_COLUMNS
+
+    pd.testing.assert_frame_equal(frame[DERIVED_COLUMNS], records[DERIVED_COLUMNS], check_dtype=False)
+    columns = pd.DataFrame(add_features_columns(df.to_dict("records")))
+    pd.testing.assert_frame_equal(frame[DERIVED_COLUMNS], columns[DERIVED_COLUMNS], check_dtype=False)
+
+
+def test_training_and_serving_share_the_definition():
+    df = base_frame()
+    pd.testing.assert_frame_equal(make_features(df.copy()), add_features(df.copy()))
+    assert api_app.add_features is add_features
+    assert api_app.add_features_record is add_features_record
+    assert api_app.add_features_columns is add_features_columns
+
+
+def test_derived_values():
+    derived = derive_columns({
+        "no_of_adults": np.array([2, 1]),
+        "no_of_children": np.array([1, 0]),
+        "no_of_weekend_nights": np.array([0, 2]),
+        "no_of_week_nights": np.array([0, 0]),
+        "avg_price_per_room": np.array([90.0, 100.0])
+    })
+    np.testing.assert_array_equal(derived["total_guests"], [3, 1])
+    np.testing.assert_array_equal(derived["total_nights"], [1, 2])
+    np.testing.assert_allclose(derived["price_per_night"], [90.0, 50.0])
+    np.testing.assert_array_equal(derived["is_weekend_only"], [0, 1])
@@ -0,0 +1,65 @@
+import os
+import numpy as np
+from sklearn.base import clone
+from imblearn.over_sampling import SMOTE
+from imblearn.pipeline import Pipeline
+from src.cv_engine import cross_validate_once
+from src.fold_cache import FoldCache
+
+
+def smote_pipeline(fitted_pipeline):
+    return Pipeline([
+        ("pre_pipeline", clone(fitted_pipeline.named_steps["pre_pipeline"])),
+        ("smote", SMOTE(random_state=42)),
+        ("model", clone(fitted_pipeline.named_steps["model"]))
+    ])
+
+
+def test_cached_folds_match_uncached_cv(bookings, fitted_pipeline, tmp_path):
+    x, y = bookings
+    pipe_line = smote_pipeline(fitted_pipeline)
+    fold_cache = FoldCache(str(tmp_path))
+
+    expected = cross_validate_once(pipe_line, x, y, n_jobs=1)
+    first = cross_validate_once(pipe_line, x, y, n_jobs=1, fold_cache=fold_cache)
+    second = cross_validate_once(pipe_line, x, y, n_jobs=1, fold_cache=fold_cache)
+
+    assert not first["cache_hit"].any()
+    assert second["cache_hit"].all()
+    for result in (first, second):
+        np.testing.assert_array_equal(result["oof_pred"], expected["oof_pred"])
+        np.testing.assert_allclose(result["oof_proba"], expected["oof_proba"], rtol=1e-6)
+
+
+def test_booster_params_do_not_change_the_key(bookings, fitted_pipeline, tmp_path):
+    x, y = bookings
+    pipe_line = smote_pipeline(fitted_pipeline)
+    fold_cache = FoldCache(str(tmp_path))
+
+    cross_validate_once(pipe_line, x, y, n_jobs=1, fold_cache=fold_cache)
+    pipe_line.set_params(model__max_depth=2)
+    assert cross_validate_once(pipe_line, x, y, n_jobs=1, fold_cache=fold_cache)["cache_hit"].all()
+
+    pipe_line.set_params(smote__k_neighbors=3)
+    assert not cross_validate_once(pipe_line, x, y, n_jobs=1, fold_cache=fold_cache)["cache_hit"].any()
+
+
+def test_prune_evicts_least_recently_used_folds(bookings, fitted_pipeline, tmp_path):
+    x, y = bookings
+    pipe_line = smote_pipeline(fitted_pipeline)
+    fold_cache = FoldCache(str(tmp_path))
+    cross_validate_once(pipe_line, x, y, n_jobs=1, fold_cache=fold_cache)
+
+    entries = fold_cache.entries()
+    assert len(entries) == 5
+    entry_bytes = max(size for _, size, _ in entries)
+    # last used in index order
+    for i, (path, _, _) in enumerate(entries):
+        os.utime(path, (1000 + i, 1000 + i))
+
+    fold_cache.prune(2 * entry_bytes)
+    kept = [path for path, _, _ in fold_cache.entries()]
+    assert kept == [path for path, _, _ in entries[-2:]]
+
+    fold_cache.clear()
+    assert fold_cache.entries() == []
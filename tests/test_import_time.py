@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# training-only packages that must never load in the serving process
+TRAINING_ONLY = ("mlflow", "plotly", "kaleido", "imblearn", "pandera", "dvc")
+
+# cold import of the API, model load included; generous for slow CI machines, override with the env var
+IMPORT_BUDGET_SECONDS = float(os.environ.get("API_IMPORT_BUDGET_SECONDS", 8.0))
+
+
+def import_times(module: str, cwd: str = ROOT) -> dict:
+    """Cumulative import time in seconds per module, from `python -X importtime`."""
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_api_import_stays_slim_and_within_budget():
+    times = import_times("src.api.app")
+
+    loaded = sorted({name.split(".")[0] for name in times} & set(TRAINING_ONLY))
+    assert loaded == [], f"training-only packages imported by the API: {loaded}"
+    assert times["src.api.app"] < IMPORT_BUDGET_SECONDS, \
+        f"cold import of src.api.app took {times['src.api.app']:.2f}s, budget {IMPORT_BUDGET_SECONDS}s"
+
+
+def test_importing_the_logger_creates_no_files(tmp_path):
+    import_times("src.logger", cwd=str(tmp_path))
+    assert os.listdir(tmp_path) == []
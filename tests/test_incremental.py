@@ -0,0 +1,53 @@
+import os
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from src.custom_exception import CustomException
+from src.incremental import continue_training, updates_since_full_refit, incremental_train
+from src.storage import data_path
+from tests.conftest import make_bookings, make_target
+
+
+def test_incremental_update_tracks_full_refit(fitted_pipeline):
+    x = make_bookings(n=1500, seed=1)
+    y = make_target(x, seed=1)
+    old, new, held_out = slice(0, 500), slice(500, 1000), slice(1000, 1500)
+
+    base = clone(fitted_pipeline).fit(x.iloc[old], y[old])
+    scaler_mean = base.named_steps["pre_pipeline"].named_transformers_["st_pipe"]["st_scaler"].mean_.copy()
+
+    updated = continue_training(base, x.iloc[new], y[new], rounds=20)
+    full = clone(fitted_pipeline).set_params(model__n_estimators=50).fit(x.iloc[:1000], y[:1000])
+
+    # preprocessing statistics are reused as-is, the booster keeps its first rounds
+    assert updated.named_steps["pre_pipeline"] is base.named_steps["pre_pipeline"]
+    np.testing.assert_array_equal(
+        updated.named_steps["pre_pipeline"].named_transformers_["st_pipe"]["st_scaler"].mean_, scaler_mean)
+    assert base.named_steps["model"].get_booster().num_boosted_rounds() == 30
+    assert updated.named_steps["model"].get_booster().num_boosted_rounds() == 50
+
+    auc = {name: roc_auc_score(y[held_out], model.predict_proba(x.iloc[held_out])[:, 1])
+           for name, model in {"base": base, "incremental": updated, "full": full}.items()}
+    assert auc["incremental"] >= auc["full"] - 0.03
+    assert auc["incremental"] >= auc["base"] - 0.01
+
+
+def test_updates_since_full_refit():
+    lineage = [{"mode": "full"}, {"mode": "incremental"}, {"mode": "full"},
+               {"mode": "incremental"}, {"mode": "incremental"}]
+    assert updates_since_full_refit(lineage) == 2
+    assert updates_since_full_refit([]) == 0
+
+
+def test_failed_update_keeps_the_batch_out_of_the_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    batch = make_bookings(n=50, seed=2)
+    batch["Booking_ID"] = [f"INN{i:05d}" for i in range(50)]
+    batch["booking_status"] = np.where(make_target(batch, seed=2) == 1, "Not_Canceled", "Canceled")
+    batch.to_csv("batch.csv", index=False)
+
+    with pytest.raises(CustomException):
+        incremental_train("batch.csv", model_path="missing.pkl", config={})
+    # a rerun after fixing the cause must not train on the batch twice
+    assert not os.path.exists(data_path("x_increments"))
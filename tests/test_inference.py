@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from src.api.inference import CompiledPipeline
+from src.features import DERIVED_COLUMNS, add_features_columns, add_features_record
+
+
+def test_compiled_pipeline_matches_full_pipeline(bookings, fitted_pipeline):
+    x, _ = bookings
+    compiled = CompiledPipeline.from_pipeline(fitted_pipeline)
+
+    expected = fitted_pipeline.predict_proba(x)[:, 1]
+    records = x.to_dict(orient="records")
+
+    single = np.array([compiled.predict_one(r) for r in records])
+    many = compiled.predict_many(records)
+
+    np.testing.assert_allclose(single, expected, rtol=1e-6, atol=1e-7)
+    np.testing.assert_allclose(many, expected, rtol=1e-6, atol=1e-7)
+
+
+def test_compiled_pipeline_matches_transform(bookings, fitted_pipeline):
+    x, _ = bookings
+    compiled = CompiledPipeline.from_pipeline(fitted_pipeline)
+
+    expected = fitted_pipeline.named_steps["pre_pipeline"].transform(x).astype(np.float32)
+    np.testing.assert_array_equal(compiled.transform(x.to_dict(orient="records")), expected)
+
+
+def test_columnwise_transform_matches_row_wise(tmp_path, bookings, fitted_pipeline):
+    x, _ = bookings
+    records = x.drop(columns=DERIVED_COLUMNS).to_dict(orient="records")
+    bundle_dir = str(tmp_path / "serving_bundle")
+    CompiledPipeline.from_pipeline(fitted_pipeline).save(bundle_dir)
+
+    for compiled in (CompiledPipeline.from_pipeline(fitted_pipeline), CompiledPipeline.load(bundle_dir)):
+        expected = compiled.transform([add_features_record(dict(r)) for r in records])
+        np.testing.assert_array_equal(compiled.transform_columns(add_features_columns(records)), expected)
+        np.testing.assert_array_equal(compiled.transform_columns(x), expected)
+
+
+def test_compiled_pipeline_rejects_unknown_category(bookings, fitted_pipeline):
+    x, _ = bookings
+    compiled = CompiledPipeline.from_pipeline(fitted_pipeline)
+    record = {**x.iloc[0].to_dict(), "room_type_reserved": "Room_Type 99"}
+
+    with pytest.raises(ValueError):
+        compiled.predict_one(record)
+    with pytest.raises(ValueError):
+        compiled.transform_columns(add_features_columns([record]))
+
+
+def test_serving_bundle_roundtrip(tmp_path, bookings, fitted_pipeline):
+    x, _ = bookings
+    bundle_dir = str(tmp_path / "serving_bundle")
+    CompiledPipeline.from_pipeline(fitted_pipeline).save(bundle_dir)
+
+    loaded = CompiledPipeline.load(bundle_dir)
+
+    expected = fitted_pipeline.predict_proba(x)[:, 1]
+    np.testing.assert_allclose(loaded.predict_many(x.to_dict(orient="records")), expected, rtol=1e-6, atol=1e-7)
+    assert isinstance(loaded.num_offset, np.memmap)
@@ -1,3 +1,4 @@
+import json
 from fastapi.testclient import TestClient
 from src.api.app import app  
 
@@ -36,3 +37,74 @@ def test_predict_endpoint():
     assert "prediction_label" in json_response
     assert "prediction_code" in json_response
     print("Prediction Response:", json_response)
+
+
+sample_booking = {
+    "no_of_adults": 2,
+    "no_of_children": 0,
+    "no_of_weekend_nights": 1,
+    "no_of_week_nights": 2,
+    "type_of_meal_plan": "Meal Plan 1",
+    "required_car_parking_space": 0,
+    "room_type_reserved": "Room_Type 1",
+    "lead_time": 224,
+    "arrival_year": 2017,
+    "arrival_month": 10,
+    "arrival_date": 2,
+    "market_segment_type": "Offline",
+    "repeated_guest": 0,
+    "no_of_previous_cancellations": 0,
+    "no_of_previous_bookings_not_canceled": 0,
+    "avg_price_per_room": 65.0,
+    "no_of_special_requests": 0
+}
+
+
+def test_predict_batch_matches_single():
+    batch = [sample_booking, {**sample_booking, "lead_time": 5, "no_of_week_nights": 0}]
+
+    response = client.post("/predict/batch", json=batch)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1]
+
+    for booking, result in zip(batch, results):
+        single = client.post("/predict", json=booking).json()
+        assert result["error"] is None
+        assert result["probability"] == single["probability"]
+        assert result["prediction_code"] == single["prediction_code"]
+
+
+def test_predict_batch_isolates_bad_records():
+    bad_type = {**sample_booking, "lead_time": "soon"}
+    unseen_category = {**sample_booking, "room_type_reserved": "Room_Type 99"}
+    batch = [sample_booking, bad_type, unseen_category, sample_booking]
+
+    response = client.post("/predict/batch", json=batch)
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["n_errors"] == 2
+
+    errors = [r["error"] is not None for r in json_response["results"]]
+    assert errors == [False, True, True, False]
+
+
+def test_predict_batch_ndjson():
+    body = "\n".join(json.dumps(b) for b in [sample_booking, sample_booking])
+
+    response = client.post("/predict/batch", content=body,
+                           headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.json()["n_records"] == 2
+
+
+def test_out_of_range_requests_are_rejected():
+    out_of_range = {**sample_booking, "lead_time": 900}
+
+    response = client.post("/predict", json=out_of_range)
+    assert response.status_code == 422
+    assert "lead_time:range" in response.json()["detail"]
+
+    results = client.post("/predict/batch", json=[sample_booking, out_of_range]).json()["results"]
+    assert results[0]["error"] is None
+    assert results[1]["error"] == "failed checks: lead_time:range"
@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+from src.api import app as api_app
+from src.api.metrics import ApiMetrics, MetricsRegistry, PHASES
+from tests.test_main import sample_booking
+
+client = TestClient(api_app.app)
+
+
+def sample_value(text: str, series: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise KeyError(series)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("phase",), buckets=(0.1, 1.0))
+    child = histogram.labels("predict")
+    for value in (0.05, 0.1, 0.5, 2.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert sample_value(text, 'latency_seconds_bucket{phase="predict",le="0.1"}') == 2
+    assert sample_value(text, 'latency_seconds_bucket{phase="predict",le="1.0"}') == 3
+    assert sample_value(text, 'latency_seconds_bucket{phase="predict",le="+Inf"}') == 4
+    assert sample_value(text, 'latency_seconds_count{phase="predict"}') == 4
+    assert sample_value(text, 'latency_seconds_sum{phase="predict"}') == 2.65
+
+    # one label set per serve worker, merged before le
+    registry = MetricsRegistry(const_labels={"worker": "2"})
+    registry.histogram("latency_seconds", "Latency.", ("phase",), buckets=(0.1,)).labels("predict").observe(0.05)
+    registry.counter("rows_total", "Rows.").labels().inc()
+    text = registry.render()
+    assert sample_value(text, 'latency_seconds_bucket{phase="predict",worker="2",le="0.1"}') == 1
+    assert sample_value(text, 'rows_total{worker="2"}') == 1
+
+
+def test_children_are_preallocated_and_labels_escaped():
+    metrics = ApiMetrics()
+    assert set(metrics.phases) == set(PHASES)
+    assert metrics.latency.labels("/predict") is metrics.latency_by_endpoint["/predict"]
+
+    metrics.set_model('v"1')
+    metrics.set_model("v2")
+    text = metrics.render()
+    assert 'hotel_api_model_info{version="v2"} 1' in text
+    assert 'v\\"1' not in text
+
+    metrics.exceptions.labels("/predict", 'Bad"Error').inc()
+    assert 'exception="Bad\\"Error"' in metrics.render()
+
+
+def test_metrics_endpoint_after_requests():
+    assert client.post("/predict", json=sample_booking).status_code == 200
+    assert client.post("/predict", json={**sample_booking, "lead_time": -5}).status_code == 422
+    assert client.post("/predict/batch", json=[sample_booking, {"no_of_adults": 1}]).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    version = api_app.registry.active.version
+    assert sample_value(text, f'hotel_api_requests_total{{endpoint="/predict",status="200",model_version="{version}"}}') >= 1
+    assert sample_value(text, 'hotel_api_errors_total{endpoint="/predict",kind="validation"}') >= 1
+    assert sample_value(text, 'hotel_api_rows_total{endpoint="/predict/batch"}') >= 2
+    assert sample_value(text, f'hotel_api_model_info{{version="{version}"}}') == 1
+    for phase in ("parse", "validate", "features", "preprocess", "predict"):
+        assert sample_value(text, f'hotel_api_phase_seconds_count{{phase="{phase}"}}') >= 1
+    assert sample_value(text, 'hotel_api_in_flight_requests{endpoint="/predict"}') == 0
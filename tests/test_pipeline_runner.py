@@ -0,0 +1,74 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from tests.conftest import make_bookings, make_target
+from src.pipeline_runner import run_pipeline
+from src.storage import read_frame, data_path
+from src.load_data import load_data
+from src.validate_data import run_validation_pipeline
+from src.feature_engineering import feature_engineering
+from src.split_data import features_target_split
+
+
+def write_raw(path, n=300):
+    df = make_bookings(n).drop(columns=["total_guests", "total_nights", "price_per_night", "is_weekend_only"])
+    df.insert(0, "Booking_ID", [f"INN{i:05d}" for i in range(n)])
+    df["booking_status"] = np.where(make_target(df) == 1, "Not_Canceled", "Canceled")
+    pd.concat([df, df.iloc[:5]]).to_csv(path, index=False)
+
+
+def test_fused_pipeline_matches_stage_entry_points(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_raw("raw.csv")
+
+    load_data("raw.csv")
+    run_validation_pipeline(data_path("hotel_data"), data_path("validated_data"))
+    feature_engineering()
+    features_target_split()
+    staged_x, staged_y = read_frame(data_path("x")), read_frame(data_path("y"))
+
+    for name in ["hotel_data", "validated_data", "feature_engineered_data", "x", "y"]:
+        os.remove(data_path(name))
+
+    x, y, report = run_pipeline("raw.csv")
+
+    pd.testing.assert_frame_equal(x, staged_x)
+    np.testing.assert_array_equal(y, staged_y["target"].to_numpy())
+    pd.testing.assert_frame_equal(read_frame(data_path("x")), staged_x)
+    assert [s["stage"] for s in report["stages"]] == ["load_data", "validate_data", "feature_engineering", "split_data"]
+
+
+def test_dry_run_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_raw("raw.csv")
+
+    x, _, report = run_pipeline("raw.csv", dry_run=True)
+
+    assert len(x) == 300
+    assert report["written"] == []
+    assert not os.path.exists(data_path("x"))
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_malformed_raw_values_reach_the_quarantine(tmp_path, monkeypatch, fused):
+    monkeypatch.chdir(tmp_path)
+    write_raw("raw.csv")
+    raw = pd.read_csv("raw.csv").astype({"lead_time": object})
+    raw.loc[10, "lead_time"] = 12.5
+    raw.loc[17, "lead_time"] = "soon"
+    raw.to_csv("raw.csv", index=False)
+
+    if fused:
+        x, _, _ = run_pipeline("raw.csv")
+    else:
+        load_data("raw.csv")
+        run_validation_pipeline(data_path("hotel_data"), data_path("validated_data"), data_path("quarantine"))
+        x = read_frame(data_path("validated_data"))
+
+    quarantine = read_frame(data_path("quarantine"), typed=False)
+    assert sorted(quarantine["Booking_ID"]) == ["INN00010", "INN00017"]
+    assert set(quarantine["reason"]) == {"lead_time:dtype"}
+    # neither row was truncated into the training data
+    assert len(x) == 300 - 2
+    assert x["lead_time"].dtype == "int64"
@@ -0,0 +1,98 @@
+import json
+import os
+import pstats
+import numpy as np
+import pandas as pd
+from src import profiling
+from src.profiling import profile_stage, write_profile_report
+
+
+def setup_profiling(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "STAGES", [])
+    monkeypatch.setitem(profiling.profiling_config, "report_dir", str(tmp_path))
+    monkeypatch.delenv("PROFILER", raising=False)
+
+
+def test_records_time_rss_and_rows(monkeypatch, tmp_path):
+    setup_profiling(monkeypatch, tmp_path)
+
+    @profile_stage("make_frame")
+    def make_frame(n):
+        blob = np.ones(4 * 2 ** 20)  # 32 MB, shows up in the peak
+        return pd.DataFrame({"a": np.arange(n), "b": blob[:n]})
+
+    @profile_stage()
+    def train(x, y):
+        return None
+
+    df = make_frame(250)
+    train(df, df["a"])
+
+    first, second = profiling.STAGES
+    assert first["stage"] == "make_frame" and first["rows"] == 250
+    assert first["wall_seconds"] >= 0 and first["cpu_seconds"] >= 0
+    assert first["peak_rss_mb"] > 0
+    # nothing returned, rows come from the frame the stage was given
+    assert second["stage"] == "train" and second["rows"] == 250
+    assert "profile" not in first
+
+
+def test_tuple_results_and_exceptions(monkeypatch, tmp_path):
+    setup_profiling(monkeypatch, tmp_path)
+
+    @profile_stage()
+    def split():
+        return np.zeros(7), np.zeros(7)
+
+    @profile_stage()
+    def broken():
+        raise ValueError("boom")
+
+    assert len(split()) == 2
+    try:
+        broken()
+    except ValueError:
+        pass
+    assert [record["rows"] for record in profiling.STAGES] == [7]
+
+
+def test_cprofile_dump(monkeypatch, tmp_path):
+    setup_profiling(monkeypatch, tmp_path)
+    monkeypatch.setenv("PROFILER", "cprofile")
+
+    @profile_stage("summing")
+    def summing():
+        return sum(range(10000))
+
+    summing()
+    path = profiling.STAGES[0]["profile"]
+    assert path == os.path.join(str(tmp_path), "summing.prof")
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_report_is_a_metrics_file(monkeypatch, tmp_path):
+    setup_profiling(monkeypatch, tmp_path)
+
+    @profile_stage()
+    def load_data():
+        return pd.DataFrame({"a": range(3)})
+
+    load_data()
+    report = write_profile_report("load_data", log_to_mlflow=False)
+
+    with open(tmp_path / "load_data.json", "r") as file:
+        assert json.load(file) == report
+    assert report["load_data"]["rows"] == 3
+    assert set(report["load_data"]) == {"wall_seconds", "cpu_seconds", "peak_rss_mb", "rss_delta_mb", "rows"}
+
+
+def test_disabled(monkeypatch, tmp_path):
+    setup_profiling(monkeypatch, tmp_path)
+    monkeypatch.setitem(profiling.profiling_config, "enabled", False)
+
+    @profile_stage()
+    def stage():
+        return pd.DataFrame({"a": [1]})
+
+    assert len(stage()) == 1
+    assert profiling.STAGES == []
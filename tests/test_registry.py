@@ -0,0 +1,115 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.base import clone
+from src.api.registry import ModelRegistry
+from tests.conftest import ADMIN_HEADERS
+
+
+def dump_models(tmp_path, fitted_pipeline, bookings, n):
+    x, y = bookings
+    paths = []
+    for i in range(n):
+        pipe_line = clone(fitted_pipeline).set_params(model__n_estimators=5 + i).fit(x, y)
+        path = tmp_path / f"model_{i}.pkl"
+        joblib.dump(pipe_line, path)
+        paths.append(str(path))
+    return paths
+
+
+def test_load_swaps_active_and_keeps_old_version_usable(tmp_path, fitted_pipeline, bookings):
+    x, _ = bookings
+    old_path, new_path = dump_models(tmp_path, fitted_pipeline, bookings, 2)
+    registry = ModelRegistry(max_versions=2)
+
+    old = registry.load(old_path)
+    in_flight = registry.get()
+    new = registry.load(new_path)
+
+    assert registry.active is new
+    assert in_flight is old
+    assert registry.get(old.version) is old
+    expected = old.pipeline.predict_proba(x.iloc[:5])[:, 1]
+    np.testing.assert_allclose(in_flight.fast_model.predict_many(x.iloc[:5].to_dict(orient="records")),
+                               expected, rtol=1e-6)
+
+
+def test_registry_evicts_oldest_inactive_version(tmp_path, fitted_pipeline, bookings):
+    paths = dump_models(tmp_path, fitted_pipeline, bookings, 3)
+    registry = ModelRegistry(max_versions=2)
+
+    first = registry.load(paths[0])
+    registry.load(paths[1], activate=False)
+    registry.load(paths[2], activate=False)
+
+    versions = [v["version"] for v in registry.stats()["versions"]]
+    assert registry.active is first
+    assert first.version in versions
+    assert len(versions) == 2
+
+
+def test_registry_needs_room_for_the_active_version():
+    with pytest.raises(ValueError):
+        ModelRegistry(max_versions=0)
+
+
+def test_reloading_same_file_is_a_noop(tmp_path, fitted_pipeline, bookings):
+    path, = dump_models(tmp_path, fitted_pipeline, bookings, 1)
+    activated = []
+    registry = ModelRegistry(on_activate=activated.append)
+
+    assert registry.load(path) is registry.load(path)
+    assert len(registry.stats()["versions"]) == 1
+    assert len(activated) == 2
+
+
+def test_requests_can_target_a_resident_version(tmp_path, monkeypatch, admin_api, api_registry,
+                                               fitted_pipeline, bookings):
+    from fastapi.testclient import TestClient
+
+    api = admin_api
+    path, = dump_models(tmp_path, fitted_pipeline, bookings, 1)
+    monkeypatch.setattr(api, "model_path", path)
+    client = TestClient(api.app)
+    booking = api.HotelReservationInput.model_config["json_schema_extra"]["example"]
+    active = api.registry.active.version
+
+    staged = client.post("/admin/models/reload", params={"activate": False}, headers=ADMIN_HEADERS).json()
+    assert api.registry.active.version == active
+
+    response = client.post("/predict", json=booking, headers={"X-Model-Version": staged["version"]})
+    assert response.status_code == 200
+    assert response.headers["X-Model-Version"] == staged["version"]
+
+    assert client.post("/predict", json=booking).headers["X-Model-Version"] == active
+    assert client.post("/predict", json=booking, headers={"X-Model-Version": "missing"}).status_code == 404
+
+
+def test_registry_serves_from_bundle(tmp_path, fitted_pipeline, bookings):
+    from src.api.inference import CompiledPipeline
+
+    x, _ = bookings
+    bundle_dir = str(tmp_path / "serving_bundle")
+    CompiledPipeline.from_pipeline(fitted_pipeline).save(bundle_dir)
+
+    loaded = ModelRegistry().load(bundle_dir)
+
+    assert loaded.pipeline is None
+    assert loaded.info()["format"] == "bundle"
+    np.testing.assert_allclose(loaded.fast_model.predict_many(x.to_dict(orient="records")),
+                               fitted_pipeline.predict_proba(x)[:, 1], rtol=1e-6, atol=1e-7)
+
+
+def test_admin_routes_are_off_by_default_and_need_the_token(monkeypatch):
+    from fastapi.testclient import TestClient
+    from src.api import app as api
+
+    client = TestClient(api.app)
+    assert client.get("/admin/models").status_code == 404
+    assert client.post("/admin/models/reload", params={"path": "/tmp/evil.pkl"}).status_code == 404
+
+    monkeypatch.setattr(api, "admin_enabled", True)
+    monkeypatch.setattr(api, "admin_token", ADMIN_HEADERS["X-Admin-Token"])
+    assert client.get("/admin/models").status_code == 401
+    assert client.get("/admin/models", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert client.get("/admin/models", headers=ADMIN_HEADERS).json()["active"] == api.registry.active.version
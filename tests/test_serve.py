@@ -0,0 +1,43 @@
+import os
+import json
+import httpx
+from src.api.registry import load_version
+from src.api.serve import Supervisor, parse_cpus, plan_workers
+from tests.test_main import sample_booking
+
+
+def test_parse_cpus():
+    assert parse_cpus("0-3,6") == [0, 1, 2, 3, 6]
+    assert parse_cpus([3, 1]) == [1, 3]
+    assert parse_cpus("2") == [2]
+    assert len(parse_cpus()) >= 1
+
+
+def test_plans_split_the_budget_without_oversubscribing():
+    plans = plan_workers([0, 1, 2, 3], workers=2)
+    assert [(p["cpus"], p["threads"]) for p in plans] == [([0, 1], 2), ([2, 3], 2)]
+
+    assert [p["cpus"] for p in plan_workers([4, 5, 6])] == [[4], [5], [6]]
+    # more workers than CPUs wrap around single-threaded
+    assert [(p["cpus"], p["threads"]) for p in plan_workers([0, 1], workers=3)] == [([0], 1), ([1], 1), ([0], 1)]
+
+
+def test_worker_threads_are_applied_to_the_booster():
+    loaded = load_version(os.environ["SERVING_MODEL_PATH"], threads=1)
+    config = json.loads(loaded.fast_model.booster.save_config())
+    assert config["learner"]["generic_param"]["nthread"] == "1"
+
+
+def test_supervisor_serves_and_restarts_gracefully():
+    supervisor = Supervisor(plan_workers(parse_cpus(), workers=1), host="127.0.0.1", port=0)
+    try:
+        supervisor.start()
+        url = f"http://127.0.0.1:{supervisor.port}"
+        first_pid = supervisor.workers[0].pid
+        assert httpx.post(f"{url}/predict", json=sample_booking, timeout=30).status_code == 200
+
+        supervisor.rolling_restart()
+        assert supervisor.workers[0].pid != first_pid
+        assert httpx.post(f"{url}/predict", json=sample_booking, timeout=30).status_code == 200
+    finally:
+        supervisor.stop()
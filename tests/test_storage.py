@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+from src.storage import read_frame, write_frame
+
+
+def test_parquet_and_csv_roundtrip_to_same_dtypes(tmp_path, bookings):
+    x, _ = bookings
+    x = x.assign(no_of_children=x["no_of_children"].astype(float))
+
+    from_parquet = read_frame(write_frame(x.copy(), str(tmp_path / "x.parquet")))
+    from_csv = read_frame(write_frame(x.copy(), str(tmp_path / "x.csv")))
+
+    pd.testing.assert_frame_equal(from_parquet, from_csv)
+    assert from_parquet["no_of_children"].dtype == "int64"
+    assert from_parquet["room_type_reserved"].dtype == "category"
+
+
+def test_read_falls_back_to_other_format_only_when_asked(tmp_path, bookings):
+    x, _ = bookings
+    write_frame(x.copy(), str(tmp_path / "x.csv"))
+
+    assert len(read_frame(str(tmp_path / "x.parquet"), fallback=True)) == len(x)
+    # pipeline stages never pick up a file in the other format
+    with pytest.raises(FileNotFoundError):
+        read_frame(str(tmp_path / "x.parquet"))
+
+
+def test_csv_index_column_is_dropped(tmp_path, bookings):
+    x, _ = bookings
+    x.to_csv(tmp_path / "legacy.csv")
+
+    assert "Unnamed: 0" not in read_frame(str(tmp_path / "legacy.csv")).columns
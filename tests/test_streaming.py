@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tests.test_pipeline_runner import write_raw
+from src.storage import read_frame
+from src.streaming import run_streaming_pipeline, Deduplicator
+from src.validate_data import run_validation_pipeline
+from src.feature_engineering import make_features
+
+
+def test_deduplicator_matches_drop_duplicates_across_chunks():
+    df = pd.DataFrame({"a": [1, 2, 1, 3, 2, 1], "b": ["x", "y", "x", "z", "y", "q"]})
+    dedupe = Deduplicator()
+
+    streamed = pd.concat([dedupe(df.iloc[i:i + 2]) for i in range(0, len(df), 2)])
+
+    pd.testing.assert_frame_equal(streamed, df.drop_duplicates())
+
+
+@pytest.mark.parametrize("ext", ["csv", "parquet"])
+def test_streaming_matches_in_memory_pipeline(tmp_path, ext):
+    raw = tmp_path / "raw.csv"
+    write_raw(raw)
+    df = pd.read_csv(raw)
+    # a mostly empty column (dropped by the 40% rule) and a few incomplete rows
+    df["notes"] = pd.Series("vip", index=df.index).where(np.arange(len(df)) % 2 == 1)
+    df.loc[[50, 120, 200], "no_of_children"] = np.nan
+    df.to_csv(raw, index=False)
+
+    run_validation_pipeline(str(raw), str(tmp_path / f"expected.{ext}"))
+    stats = run_streaming_pipeline(str(raw), str(tmp_path / f"validated.{ext}"),
+                                   str(tmp_path / f"features.{ext}"), chunksize=37,
+                                   quarantine_path=str(tmp_path / f"quarantine.{ext}"))
+
+    streamed = read_frame(str(tmp_path / f"features.{ext}"))
+    expected = read_frame(str(tmp_path / f"expected.{ext}")).pipe(make_features)
+    pd.testing.assert_frame_equal(streamed, expected, check_categorical=False)
+    assert stats["duplicates"] == 5
+    assert stats["dropped_columns"] == ["notes"]
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from src.threshold import threshold_curve, curve_metrics, select_threshold, load_threshold, write_decision
+from tests.conftest import ADMIN_HEADERS
+
+
+def brute_force_counts(y, proba, threshold):
+    pred = (proba >= threshold).astype(int)
+    return {f"n{a}{p}": int(((y == a) & (pred == p)).sum()) for a in (0, 1) for p in (0, 1)}
+
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 500)
+    # rounded so many probabilities tie
+    proba = np.clip(np.round(0.35 * y + rng.uniform(0, 0.65, 500), 2), 0, 1)
+    return y, proba
+
+
+def test_curve_matches_per_threshold_loop(scores):
+    y, proba = scores
+    curve = threshold_curve(y, proba)
+
+    assert len(curve["threshold"]) == len(np.unique(proba)) + 1
+    for i, threshold in enumerate(curve["threshold"]):
+        expected = brute_force_counts(y, proba, threshold)
+        assert {name: int(curve[name][i]) for name in expected} == expected
+
+
+@pytest.mark.parametrize("pos_label", [0, 1])
+def test_objectives_pick_the_best_point(scores, pos_label):
+    y, proba = scores
+    costs = [[0, 40], [150, 0]]
+    metrics = curve_metrics(threshold_curve(y, proba), pos_label, costs)
+
+    f1 = select_threshold(y, proba, "f1", pos_label)
+    assert f1["metrics"]["f1"] == pytest.approx(metrics["f1"].max())
+
+    cost = select_threshold(y, proba, "cost", pos_label, costs=costs)
+    assert cost["metrics"]["cost"] == pytest.approx(metrics["cost"].min())
+    counts = brute_force_counts(y, proba, cost["threshold"])
+    assert cost["metrics"]["cost"] == sum(costs[a][p] * counts[f"n{a}{p}"] for a in (0, 1) for p in (0, 1))
+
+    floor = select_threshold(y, proba, "recall_at_precision", pos_label, min_precision=0.8)
+    feasible = metrics["precision"] >= 0.8
+    assert floor["metrics"]["precision"] >= 0.8
+    assert floor["metrics"]["recall"] == pytest.approx(metrics["recall"][feasible].max())
+
+
+def test_unreachable_precision_floor_is_an_error(scores):
+    y, _ = scores
+    with pytest.raises(ValueError):
+        select_threshold(y, np.full(len(y), 0.5), "recall_at_precision", min_precision=0.99)
+
+
+def test_bundle_threshold_reaches_the_api(tmp_path, monkeypatch, admin_api, api_registry,
+                                          fitted_pipeline, bookings):
+    from fastapi.testclient import TestClient
+    from src.api.inference import CompiledPipeline
+
+    x, y = bookings
+    proba = fitted_pipeline.predict_proba(x)[:, 1]
+    decision = select_threshold(y, proba, "f1")
+    # a threshold no probability reaches turns every prediction into "Canceled"
+    decision["threshold"] = 1.5
+
+    compiled = CompiledPipeline.from_pipeline(fitted_pipeline)
+    compiled.decision = decision
+    bundle_dir = str(tmp_path / "serving_bundle")
+    compiled.save(bundle_dir)
+
+    assert CompiledPipeline.load(bundle_dir).decision == decision
+    assert load_threshold(bundle_dir) == 1.5
+    assert load_threshold(str(tmp_path / "missing"), default=0.55) == 0.55
+
+    api = admin_api
+    monkeypatch.setattr(api, "model_path", bundle_dir)
+    client = TestClient(api.app)
+    booking = api.HotelReservationInput.model_config["json_schema_extra"]["example"]
+    staged = client.post("/admin/models/reload", params={"activate": False}, headers=ADMIN_HEADERS).json()
+    assert staged["threshold"] == 1.5
+
+    response = client.post("/predict", json=booking, headers={"X-Model-Version": staged["version"]})
+    assert response.json()["prediction_code"] == 0
+
+    # re-selecting rewrites the file in place, a reload picks up the new version
+    write_decision(bundle_dir, {**decision, "threshold": -1.0})
+    assert CompiledPipeline.load(bundle_dir).decision["threshold"] == -1.0
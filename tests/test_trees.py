@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from src.api.inference import CompiledPipeline, preprocess_frame
+from src.api.registry import ModelRegistry
+from src.api.trees import TreeEnsemble
+
+
+@pytest.fixture(scope="module")
+def training_matrix(bookings, fitted_pipeline):
+    x, _ = bookings
+    return np.asarray(preprocess_frame(fitted_pipeline, x), dtype=np.float32)
+
+
+def test_matches_predict_proba_on_the_training_set(bookings, fitted_pipeline, training_matrix):
+    x, _ = bookings
+    booster = fitted_pipeline.steps[-1][1].get_booster()
+    trees = TreeEnsemble.from_booster(booster)
+
+    np.testing.assert_array_equal(trees.predict_margin(training_matrix),
+                                  booster.inplace_predict(training_matrix, predict_type="margin"))
+    # only the sigmoid may round differently
+    np.testing.assert_array_max_ulp(trees.predict(training_matrix),
+                                    fitted_pipeline.predict_proba(x)[:, 1].astype(np.float32), maxulp=1)
+
+
+def test_missing_values_follow_the_default_direction(fitted_pipeline, training_matrix):
+    booster = fitted_pipeline.steps[-1][1].get_booster()
+    matrix = training_matrix.copy()
+    matrix[::3, :10] = np.nan
+
+    np.testing.assert_array_equal(TreeEnsemble.from_booster(booster).predict_margin(matrix),
+                                  booster.inplace_predict(matrix, predict_type="margin"))
+
+
+def test_single_rows_and_blocks_agree(fitted_pipeline, training_matrix):
+    trees = TreeEnsemble.from_booster(fitted_pipeline.steps[-1][1].get_booster())
+    batch = trees.predict_margin(training_matrix)
+
+    single = np.concatenate([trees.predict_margin(training_matrix[i:i + 1]) for i in range(20)])
+    np.testing.assert_array_equal(single, batch[:20])
+
+
+def test_iteration_range_limits_the_trees(fitted_pipeline, training_matrix):
+    booster = fitted_pipeline.steps[-1][1].get_booster()
+    trees = TreeEnsemble.from_booster(booster, (0, 10))
+
+    assert trees.n_trees == 10
+    np.testing.assert_array_equal(trees.predict_margin(training_matrix),
+                                  booster.inplace_predict(training_matrix, predict_type="margin",
+                                                          iteration_range=(0, 10)))
+
+
+def test_bundle_ships_the_trees_and_registry_selects_engine(tmp_path, bookings, fitted_pipeline):
+    x, _ = bookings
+    bundle_dir = str(tmp_path / "serving_bundle")
+    CompiledPipeline.from_pipeline(fitted_pipeline).save(bundle_dir)
+
+    compiled = CompiledPipeline.load(bundle_dir)
+    assert isinstance(compiled.trees.feature, np.memmap)
+
+    records = x.to_dict(orient="records")
+    expected = fitted_pipeline.predict_proba(x)[:, 1].astype(np.float32)
+    for engine in ("xgboost", "trees", "auto"):
+        loaded = ModelRegistry(engine=engine).load(bundle_dir)
+        assert loaded.info()["engine"] == engine
+        np.testing.assert_array_max_ulp(loaded.fast_model.predict_many(records), expected, maxulp=1)
+        np.testing.assert_array_max_ulp(np.float32(loaded.fast_model.predict_one(records[0])), expected[0], maxulp=1)
+
+    with pytest.raises(ValueError):
+        compiled.use_engine("onnx")
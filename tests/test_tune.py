@@ -0,0 +1,31 @@
+from sklearn.base import clone
+from src.tune import successive_halving, sample_candidates, best_params_for_training
+
+
+def test_sample_candidates_are_unique():
+    space = {"max_depth": [3, 4], "learning_rate": [0.1]}
+
+    candidates = sample_candidates(space, [False, True], n_candidates=10, random_state=0)
+
+    assert len(candidates) == 4
+    assert len({(c["params"]["max_depth"], c["with_smote"]) for c in candidates}) == 4
+
+
+def test_successive_halving_narrows_candidates(bookings, fitted_pipeline):
+    x, y = bookings
+    tuning = {
+        "n_candidates": 4, "eta": 2, "min_resource": 5, "max_resource": 20, "cv_folds": 2,
+        "early_stopping_rounds": 5, "n_jobs": 2, "threads_per_trial": 1, "smote": [False, True],
+        "search_space": {"max_depth": [2, 3], "learning_rate": [0.1, 0.3]}
+    }
+
+    result = successive_halving(x, y, clone(fitted_pipeline.named_steps["pre_pipeline"]), tuning,
+                                log_to_mlflow=False)
+
+    rungs = [t["rung"] for t in result["history"]]
+    assert rungs.count(0) == 4 and rungs.count(1) == 2 and rungs.count(2) == 1
+    assert result["best"]["n_estimators"] == 20
+
+    best = best_params_for_training(result["best"], {"n_estimators": 100, "random_state": 0})
+    assert best["xgb_params"]["n_estimators"] == result["best"]["best_iteration"] + 1
+    assert best["xgb_params"]["random_state"] == 0
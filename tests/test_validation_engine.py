@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from src.validate_data import hotel_schema, compiled_schema
+from tests.conftest import make_bookings
+
+
+def raw_bookings(n: int = 300) -> pd.DataFrame:
+    df = make_bookings(n).drop(columns=["total_guests", "total_nights", "price_per_night", "is_weekend_only"])
+    df.insert(0, "Booking_ID", [f"INN{i:05d}" for i in range(n)])
+    df["booking_status"] = np.where(np.arange(n) % 3 == 0, "Canceled", "Not_Canceled")
+    return df
+
+
+def test_valid_rows_match_pandera():
+    df = raw_bookings()
+    result = compiled_schema.validate(df)
+
+    assert result.report["rows_quarantined"] == 0
+    pd.testing.assert_frame_equal(result.valid, hotel_schema.validate(df))
+
+
+def test_failing_rows_are_quarantined_with_reasons():
+    df = raw_bookings()
+    df.loc[3, "lead_time"] = 900
+    df.loc[5, "repeated_guest"] = 2
+    df.loc[5, "arrival_month"] = 13
+    df.loc[8, "booking_status"] = "Maybe"
+    df["no_of_adults"] = df["no_of_adults"].astype(float)
+    df.loc[9, "no_of_adults"] = 1.5
+
+    result = compiled_schema.validate(df)
+
+    assert list(result.quarantine.index) == [3, 5, 8, 9]
+    assert list(result.quarantine["reason"]) == [
+        "lead_time:range", "arrival_month:range;repeated_guest:isin", "booking_status:isin", "no_of_adults:dtype"]
+    assert result.report["violations"] == {"lead_time:range": 1, "arrival_month:range": 1, "repeated_guest:isin": 1,
+                                           "booking_status:isin": 1, "no_of_adults:dtype": 1}
+    assert len(result.valid) == len(df) - 4
+    assert result.valid["no_of_adults"].dtype == "int64"
+
+
+def test_record_reasons_match_frame_reasons():
+    df = raw_bookings(50)
+    df.loc[1, "lead_time"] = -1
+    df.loc[2, "required_car_parking_space"] = 3
+    checks = compiled_schema.select([c for c in df.columns if c not in ("Booking_ID", "booking_status")])
+
+    expected = checks.reasons(df)
+    assert [checks.record_reasons(record) for record in df.to_dict("records")] == expected
+    assert expected[:3] == [None, "lead_time:range", "required_car_parking_space:isin"]
+
+
+def test_spec_compiles_like_the_pandera_schema():
+    from src.schemas.hotel_schema import HOTEL_COLUMNS
+    from src.validation_engine import CompiledSchema
+
+    from_spec = CompiledSchema.from_spec(HOTEL_COLUMNS)
+    assert from_spec.columns == compiled_schema.columns
+    assert from_spec.ranges == compiled_schema.ranges
+    assert [(name, list(allowed)) for name, allowed in from_spec.memberships] == \
+        [(name, list(allowed)) for name, allowed in compiled_schema.memberships]